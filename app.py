@@ -3,15 +3,28 @@ AutoArchitect v2.0 - 시스템 구성도 자동 생성 도구
 메인 Streamlit 애플리케이션
 """
 
+import functools
+from typing import Callable, Dict, Any
+
 import streamlit as st
 import streamlit.components.v1 as components
-import pandas as pd
-import io
 
 # 내부 모듈
 from ui.drawio_editor import get_drawio_editor_html
 from core.templates import TEMPLATE_CATALOG, generate_template_excel, get_available_templates
-from core.components import COMPONENT_CATALOG, generate_component_data, get_component_list
+from core.components import COMPONENT_CATALOG, get_component_list
+from core.diagram_merger import PLACEMENT_FREE, PLACEMENT_RIGHT, merge_into_document
+
+# 에디터로 보내는 XML을 draw.io 압축 형식으로 생성 (브라우저 전송량 절감)
+COMPRESS_DIAGRAMS = True
+
+# 컴포넌트 추가 시 기존 다이어그램의 빈 공간에 배치 (False면 항상 오른쪽 끝에 붙임)
+PLACE_COMPONENTS_IN_FREE_SPACE = True
+
+# 업로드 처리 단계별 시간 기록 (업로드 페이지 하단에 표시)
+PROFILE_UPLOADS = True
+# 단계별 메모리 최고치도 기록 (tracemalloc - 처리 시간이 늘어남)
+PROFILE_MEMORY = False
 
 
 # ============================================================
@@ -23,19 +36,71 @@ def init_session_state():
         'current_page': 'upload',
         'xml_content': None,
         'diagram_name': None,
+        'upload_session': None,
+        'diagram_revision': 0,
+        'excel_export': {},
+        'merge_document': None,
     }
     for key, value in defaults.items():
         if key not in st.session_state:
             st.session_state[key] = value
 
 
+def get_upload_session(uploaded_file):
+    """업로드 파일의 세션 반환 (같은 파일이면 이전 결과 재사용)"""
+    from core.instrumentation import Profiler
+    from core.upload_session import UploadSession
+
+    excel_bytes = uploaded_file.getvalue()
+    file_hash = UploadSession.hash_bytes(excel_bytes)
+
+    session = st.session_state.get('upload_session')
+    if session is None or session.file_hash != file_hash:
+        profiler = Profiler(trace_memory=PROFILE_MEMORY) if PROFILE_UPLOADS else None
+        session = UploadSession(excel_bytes, uploaded_file.name, profiler=profiler)
+        st.session_state['upload_session'] = session
+    return session
+
+
+def set_diagram(xml_content, diagram_name: str = None):
+    """에디터 다이어그램 교체 (리비전을 올려 이전 엑셀 내보내기 결과를 무효화)"""
+    st.session_state['xml_content'] = xml_content
+    if diagram_name:
+        st.session_state['diagram_name'] = diagram_name
+    st.session_state['diagram_revision'] += 1
+
+
+def excel_export_builder(xml_content: str, revision: int, document, cache: Dict[str, Any]) -> Callable[[], bytes]:
+    """
+    다운로드 버튼용 XML → 엑셀 변환 함수
+
+    버튼을 누를 때 Streamlit이 별도 스레드에서 호출하므로 세션 상태 대신 인자로 받은 값만 사용
+    (결과는 cache에 리비전과 함께 보관 - 다이어그램이 그대로면 다시 변환하지 않음)
+    """
+    def build() -> bytes:
+        if cache.get('revision') == revision:
+            return cache['bytes']
+
+        from core.xml_to_excel import XmlToExcelConverter, model_to_excel, xml_to_excel
+
+        # 병합 문서가 현재 XML이면 이미 읽어 둔 모델을 그대로 변환 (XML 재파싱 생략)
+        converter = XmlToExcelConverter()
+        if document is not None and document.xml_content == xml_content:
+            excel_bytes = model_to_excel(document.model, converter)
+        else:
+            excel_bytes = xml_to_excel(xml_content, converter)
+        # 경고는 다음 렌더링 때 내보내기 버튼 옆에 표시 (이 함수 안에서는 st 명령 사용 불가)
+        cache.update(revision=revision, bytes=excel_bytes, warnings=list(converter.warnings))
+        return excel_bytes
+
+    return build
+
+
 def go_to_editor(xml_content: str = None, diagram_name: str = None):
     """편집기 페이지로 이동"""
     st.session_state['current_page'] = 'editor'
     if xml_content:
-        st.session_state['xml_content'] = xml_content
-    if diagram_name:
-        st.session_state['diagram_name'] = diagram_name
+        set_diagram(xml_content, diagram_name)
 
 
 def go_to_upload():
@@ -45,112 +110,20 @@ def go_to_upload():
 
 def reset_editor():
     """에디터 초기화"""
-    st.session_state['xml_content'] = None
+    set_diagram(None)
     st.session_state['diagram_name'] = None
+    st.session_state['excel_export'] = {}
+    st.session_state['merge_document'] = None
 
 
 # ============================================================
 # XML 유틸리티
 # ============================================================
 def generate_xml_from_template(template_id: str) -> tuple:
-    """템플릿 ID로 XML 생성"""
-    from core.excel_parser import ExcelParser
-    from core.layout_engine import LayoutEngine
-    from core.drawio_generator import DrawioGenerator
-
-    excel_bytes = generate_template_excel(template_id)
-
-    parser = ExcelParser()
-    sheets = parser.read_excel(io.BytesIO(excel_bytes))
-    data = parser.parse_to_dict(sheets)
-
-    layout_engine = LayoutEngine()
-    positions = layout_engine.calculate_positions(data)
-
-    generator = DrawioGenerator()
-    xml_content = generator.generate_xml(data, positions)
-
-    diagram_name = data.get('config', {}).get('다이어그램명', 'diagram')
-
-    return xml_content, diagram_name
-
-
-def merge_xml_diagrams(existing_xml: str, new_xml: str, offset_x: int = 0, offset_y: int = 0) -> str:
-    """두 Draw.io XML을 병합"""
-    import xml.etree.ElementTree as ET
-
-    if not existing_xml or not existing_xml.strip():
-        return new_xml
-
-    try:
-        existing_root = ET.fromstring(existing_xml)
-        new_root = ET.fromstring(new_xml)
+    """템플릿 ID로 XML 반환 (미리 만든 템플릿 팩 사용, 원본이 바뀌었으면 메모리에서 다시 생성)"""
+    from core.template_pack import get_template_pack
 
-        existing_graph_root = existing_root.find('.//root')
-        new_graph_root = new_root.find('.//root')
-
-        if existing_graph_root is None or new_graph_root is None:
-            return new_xml
-
-        # 기존 XML에서 가장 큰 ID 찾기
-        max_id = 1
-        for cell in existing_graph_root.iter('mxCell'):
-            cell_id = cell.get('id', '0')
-            if cell_id.isdigit():
-                max_id = max(max_id, int(cell_id))
-
-        # 자동 오프셋 계산
-        if offset_x == 0 and offset_y == 0:
-            max_x = 0
-            for cell in existing_graph_root.iter('mxCell'):
-                geom = cell.find('mxGeometry')
-                if geom is not None:
-                    x = float(geom.get('x', 0))
-                    width = float(geom.get('width', 0))
-                    max_x = max(max_x, x + width)
-            offset_x = int(max_x) + 100
-
-        # ID 매핑 및 병합
-        id_mapping = {'0': '0', '1': '1'}
-        next_id = max_id + 1
-
-        for cell in new_graph_root.findall('mxCell'):
-            old_id = cell.get('id', '0')
-            if old_id in ['0', '1']:
-                continue
-
-            new_id = str(next_id)
-            id_mapping[old_id] = new_id
-            next_id += 1
-
-            cell.set('id', new_id)
-
-            parent_id = cell.get('parent', '1')
-            if parent_id in id_mapping:
-                cell.set('parent', id_mapping[parent_id])
-
-            for attr in ['source', 'target']:
-                ref_id = cell.get(attr)
-                if ref_id and ref_id in id_mapping:
-                    cell.set(attr, id_mapping[ref_id])
-
-            geom = cell.find('mxGeometry')
-            if geom is not None and cell.get('vertex') == '1':
-                x = float(geom.get('x', 0))
-                y = float(geom.get('y', 0))
-                geom.set('x', str(int(x + offset_x)))
-                geom.set('y', str(int(y + offset_y)))
-
-            existing_graph_root.append(cell)
-
-        from xml.dom import minidom
-        rough_string = ET.tostring(existing_root, encoding='unicode')
-        reparsed = minidom.parseString(rough_string)
-        return reparsed.toprettyxml(indent="  ")
-
-    except Exception as e:
-        print(f"XML 병합 오류: {e}")
-        return new_xml
+    return get_template_pack().template_xml(template_id, compressed=COMPRESS_DIAGRAMS)
 
 
 # ============================================================
@@ -183,31 +156,31 @@ def render_upload_page():
 
     st.success(f"✅ 파일: {uploaded_file.name}")
 
+    session = get_upload_session(uploaded_file)
+
     # 데이터 검증
     st.header("2️⃣ 데이터 검증")
 
     with st.spinner("엑셀 파일 분석 중..."):
-        excel_file = pd.ExcelFile(uploaded_file)
-        if 'BOXES' not in excel_file.sheet_names:
-            st.error("❌ 지원하지 않는 형식입니다. BOXES 시트가 필요합니다.")
-            return
+        validation = session.validation
 
-        from core.excel_parser import ExcelParser
-        parser = ExcelParser()
-        uploaded_file.seek(0)
-        sheets = parser.read_excel(uploaded_file)
-        validation = parser.validate_data(sheets)
+    if session.sheets and not session.has_sheet('BOXES'):
+        st.error("❌ 지원하지 않는 형식입니다. BOXES 시트가 필요합니다.")
+        return
 
     if not validation['is_valid']:
         st.error("❌ 데이터 검증 실패")
         for error in validation.get('errors', []):
             st.error(f"🔴 {error}")
+        _render_profile(session.profiler)
         return
 
     st.success("✅ 검증 완료!")
+    for warning in validation.get('warnings', []):
+        st.warning(f"⚠️ {warning}")
 
     # 요약 정보
-    data = parser.parse_to_dict(sheets)
+    data = session.data
     col1, col2, col3, col4 = st.columns(4)
     with col1:
         st.metric("레이어", f"{len(data.get('layers', []))}개")
@@ -223,18 +196,29 @@ def render_upload_page():
 
     if st.button("🎨 구성도 생성 → 편집기로 이동", type="primary", use_container_width=True):
         with st.spinner("구성도 생성 중..."):
-            from core.layout_engine import LayoutEngine
-            from core.drawio_generator import DrawioGenerator
+            xml_content, diagram_name = session.generate(compressed=COMPRESS_DIAGRAMS)
+            go_to_editor(xml_content, diagram_name)
+            st.rerun()
 
-            layout_engine = LayoutEngine()
-            positions = layout_engine.calculate_positions(data)
+    _render_profile(session.profiler)
 
-            generator = DrawioGenerator()
-            xml_content = generator.generate_xml(data, positions)
 
-            diagram_name = data.get('config', {}).get('다이어그램명', 'diagram')
-            go_to_editor(xml_content, diagram_name)
-            st.rerun()
+def _render_profile(profiler):
+    """업로드 처리 단계별 시간/메모리 표시"""
+    if profiler is None or not profiler.spans:
+        return
+
+    with st.expander(f"⏱️ 처리 시간 ({profiler.total_ms:.1f} ms)"):
+        rows = []
+        for span in profiler.spans:
+            row = {'단계': '\u3000' * span['depth'] + span['name'], '시간(ms)': f"{span['ms']:.2f}"}
+            if 'peak_kib' in span:
+                row['메모리 최고치(KiB)'] = f"{span['peak_kib']:.1f}"
+            rows.append(row)
+        st.table(rows)
+
+        if profiler.counters:
+            st.caption(' · '.join(f"{name}: {value:,}" for name, value in profiler.counters.items()))
 
 
 # ============================================================
@@ -294,22 +278,33 @@ def render_editor_page():
 
 
 def _render_excel_export_button():
-    """엑셀 내보내기 버튼"""
-    if st.session_state.get('xml_content'):
-        try:
-            from core.xml_to_excel import xml_to_excel
-            excel_bytes = xml_to_excel(st.session_state['xml_content'])
-            st.download_button(
-                label="📤 엑셀",
-                data=excel_bytes,
-                file_name=f"{st.session_state.get('diagram_name', 'diagram')}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                use_container_width=True
-            )
-        except:
-            st.button("📤 엑셀", disabled=True, use_container_width=True)
-    else:
+    """
+    엑셀 내보내기 버튼
+
+    변환은 버튼을 눌렀을 때 실행 (한 번 클릭으로 바로 다운로드)
+    결과는 다이어그램 리비전과 함께 보관해 다이어그램이 그대로면 재사용
+    """
+    xml_content = st.session_state.get('xml_content')
+    if not xml_content:
         st.button("📤 엑셀", disabled=True, use_container_width=True)
+        return
+
+    st.download_button(
+        label="📤 엑셀",
+        data=excel_export_builder(
+            xml_content, st.session_state['diagram_revision'],
+            st.session_state.get('merge_document'), st.session_state['excel_export'],
+        ),
+        file_name=f"{st.session_state.get('diagram_name', 'diagram')}.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        use_container_width=True
+    )
+
+    # 직전 내보내기에서 나온 변환 경고 (부모 판별이 모호한 컴포넌트 등)
+    cache = st.session_state['excel_export']
+    if cache.get('revision') == st.session_state['diagram_revision']:
+        for warning in cache.get('warnings', []):
+            st.warning(f"⚠️ {warning}")
 
 
 def _render_template_gallery():
@@ -329,9 +324,12 @@ def _render_template_gallery():
                     help=template['description']
             ):
                 with st.spinner(f"'{template['name']}' 로딩 중..."):
-                    xml, name = generate_xml_from_template(template_id)
-                    st.session_state['xml_content'] = xml
-                    st.session_state['diagram_name'] = name
+                    try:
+                        xml, name = generate_xml_from_template(template_id)
+                    except (ValueError, FileNotFoundError) as e:
+                        st.error(f"템플릿 로딩 실패: {e}")
+                        continue
+                    set_diagram(xml, name)
                     st.rerun()
 
 
@@ -378,31 +376,26 @@ def _add_component(component_id: str, component_name: str):
     """컴포넌트 추가 (기존 다이어그램에 병합 또는 새로 생성)"""
     with st.spinner(f"'{component_name}' 추가 중..."):
         try:
-            from core.layout_engine import LayoutEngine
-            from core.drawio_generator import DrawioGenerator
-
-            comp_data = generate_component_data(component_id)
-            comp_meta = COMPONENT_CATALOG[component_id]
-            comp_data['config']['캔버스너비'] = comp_meta['width']
-            comp_data['config']['캔버스높이'] = comp_meta['height']
-
-            layout_engine = LayoutEngine()
-            positions = layout_engine.calculate_positions(comp_data)
+            from core.template_pack import get_template_pack
 
-            generator = DrawioGenerator()
-            comp_xml = generator.generate_xml(comp_data, positions)
+            pack = get_template_pack()
 
             # 기존 다이어그램이 있으면 병합, 없으면 새로 생성
             existing_xml = st.session_state.get('xml_content')
 
             if existing_xml:
-                merged_xml = merge_xml_diagrams(existing_xml, comp_xml)
-                st.session_state['xml_content'] = merged_xml
-                st.session_state['diagram_name'] = f"{st.session_state.get('diagram_name', 'diagram')} + {component_name}"
+                # 색인 문서를 세션에 두고 컴포넌트 모델을 이어 붙임 (다른 XML로 바뀌었으면 새로 색인)
+                comp_meta = COMPONENT_CATALOG[component_id]
+                document, merged_xml = merge_into_document(
+                    st.session_state.get('merge_document'), existing_xml, pack.component_model(component_id),
+                    placement=PLACEMENT_FREE if PLACE_COMPONENTS_IN_FREE_SPACE else PLACEMENT_RIGHT,
+                    size=(comp_meta['width'], comp_meta['height']),
+                )
+                st.session_state['merge_document'] = document
+                set_diagram(merged_xml, f"{st.session_state.get('diagram_name', 'diagram')} + {component_name}")
             else:
                 # 새 다이어그램으로 시작
-                st.session_state['xml_content'] = comp_xml
-                st.session_state['diagram_name'] = component_name
+                set_diagram(pack.component_xml(component_id, compressed=COMPRESS_DIAGRAMS), component_name)
 
             st.rerun()
         except Exception as e:
@@ -445,19 +438,19 @@ def render_sidebar():
         if current_page == 'upload':
             st.markdown("### 📥 샘플 다운로드")
             for template_id in get_available_templates():
-                template = TEMPLATE_CATALOG[template_id]
                 try:
-                    excel_data = generate_template_excel(template_id)
+                    template = TEMPLATE_CATALOG[template_id]
+                    # 엑셀 바이트는 버튼을 눌렀을 때만 읽음 (재실행마다 모든 템플릿을 읽지 않음)
                     st.download_button(
                         label=f"{template['icon']} {template['name']}",
-                        data=excel_data,
+                        data=functools.partial(generate_template_excel, template_id),
                         file_name=f"{template_id}.xlsx",
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                         key=f"dl_{template_id}",
                         use_container_width=True
                     )
-                except:
-                    pass
+                except (OSError, KeyError) as e:
+                    st.caption(f"⚠️ {template_id}: 샘플을 불러올 수 없습니다 ({e})")
 
         # 편집기 페이지: 템플릿 설명
         elif current_page == 'editor':
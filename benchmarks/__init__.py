@@ -0,0 +1,3 @@
+"""
+AutoArchitect - 성능 벤치마크
+"""
@@ -0,0 +1,287 @@
+"""
+AutoArchitect - 단계별 성능 벤치마크
+파싱 → 레이아웃 → XML 생성 → 역변환 → 병합 단계의 시간/메모리 측정
+
+실행 예:
+    python -m benchmarks.run                    # 기준값과 비교 (느려지면 종료 코드 1)
+    python -m benchmarks.run --quick            # 작은 시나리오만
+    python -m benchmarks.run --update-baseline  # 기준값 갱신
+
+기준값(baseline.json)은 커밋된 파일이므로, 레이아웃/생성/파싱 비용을 바꾸는 변경이나
+합성 시나리오 변경을 합친 뒤에는 전체 시나리오로 --update-baseline을 실행해 함께 커밋
+(보정 작업 시간도 같이 저장되므로 다른 머신에서 측정해도 비교 가능)
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+# 프로젝트 루트를 path에 추가 (python benchmarks/run.py 실행 지원)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.components import generate_component_xml
+from core.diagram_merger import merge_xml_diagrams
+from core.drawio_generator import DrawioGenerator
+from core.excel_parser import ExcelParser
+from core.layout_engine import LayoutEngine
+from core.templates import generate_template_excel, get_available_templates
+from core.xml_to_excel import XmlToExcelConverter
+from benchmarks.synthetic import QUICK_SCENARIOS, SCENARIOS, build_workbook
+
+
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+
+# 기준 대비 허용 증가율 (0.25 = 25%)
+DEFAULT_THRESHOLD = 0.25
+
+# 이보다 작은 차이는 측정 오차로 보고 무시
+MIN_DELTA_MS = 5.0
+MIN_DELTA_KIB = 64.0
+
+STAGES = ('parse', 'parse_pandas', 'layout', 'generate', 'reverse', 'merge')
+
+
+def count_cells(xml_content: str) -> int:
+    """XML 안의 mxCell 수 (0, 1 루트 셀 포함)"""
+    return xml_content.count('<mxCell ')
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Tuple[float, float]:
+    """
+    함수 실행 시간과 메모리 최고치 측정
+
+    Returns:
+        (가장 빠른 실행 시간 ms, tracemalloc 최고치 KiB)
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+
+    # tracemalloc은 실행을 느리게 하므로 별도 1회 실행으로 측정
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return best * 1000, peak / 1024
+
+
+def calibrate(repeat: int = 5) -> float:
+    """
+    고정 작업량의 실행 시간 (ms)
+
+    기준값과 현재 측정의 머신 속도 차이를 보정하는 데 사용
+    """
+    def workload():
+        table = {}
+        for i in range(200_000):
+            table[i % 1024] = table.get(i % 1024, 0) + len(str(i))
+        return table
+
+    return measure(workload, repeat)[0]
+
+
+def prepare(excel_bytes: bytes) -> Dict[str, Any]:
+    """단계별 입력 준비 (각 단계는 이전 단계 결과를 입력으로 사용)"""
+    parser = ExcelParser(backend='openpyxl')
+    data = parser.parse_to_dict(parser.read_excel(io.BytesIO(excel_bytes)))
+    positions = LayoutEngine().calculate_positions(data)
+    xml_content = DrawioGenerator().generate_xml(data, positions)
+    return {
+        'excel_bytes': excel_bytes,
+        'data': data,
+        'positions': positions,
+        'xml': xml_content,
+        'component_xml': generate_component_xml('db_cluster'),
+    }
+
+
+def stage_functions(inputs: Dict[str, Any]) -> Dict[str, Callable[[], Any]]:
+    """단계 이름 → 측정할 함수"""
+
+    def parse(backend: str):
+        parser = ExcelParser(backend=backend)
+        return parser.parse_to_dict(parser.read_excel(io.BytesIO(inputs['excel_bytes'])))
+
+    return {
+        'parse': lambda: parse('openpyxl'),
+        'parse_pandas': lambda: parse('pandas'),
+        'layout': lambda: LayoutEngine().calculate_positions(inputs['data']),
+        'generate': lambda: DrawioGenerator().generate_xml(inputs['data'], inputs['positions']),
+        'reverse': lambda: XmlToExcelConverter().convert(inputs['xml']),
+        'merge': lambda: merge_xml_diagrams(inputs['xml'], inputs['component_xml']),
+    }
+
+
+def load_scenarios(quick: bool = False, names: Optional[List[str]] = None) -> List[Tuple[str, bytes]]:
+    """
+    (시나리오명, 엑셀 바이트) 목록
+
+    합성 시나리오 + 실제 템플릿 (template:<id>)
+    """
+    specs = QUICK_SCENARIOS if quick else SCENARIOS
+    scenarios = [(spec.name, lambda spec=spec: build_workbook(spec)) for spec in specs]
+    scenarios += [
+        (f"template:{template_id}", lambda template_id=template_id: generate_template_excel(template_id))
+        for template_id in get_available_templates()
+    ]
+
+    if names:
+        scenarios = [(name, loader) for name, loader in scenarios if name in names]
+    return [(name, loader()) for name, loader in scenarios]
+
+
+def run_benchmarks(scenarios: List[Tuple[str, bytes]], stages=STAGES, repeat: int = 3) -> Dict[str, Dict]:
+    """
+    시나리오별 단계 측정
+
+    Returns:
+        {시나리오: {단계: {'wall_ms', 'peak_kib', 'cells_per_sec'}}}
+    """
+    results = {}
+    for name, excel_bytes in scenarios:
+        inputs = prepare(excel_bytes)
+        cells = count_cells(inputs['xml'])
+        functions = stage_functions(inputs)
+
+        results[name] = {'cells': cells}
+        for stage in stages:
+            wall_ms, peak_kib = measure(functions[stage], repeat)
+            results[name][stage] = {
+                'wall_ms': round(wall_ms, 3),
+                'peak_kib': round(peak_kib, 1),
+                'cells_per_sec': round(cells / (wall_ms / 1000)) if wall_ms > 0 else 0,
+            }
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float,
+            speed_ratio: float = 1.0) -> List[str]:
+    """
+    기준값보다 threshold 이상 느려지거나 메모리가 늘어난 항목 목록
+
+    Args:
+        speed_ratio: 현재/기준 머신의 calibrate() 시간 비율 (기준 시간에 곱해 비교)
+    """
+    regressions = []
+    for name, stages in results.items():
+        base_stages = baseline.get(name, {})
+        for stage, metrics in stages.items():
+            base = base_stages.get(stage)
+            if not isinstance(metrics, dict) or not base:
+                continue
+
+            for metric, min_delta in (('wall_ms', MIN_DELTA_MS), ('peak_kib', MIN_DELTA_KIB)):
+                current, previous = metrics[metric], base.get(metric)
+                if previous is None:
+                    continue
+                if metric == 'wall_ms':
+                    previous = round(previous * speed_ratio, 3)
+                if current > previous * (1 + threshold) and current - previous > min_delta:
+                    regressions.append(
+                        f"{name} / {stage} / {metric}: {previous} → {current} "
+                        f"(+{(current / previous - 1) * 100:.0f}%)"
+                    )
+    return regressions
+
+
+def print_report(results: Dict[str, Dict], baseline: Optional[Dict[str, Dict]] = None,
+                 speed_ratio: float = 1.0):
+    """결과 표 출력 (기준값이 있으면 머신 속도 보정 후 변화율 표시)"""
+    print(f"{'시나리오':<28}{'단계':<14}{'시간(ms)':>12}{'최고메모리(KiB)':>18}{'셀/초':>14}{'변화':>10}")
+    for name, stages in results.items():
+        for stage, metrics in stages.items():
+            if not isinstance(metrics, dict):
+                continue
+
+            change = ''
+            base = (baseline or {}).get(name, {}).get(stage)
+            if base and base.get('wall_ms'):
+                change = f"{(metrics['wall_ms'] / (base['wall_ms'] * speed_ratio) - 1) * 100:+.0f}%"
+
+            print(f"{name:<28}{stage:<14}{metrics['wall_ms']:>12.2f}{metrics['peak_kib']:>18.1f}"
+                  f"{metrics['cells_per_sec']:>14,}{change:>10}")
+
+
+def load_baseline(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_baseline(path: Path, results: Dict[str, Dict], repeat: int, calibration_ms: float):
+    payload = {'repeat': repeat, 'calibration_ms': round(calibration_ms, 3), 'results': results}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="AutoArchitect 단계별 성능 벤치마크")
+    parser.add_argument('--quick', action='store_true', help="작은 합성 시나리오만 실행")
+    parser.add_argument('--scenario', action='append', default=None,
+                        help="실행할 시나리오 (여러 번 지정 가능, 예: large, template:msa)")
+    parser.add_argument('--stage', action='append', choices=STAGES, default=None,
+                        help="실행할 단계 (여러 번 지정 가능)")
+    parser.add_argument('-n', '--repeat', type=int, default=5, help="반복 횟수 (가장 빠른 값 사용)")
+    parser.add_argument('--baseline', default=str(BASELINE_PATH), help="기준값 JSON 경로")
+    parser.add_argument('--update-baseline', action='store_true', help="측정 결과로 기준값 갱신")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="허용 증가율 (기본: 0.25 = 25%%)")
+    parser.add_argument('--json', default=None, help="측정 결과를 저장할 JSON 경로")
+    args = parser.parse_args(argv)
+
+    scenarios = load_scenarios(quick=args.quick, names=args.scenario)
+    if not scenarios:
+        print("실행할 시나리오가 없습니다.")
+        return 1
+
+    # 보정 작업은 측정 전후로 실행해 더 빠른 값 사용
+    calibration_ms = calibrate()
+    results = run_benchmarks(scenarios, stages=args.stage or STAGES, repeat=args.repeat)
+    calibration_ms = min(calibration_ms, calibrate())
+
+    baseline_path = Path(args.baseline)
+    baseline = None if args.update_baseline else load_baseline(baseline_path)
+    speed_ratio = 1.0
+    if baseline and baseline.get('calibration_ms'):
+        speed_ratio = calibration_ms / baseline['calibration_ms']
+    print_report(results, baseline['results'] if baseline else None, speed_ratio)
+
+    if args.json:
+        save_baseline(Path(args.json), results, args.repeat, calibration_ms)
+
+    if args.update_baseline:
+        save_baseline(baseline_path, results, args.repeat, calibration_ms)
+        print(f"\n기준값 저장: {baseline_path}")
+        return 0
+
+    if baseline is None:
+        print(f"\n기준값이 없습니다 ({baseline_path}). --update-baseline으로 생성하세요.")
+        return 0
+
+    print(f"\n머신 속도 보정: x{speed_ratio:.2f}")
+    regressions = compare(results, baseline['results'], args.threshold, speed_ratio)
+    if regressions:
+        print(f"\n⚠️ 성능 저하 {len(regressions)}건 (허용 {args.threshold * 100:.0f}%):")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+
+    print(f"\n✅ 기준값 대비 성능 저하 없음 (허용 {args.threshold * 100:.0f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+AutoArchitect - 벤치마크용 합성 엑셀 생성
+레이어 수, 중첩 깊이, 행당 박스 수, 연결 수로 크기를 조절
+"""
+
+import io
+import random
+from dataclasses import dataclass
+from typing import List
+
+import openpyxl
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """
+    합성 워크북 크기 설정
+
+    - layers: 레이어 수
+    - depth: 레이어 아래 박스 중첩 깊이 (마지막 단계는 컴포넌트)
+    - boxes_per_row: 부모 1개의 한 행에 들어가는 자식 수
+    - rows: 부모 1개에 들어가는 행 수
+    - connections: 연결 수
+    """
+    name: str
+    layers: int = 3
+    depth: int = 2
+    boxes_per_row: int = 4
+    rows: int = 1
+    connections: int = 20
+    seed: int = 0
+
+    @property
+    def item_count(self) -> int:
+        """박스 + 컴포넌트 수"""
+        per_parent = self.boxes_per_row * self.rows
+        return self.layers * sum(per_parent ** level for level in range(1, self.depth + 1))
+
+
+# 기본 시나리오 (작은 것부터)
+SCENARIOS = [
+    SyntheticSpec('small', layers=3, depth=2, boxes_per_row=4, rows=1, connections=20),
+    SyntheticSpec('medium', layers=4, depth=2, boxes_per_row=6, rows=2, connections=200),
+    SyntheticSpec('large', layers=6, depth=3, boxes_per_row=5, rows=2, connections=2000),
+]
+
+# --quick 실행용
+QUICK_SCENARIOS = SCENARIOS[:2]
+
+# DrawioGenerator의 COLOR_MAP / CONNECTION_STYLES에 있는 값만 사용 (기본값 대체 경로가 아니라 실제 스타일을 측정)
+_BOX_COLORS = ['흰색', '하늘색', '연두색', '연회색', '노란색']
+_COMPONENT_TYPES = ['단일박스', '서비스', '데이터베이스']
+_CONNECTION_TYPES = ['데이터흐름', '스트림', '양방향']
+
+
+def _write_sheet(wb: openpyxl.Workbook, title: str, headers: List[str], rows: List[list]):
+    ws = wb.create_sheet(title)
+    ws.append(headers)
+    for row in rows:
+        ws.append(row)
+
+
+def _child_rows(spec: SyntheticSpec, parent_id: str, prefix: str, rng: random.Random) -> List[tuple]:
+    """부모 1개에 들어갈 자식 (id, 행번호, Y%, 높이%) 목록"""
+    row_height = 80 / spec.rows
+    children = []
+    for row in range(spec.rows):
+        y_percent = round(15 + row * row_height, 1)
+        height_percent = round(row_height * rng.uniform(0.7, 0.9), 1)
+        for col in range(spec.boxes_per_row):
+            child_id = f"{prefix}{parent_id}_{row + 1}_{col + 1}"
+            children.append((child_id, row + 1, y_percent, height_percent))
+    return children
+
+
+def build_workbook(spec: SyntheticSpec) -> bytes:
+    """
+    설정에 맞는 계층형 엑셀 워크북 생성
+
+    Returns:
+        xlsx 바이트
+    """
+    rng = random.Random(spec.seed)
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+
+    _write_sheet(wb, 'CONFIG', ['항목', '값'], [
+        ['다이어그램명', f'벤치마크 {spec.name}'],
+        ['캔버스너비', 1600],
+        ['캔버스높이', 1200],
+    ])
+
+    layer_ids = [f"L{i + 1}" for i in range(spec.layers)]
+    _write_sheet(wb, 'LAYERS', ['레이어ID', '레이어명', '순서', '배경색', '높이%'], [
+        [layer_id, f'Layer {i + 1}', i + 1, _BOX_COLORS[i % len(_BOX_COLORS)], round(100 / spec.layers, 1)]
+        for i, layer_id in enumerate(layer_ids)
+    ])
+
+    boxes = []
+    components = []
+    parents = layer_ids
+    for level in range(1, spec.depth + 1):
+        is_leaf = level == spec.depth
+        next_parents = []
+        for parent_id in parents:
+            for child_id, row, y_percent, height_percent in _child_rows(spec, parent_id, 'C' if is_leaf else 'B', rng):
+                if is_leaf:
+                    components.append([child_id, f'컴포넌트 {child_id}', parent_id, row, y_percent,
+                                       height_percent, 9, rng.choice(_COMPONENT_TYPES)])
+                else:
+                    boxes.append([child_id, f'박스 {child_id}', parent_id, row, y_percent, height_percent,
+                                  rng.choice(_BOX_COLORS), '회색', 10])
+                next_parents.append(child_id)
+        parents = next_parents
+
+    _write_sheet(wb, 'BOXES', ['박스ID', '박스명', '부모ID', '행번호', 'Y%', '높이%', '배경색', '테두리색', '폰트크기'],
+                 boxes)
+    _write_sheet(wb, 'COMPONENTS', ['ID', '컴포넌트명', '부모ID', '행번호', 'Y%', '높이%', '폰트크기', '타입'],
+                 components)
+
+    endpoints = [row[0] for row in boxes] + [row[0] for row in components]
+    connections = []
+    if len(endpoints) > 1:
+        for i in range(spec.connections):
+            from_id, to_id = rng.sample(endpoints, 2)
+            connections.append([from_id, to_id, rng.choice(_CONNECTION_TYPES), f'E{i + 1}', '실선'])
+    _write_sheet(wb, 'CONNECTIONS', ['출발ID', '도착ID', '연결타입', '라벨', '선스타일'], connections)
+
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
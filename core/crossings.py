@@ -0,0 +1,124 @@
+"""
+AutoArchitect - 연결선 교차 계산
+연결선을 셀 중심 간 직교 경로(ㄱ자)로 보고 스윕 라인으로 교차 개수 계산
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Any, Tuple
+
+# (x1, y1, x2, y2, 연결 번호)
+Segment = Tuple[float, float, float, float, int]
+
+
+class FenwickTree:
+    """구간 합 트리 (1-based 누적 개수)"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    def add(self, index: int, value: int):
+        """index(0-based) 위치에 value 더하기"""
+        index += 1
+        while index <= self.size:
+            self.tree[index] += value
+            index += index & -index
+
+    def prefix_sum(self, count: int) -> int:
+        """앞에서 count개 위치의 합"""
+        total = 0
+        while count > 0:
+            total += self.tree[count]
+            count -= count & -count
+        return total
+
+
+def _center(pos: Dict[str, float]) -> Tuple[float, float]:
+    return pos['x'] + pos['width'] / 2, pos['y'] + pos['height'] / 2
+
+
+def route_orthogonal(positions: Dict[str, Dict], connections: List[Dict]) -> List[List[Segment]]:
+    """
+    연결선을 출발 중심 → (수평) → 도착 x → (수직) → 도착 중심 경로로 변환
+
+    위치가 없는 항목을 잇는 연결은 빈 경로
+
+    Returns:
+        연결별 선분 목록
+    """
+    centers = {}
+    for conn in connections:
+        for node in (conn.get('from_id'), conn.get('to_id')):
+            if node not in centers and node in positions:
+                centers[node] = _center(positions[node])
+    return route_centers(centers, connections)
+
+
+def route_centers(centers: Dict[Any, Tuple[float, float]], connections: List[Dict]) -> List[List[Segment]]:
+    """route_orthogonal과 같은 경로를 항목 중심 좌표로 계산"""
+    routes = []
+    for index, conn in enumerate(connections):
+        source = centers.get(conn.get('from_id'))
+        target = centers.get(conn.get('to_id'))
+        if source is None or target is None:
+            routes.append([])
+            continue
+
+        (x1, y1), (x2, y2) = source, target
+        segments = []
+        if x1 != x2:
+            segments.append((x1, y1, x2, y1, index))
+        if y1 != y2:
+            segments.append((x2, y1, x2, y2, index))
+        routes.append(segments)
+    return routes
+
+
+def count_crossings(routes: List[List[Segment]]) -> int:
+    """
+    서로 다른 연결의 수평/수직 선분 교차 수 (스윕 라인 + Fenwick 트리, O(E log E))
+
+    - 선분 끝점에서 만나는 경우(같은 셀에서 출발 등)는 교차로 보지 않음
+    - 같은 방향으로 겹치는 선분도 교차로 보지 않음
+    """
+    horizontals = []
+    verticals = []
+    for segments in routes:
+        for x1, y1, x2, y2, _ in segments:
+            if y1 == y2:
+                horizontals.append((min(x1, x2), max(x1, x2), y1))
+            else:
+                verticals.append((x1, min(y1, y2), max(y1, y2)))
+
+    if not horizontals or not verticals:
+        return 0
+
+    ys = sorted({y for _, _, y in horizontals})
+
+    # 같은 x에서는 제거 → 질의 → 추가 순서 (끝점 접촉 제외)
+    REMOVE, QUERY, INSERT = 0, 1, 2
+    events = []
+    for left, right, y in horizontals:
+        slot = bisect_left(ys, y)
+        events.append((left, INSERT, slot, 0))
+        events.append((right, REMOVE, slot, 0))
+    for x, low, high in verticals:
+        events.append((x, QUERY, bisect_right(ys, low), bisect_left(ys, high)))
+    events.sort()
+
+    tree = FenwickTree(len(ys))
+    crossings = 0
+    for _, kind, first, last in events:
+        if kind == INSERT:
+            tree.add(first, 1)
+        elif kind == REMOVE:
+            tree.add(first, -1)
+        elif last > first:
+            # low < y < high 인 활성 수평선 개수
+            crossings += tree.prefix_sum(last) - tree.prefix_sum(first)
+    return crossings
+
+
+def detect_crossings(positions: Dict[str, Dict], connections: List[Dict]) -> int:
+    """연결선 교차 개수"""
+    return count_crossings(route_orthogonal(positions, connections))
@@ -0,0 +1,259 @@
+"""
+AutoArchitect - 다이어그램 병합
+기존 Draw.io XML에 컴포넌트 XML을 붙여 넣기
+
+- merge_xml_diagrams: 1회성 병합 (매번 기존 XML 전체를 파싱)
+- MergeDocument: 기존 다이어그램을 한 번 파싱해 DiagramModel과 색인(영역, 셀 문자열)으로 보관하고
+  이후 병합은 새 셀만 직렬화해 뒤에 붙임 (반복 추가 비용이 컴포넌트 크기에 비례)
+"""
+
+import base64
+import xml.etree.ElementTree as ET
+import zlib
+from typing import Dict, List, Optional, Tuple, Union
+
+from core.diagram_model import Cell, DiagramModel
+from core.drawio_compression import expand_mxfile, is_compressed, uri_encode
+from core.placement import FreeSpacePlacer
+from core.xml_writer import serialize_element
+
+# 바깥 mxfile 직렬화 결과에서 다이어그램 본문 자리를 찾기 위한 표시
+_PAYLOAD_MARKER = 'AUTOARCHITECT-MERGE-PAYLOAD'
+
+# 자동 배치 시 기존 다이어그램 오른쪽에 두는 간격
+MERGE_GAP = 100
+
+# 자동 배치 방식
+PLACEMENT_RIGHT = 'right'  # 기존 영역 오른쪽 끝 + MERGE_GAP
+PLACEMENT_FREE = 'free'    # 기존 항목을 피한 빈 공간 (core.placement)
+
+
+class MergeDocument:
+    """
+    병합용 색인 문서
+
+    - 생성 시 한 번만 파싱해 DiagramModel(model)로 보관: 최대 숫자 ID, 정점 영역(bbox), 최상위 정점 사각형 기록
+    - 모델 XML은 '</root>' 앞뒤 문자열로 나눠 두고 추가된 셀 문자열만 이어 붙임
+      (기존 부분은 원본 요소를 그대로 직렬화하므로 draw.io에서 편집한 부가 요소도 유지)
+    - 압축 다이어그램은 deflate 상태를 유지해 새 셀만 압축하고 출력 때 꼬리만 마무리
+
+    Raises:
+        ValueError: mxGraphModel/root를 찾을 수 없을 때
+        ET.ParseError: XML 형식 오류
+    """
+
+    def __init__(self, source: Union[str, DiagramModel], compressed: bool = False):
+        """
+        Args:
+            source: 기존 다이어그램 XML 또는 모델 (모델은 복사하지 않고 이어서 수정함)
+            compressed: source가 모델일 때 압축 형식으로 출력할지 여부 (XML이면 원본 형식을 따름)
+        """
+        # 정점 영역 (x1, y1, x2, y2) - 오른쪽 끝은 기존 병합과 같이 0부터 시작
+        self.bbox: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 0.0)
+        # 최상위(parent='1') 정점 ID → {x, y, width, height}
+        self.rects: Dict[str, Dict[str, float]] = {}
+        self._placer: Optional[FreeSpacePlacer] = None
+        self.last_id_map: Dict[str, str] = {}
+
+        if isinstance(source, DiagramModel):
+            self.compressed = compressed
+            self.model = source
+            model_xml = source.model_xml(compact=compressed)
+            self._head, self._tail = source.file_xml(_PAYLOAD_MARKER).split(_PAYLOAD_MARKER, 1)
+        else:
+            root = ET.fromstring(source)
+            self.compressed = is_compressed(root)
+            expand_mxfile(root)
+
+            diagram = next((d for d in root.iter('diagram') if d.find('mxGraphModel') is not None), None)
+            graph_model = diagram.find('mxGraphModel') if diagram is not None else root.find('.//mxGraphModel')
+            if graph_model is None or graph_model.find('root') is None:
+                raise ValueError("mxGraphModel/root가 없는 다이어그램입니다")
+            self.model = DiagramModel.from_element(diagram if diagram is not None else graph_model)
+            if root.tag == 'mxfile':
+                self.model.file_attrs = dict(root.attrib)
+
+            # 모델 본문은 원본 요소 그대로 직렬화
+            model_xml = serialize_element(graph_model, compact=self.compressed, declaration=False)
+
+            # 바깥 mxfile: 모델 자리를 표시 문자열로 비워 두고 앞뒤로 나눔
+            if diagram is not None:
+                diagram.remove(graph_model)
+                diagram.text = _PAYLOAD_MARKER
+                outer = serialize_element(root)
+                self._head, self._tail = outer.split(_PAYLOAD_MARKER, 1)
+            else:
+                self._head, self._tail = '', ''
+
+        for cell in self.model:
+            self._index(cell)
+
+        # 모델 본문: '</root>' 앞 / 추가된 셀들 / '</root>'부터 끝
+        split_at = model_xml.rfind('</root>')
+        self._model_head = model_xml[:split_at]
+        self._model_tail = model_xml[split_at:]
+        self._cells: List[str] = []
+
+        self._deflated: List[bytes] = []
+        self._compressor = None
+        if self.compressed:
+            self._compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+            self._deflated.append(self._compressor.compress(uri_encode(self._model_head)))
+
+        self._xml: Optional[str] = None
+
+    @property
+    def max_id(self) -> int:
+        return self.model.max_id
+
+    def _index(self, cell: Cell):
+        """셀 하나를 영역 / 최상위 사각형에 반영"""
+        if not cell.vertex or not cell.has_geometry:
+            return
+        pos = cell.rect()
+        x, y = pos['x'], pos['y']
+        x1, y1, x2, y2 = self.bbox
+        self.bbox = (min(x1, x), min(y1, y), max(x2, x + pos['width']), max(y2, y + pos['height']))
+        if cell.parent in (None, '1'):
+            self.rects[cell.id] = pos
+            if self._placer is not None:
+                self._placer.add(cell.id, pos)
+
+    def _free_offset(self, cells: List[Cell], size: Optional[Tuple[float, float]]) -> Tuple[int, int]:
+        """새 셀 영역을 빈 공간으로 옮기는 이동량"""
+        boxes = [
+            cell.rect() for cell in cells
+            if cell.vertex and cell.has_geometry and cell.parent in (None, '1')
+        ]
+        if not boxes:
+            return 0, 0
+
+        left = min(box['x'] for box in boxes)
+        top = min(box['y'] for box in boxes)
+        width = max(box['x'] + box['width'] for box in boxes) - left
+        height = max(box['y'] + box['height'] for box in boxes) - top
+        if size:
+            width, height = max(width, size[0]), max(height, size[1])
+
+        if self._placer is None:
+            self._placer = FreeSpacePlacer(self.rects)
+        x, y = self._placer.find(width, height)
+        return int(x - left), int(y - top)
+
+    @property
+    def xml_content(self) -> str:
+        """현재 문서 XML (추가 후 처음 요청될 때만 다시 조립)"""
+        if self._xml is None:
+            if self.compressed:
+                tail = self._compressor.copy()
+                deflated = b''.join(self._deflated) + tail.compress(uri_encode(self._model_tail)) + tail.flush()
+                body = base64.b64encode(deflated).decode('ascii')
+            else:
+                body = ''.join([self._model_head, *self._cells, self._model_tail])
+            self._xml = self._head + body + self._tail
+        return self._xml
+
+    def append(self, new_diagram: Union[str, DiagramModel], offset_x: int = 0, offset_y: int = 0,
+               placement: str = PLACEMENT_RIGHT, size: Optional[Tuple[float, float]] = None) -> str:
+        """
+        새 다이어그램의 셀을 ID를 바꿔 뒤에 붙임
+
+        Args:
+            new_diagram: 붙일 다이어그램 XML 또는 모델 (모델은 수정하지 않음)
+            offset_x, offset_y: 새 셀 이동량 (둘 다 0이면 placement 방식으로 자동 배치)
+            placement: PLACEMENT_RIGHT(기존 영역 오른쪽) / PLACEMENT_FREE(빈 공간)
+            size: PLACEMENT_FREE에서 확보할 (너비, 높이) - 새 셀 영역보다 작으면 셀 영역 사용
+
+        Returns:
+            병합된 XML
+        """
+        if isinstance(new_diagram, DiagramModel):
+            new_cells = [cell.copy() for cell in new_diagram]
+        else:
+            new_root = expand_mxfile(ET.fromstring(new_diagram))
+            if new_root.find('.//root') is None:
+                raise ValueError("mxGraphModel/root가 없는 다이어그램입니다")
+            new_cells = DiagramModel.from_element(new_root).cells
+
+        if offset_x == 0 and offset_y == 0:
+            if placement == PLACEMENT_FREE:
+                offset_x, offset_y = self._free_offset(new_cells, size)
+            else:
+                offset_x = int(self.bbox[2]) + MERGE_GAP
+
+        id_mapping = {'0': '0', '1': '1'}
+        pieces = []
+        for cell in new_cells:
+            _remap_cell(cell, id_mapping, self.model.new_id(), offset_x, offset_y)
+            self.model.add(cell)  # max_id가 새 ID로 올라감
+            self._index(cell)
+            pieces.append(cell.to_xml())
+
+        self.last_id_map = id_mapping
+        self._cells.extend(pieces)
+        if self._compressor is not None:
+            self._deflated.append(self._compressor.compress(uri_encode(''.join(pieces))))
+        self._xml = None
+        return self.xml_content
+
+
+def _remap_cell(cell: Cell, id_mapping: Dict[str, str], new_id: str,
+                offset_x: float, offset_y: float):
+    """병합할 셀의 ID/참조/좌표 변경 (제자리)"""
+    id_mapping[cell.id] = new_id
+    cell.id = new_id
+
+    parent_id = cell.parent if cell.parent is not None else '1'
+    if parent_id in id_mapping:
+        cell.parent = id_mapping[parent_id]
+
+    if cell.source and cell.source in id_mapping:
+        cell.source = id_mapping[cell.source]
+    if cell.target and cell.target in id_mapping:
+        cell.target = id_mapping[cell.target]
+
+    # 정점 좌표 / 연결선 꺾는 점·끝점 이동 (연결선 라벨은 연결선을 따라감)
+    cell.move(offset_x, offset_y)
+
+
+def merge_into_document(document: Optional[MergeDocument], existing_xml: str,
+                        new_diagram: Union[str, DiagramModel],
+                        placement: str = PLACEMENT_RIGHT,
+                        size: Optional[Tuple[float, float]] = None) -> Tuple[Optional[MergeDocument], str]:
+    """
+    색인 문서를 재사용해 병합
+
+    document가 existing_xml로 만든(또는 마지막으로 병합한) 문서면 그대로 이어 붙이고,
+    아니면 existing_xml로 새 문서를 만듦 (placement/size는 MergeDocument.append 참고)
+
+    Returns:
+        (다음 병합에 쓸 문서, 병합된 XML) - 실패하면 (None, 새 다이어그램 XML)
+    """
+    if not existing_xml or not existing_xml.strip():
+        return None, _as_xml(new_diagram)
+
+    try:
+        if document is None or document.xml_content != existing_xml:
+            document = MergeDocument(existing_xml)
+        return document, document.append(new_diagram, placement=placement, size=size)
+    except (ET.ParseError, ValueError) as e:
+        print(f"XML 병합 오류: {e}")
+        return None, _as_xml(new_diagram)
+
+
+def _as_xml(diagram: Union[str, DiagramModel]) -> str:
+    """병합하지 못한 새 다이어그램 XML (모델이면 비압축 XML로 직렬화)"""
+    return diagram if isinstance(diagram, str) else diagram.to_xml()
+
+
+def merge_xml_diagrams(existing_xml: str, new_xml: str, offset_x: int = 0, offset_y: int = 0) -> str:
+    """두 Draw.io XML을 병합 (압축 다이어그램은 압축 형식 그대로 병합)"""
+
+    if not existing_xml or not existing_xml.strip():
+        return new_xml
+
+    try:
+        return MergeDocument(existing_xml).append(new_xml, offset_x, offset_y)
+    except Exception as e:
+        print(f"XML 병합 오류: {e}")
+        return new_xml
@@ -0,0 +1,414 @@
+"""
+AutoArchitect - 다이어그램 모델
+생성기 / 병합 / 역변환기가 함께 쓰는 메모리 내 다이어그램 표현
+
+- 셀은 __slots__ 레코드(Cell)로 보관하고 셀 ID / 원본 항목 ID 색인 제공
+- XML은 직렬화 형식 중 하나 (write/to_xml로 쓰고 from_xml로 읽음)
+- 첫 번째 페이지(diagram)만 다루며, AutoArchitect가 쓰지 않는 draw.io 부가 요소
+  (<object> 래퍼 등)는 읽을 때 버림
+- 연결선 라벨 셀(relative 좌표 + offset)과 연결선 끝점(sourcePoint/targetPoint)은 보존
+"""
+
+import io
+import uuid
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Dict, List, Any, Iterator, Optional, TextIO, Tuple
+
+from core.drawio_compression import compress_diagram, parse_drawio_xml
+from core.xml_writer import XmlStreamWriter
+
+# 셀 종류 (원본 데이터에서 만든 셀에만 기록, XML에서 읽은 셀은 None)
+CELL_LAYER = 'layer'
+CELL_HEADER = 'header'
+CELL_BOX = 'box'
+CELL_COMPONENT = 'component'
+CELL_EDGE = 'edge'
+
+# mxGraphModel 기본 속성 (pageWidth/pageHeight는 모델 값으로 채움)
+GRAPH_MODEL_DEFAULTS = {
+    'dx': '1422',
+    'dy': '794',
+    'grid': '1',
+    'gridSize': '10',
+    'guides': '1',
+    'tooltips': '1',
+    'connect': '1',
+    'arrows': '1',
+    'fold': '1',
+    'page': '1',
+    'pageScale': '1',
+    'pageWidth': '',
+    'pageHeight': '',
+    'math': '0',
+    'shadow': '0',
+}
+
+# by_item에 색인하는 셀 종류 (항목당 대표 셀)
+_ITEM_KINDS = frozenset({CELL_LAYER, CELL_BOX, CELL_COMPONENT})
+
+# Cell이 직접 다루는 mxCell 속성 (나머지는 Cell.attrs로 보존)
+_CELL_ATTRS = frozenset({'id', 'value', 'style', 'parent', 'vertex', 'edge', 'source', 'target'})
+
+# 연결선 끝점 mxPoint의 as 값 (기록 순서)
+_TERMINAL_POINTS = ('sourcePoint', 'targetPoint')
+
+
+def _number(value: float) -> str:
+    """좌표 문자열 (정수면 소수점 없이)"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class Cell:
+    """
+    mxCell 레코드
+
+    - x/y가 None이면 정점 좌표 없음, width/height가 None이면 크기 미지정 (연결선은 항상 relative 좌표)
+    - points: 연결선 꺾는 점 [(x, y), ...] 또는 None
+    - relative: 정점 좌표가 부모 연결선 기준 상대 좌표인지 (연결선 라벨 셀)
+    - offset: <mxPoint as="offset"> 좌표 (x, y) 또는 None
+    - terminals: 연결선 끝점 {'sourcePoint' | 'targetPoint': (x, y)} 또는 None
+    - kind / item_id: 생성기가 만든 셀의 종류와 원본 항목 ID (XML에서 읽으면 None)
+    - attrs: 그 밖의 mxCell 속성 (없으면 None)
+    """
+
+    __slots__ = ('id', 'value', 'style', 'parent', 'vertex', 'edge', 'source', 'target',
+                 'x', 'y', 'width', 'height', 'points', 'relative', 'offset', 'terminals',
+                 'kind', 'item_id', 'attrs')
+
+    def __init__(self, id: str, value: str = '', style: str = '', parent: str = '1',
+                 vertex: bool = False, edge: bool = False,
+                 source: Optional[str] = None, target: Optional[str] = None,
+                 x: Optional[float] = None, y: Optional[float] = None,
+                 width: Optional[float] = None, height: Optional[float] = None,
+                 points: Optional[List[Tuple[float, float]]] = None,
+                 relative: bool = False, offset: Optional[Tuple[float, float]] = None,
+                 terminals: Optional[Dict[str, Tuple[float, float]]] = None,
+                 kind: Optional[str] = None, item_id: Any = None,
+                 attrs: Optional[Dict[str, str]] = None):
+        self.id = id
+        self.value = value
+        self.style = style
+        self.parent = parent
+        self.vertex = vertex
+        self.edge = edge
+        self.source = source
+        self.target = target
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.points = points
+        self.relative = relative
+        self.offset = offset
+        self.terminals = terminals
+        self.kind = kind
+        self.item_id = item_id
+        self.attrs = attrs
+
+    def __repr__(self) -> str:
+        return f"Cell(id={self.id!r}, kind={self.kind!r}, value={self.value!r})"
+
+    @property
+    def has_geometry(self) -> bool:
+        return self.x is not None
+
+    def rect(self) -> Dict[str, float]:
+        """positions 형식 좌표 {x, y, width, height}"""
+        return {'x': self.x or 0, 'y': self.y or 0, 'width': self.width or 0, 'height': self.height or 0}
+
+    def move(self, dx: float, dy: float):
+        """
+        정점 좌표 / 꺾는 점 / 끝점 이동 (정수로 내림 - 생성기 출력과 같은 형식)
+
+        relative 좌표(연결선 라벨)는 부모 연결선을 따라가므로 그대로 둠
+        """
+        if self.vertex and self.has_geometry:
+            if not self.relative:
+                self.x = int(self.x + dx)
+                self.y = int(self.y + dy)
+            return
+        if self.points:
+            self.points = [(int(x + dx), int(y + dy)) for x, y in self.points]
+        if self.terminals:
+            self.terminals = {name: (int(x + dx), int(y + dy)) for name, (x, y) in self.terminals.items()}
+
+    def write(self, writer: XmlStreamWriter):
+        """mxCell 요소 기록"""
+        attrs = {'id': self.id}
+        if self.value is not None:
+            attrs['value'] = self.value
+        if self.style is not None:
+            attrs['style'] = self.style
+        if self.parent is not None:
+            attrs['parent'] = self.parent
+        if self.vertex:
+            attrs['vertex'] = '1'
+        if self.edge:
+            attrs['edge'] = '1'
+        if self.source is not None:
+            attrs['source'] = self.source
+        if self.target is not None:
+            attrs['target'] = self.target
+        if self.attrs:
+            attrs.update(self.attrs)
+
+        if self.edge:
+            geometry = {'relative': '1', 'as': 'geometry'}
+        elif self.has_geometry:
+            geometry = {'x': _number(self.x), 'y': _number(self.y)}
+            if self.width is not None:
+                geometry['width'] = _number(self.width)
+            if self.height is not None:
+                geometry['height'] = _number(self.height)
+            if self.relative:
+                geometry['relative'] = '1'
+            geometry['as'] = 'geometry'
+        else:
+            writer.empty('mxCell', attrs)
+            return
+
+        writer.start('mxCell', attrs)
+        if self.points or self.offset is not None or self.terminals:
+            writer.start('mxGeometry', geometry)
+            for name in _TERMINAL_POINTS:
+                if self.terminals and name in self.terminals:
+                    x, y = self.terminals[name]
+                    writer.empty('mxPoint', {'x': _number(x), 'y': _number(y), 'as': name})
+            if self.points:
+                writer.start('Array', {'as': 'points'})
+                for x, y in self.points:
+                    writer.empty('mxPoint', {'x': _number(x), 'y': _number(y)})
+                writer.end('Array')
+            if self.offset is not None:
+                x, y = self.offset
+                writer.empty('mxPoint', {'x': _number(x), 'y': _number(y), 'as': 'offset'})
+            writer.end('mxGeometry')
+        else:
+            writer.empty('mxGeometry', geometry)
+        writer.end('mxCell')
+
+    def copy(self) -> 'Cell':
+        """복사본 (points / terminals / attrs도 새 목록 / dict)"""
+        clone = Cell.__new__(Cell)
+        for slot in Cell.__slots__:
+            setattr(clone, slot, getattr(self, slot))
+        if self.points is not None:
+            clone.points = list(self.points)
+        if self.terminals is not None:
+            clone.terminals = dict(self.terminals)
+        if self.attrs is not None:
+            clone.attrs = dict(self.attrs)
+        return clone
+
+    def to_xml(self) -> str:
+        """한 셀의 압축(들여쓰기 없는) XML"""
+        output = io.StringIO()
+        self.write(XmlStreamWriter(output, compact=True))
+        return output.getvalue()
+
+    @classmethod
+    def from_element(cls, elem: ET.Element) -> 'Cell':
+        """mxCell 요소 → Cell"""
+        extra = {key: value for key, value in elem.attrib.items() if key not in _CELL_ATTRS}
+        cell = cls(
+            elem.get('id', ''),
+            value=elem.get('value'),
+            style=elem.get('style'),
+            parent=elem.get('parent'),
+            vertex=elem.get('vertex') == '1',
+            edge=elem.get('edge') == '1',
+            source=elem.get('source'),
+            target=elem.get('target'),
+            attrs=extra or None,
+        )
+
+        geom = elem.find('mxGeometry')
+        if geom is not None:
+            if not cell.edge:
+                # draw.io는 0인 좌표를 생략함 (크기가 없으면 None - 읽는 쪽에서 기본값 결정)
+                cell.x = float(geom.get('x', 0))
+                cell.y = float(geom.get('y', 0))
+                cell.width = float(geom.get('width')) if 'width' in geom.attrib else None
+                cell.height = float(geom.get('height')) if 'height' in geom.attrib else None
+                cell.relative = geom.get('relative') == '1'
+            array = geom.find('Array')
+            if array is not None:
+                cell.points = [
+                    (float(point.get('x', 0)), float(point.get('y', 0)))
+                    for point in array.iter('mxPoint')
+                ]
+            # 라벨 위치(offset) / 연결선 끝점 (Array 밖의 mxPoint)
+            for point in geom.findall('mxPoint'):
+                role = point.get('as')
+                xy = (float(point.get('x', 0)), float(point.get('y', 0)))
+                if role == 'offset':
+                    cell.offset = xy
+                elif role in _TERMINAL_POINTS:
+                    if cell.terminals is None:
+                        cell.terminals = {}
+                    cell.terminals[role] = xy
+        return cell
+
+
+class DiagramModel:
+    """
+    다이어그램 한 페이지
+
+    - cells: 기본 셀('0', '1')을 뺀 셀 목록 (문서 순서)
+    - by_id: 셀 ID → Cell, by_item: 원본 항목 ID → 대표 셀 (레이어/박스/컴포넌트)
+    - max_id: 가장 큰 숫자 셀 ID (new_id는 그 다음부터)
+    """
+
+    def __init__(self, name: str = 'diagram', page_width: int = 1200, page_height: int = 900,
+                 diagram_id: Optional[str] = None):
+        self.name = name
+        self.page_width = page_width
+        self.page_height = page_height
+        self.diagram_id = diagram_id or str(uuid.uuid4())
+        self.file_attrs: Optional[Dict[str, str]] = None
+        self.graph_attrs: Dict[str, str] = dict(GRAPH_MODEL_DEFAULTS)
+        self.cells: List[Cell] = []
+        self.by_id: Dict[str, Cell] = {}
+        self.by_item: Dict[Any, Cell] = {}
+        self.max_id = 1
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __iter__(self) -> Iterator[Cell]:
+        return iter(self.cells)
+
+    def new_id(self) -> str:
+        """다음 숫자 셀 ID"""
+        return str(self.max_id + 1)
+
+    def add(self, cell: Cell) -> Cell:
+        """셀 추가 및 색인"""
+        self.cells.append(cell)
+        self.by_id[cell.id] = cell
+        if cell.id.isdigit() and int(cell.id) > self.max_id:
+            self.max_id = int(cell.id)
+        if cell.item_id is not None and cell.kind in _ITEM_KINDS:
+            self.by_item[cell.item_id] = cell
+        return cell
+
+    def get(self, cell_id: str) -> Optional[Cell]:
+        return self.by_id.get(cell_id)
+
+    def vertices(self) -> Iterator[Cell]:
+        return (cell for cell in self.cells if cell.vertex)
+
+    def edges(self) -> Iterator[Cell]:
+        return (cell for cell in self.cells if cell.edge)
+
+    # ---------- XML 직렬화 ----------
+
+    def _file_attrs(self) -> Dict[str, str]:
+        if self.file_attrs is not None:
+            return self.file_attrs
+        return {
+            'host': 'app.diagrams.net',
+            'modified': datetime.now().isoformat(),
+            'agent': 'AutoArchitect',
+            'version': '1.0',
+            'type': 'device'
+        }
+
+    def _graph_attrs(self) -> Dict[str, str]:
+        attrs = dict(self.graph_attrs)
+        attrs['pageWidth'] = str(self.page_width)
+        attrs['pageHeight'] = str(self.page_height)
+        return attrs
+
+    def write_model(self, writer: XmlStreamWriter):
+        """<mxGraphModel> 요소 기록"""
+        writer.start('mxGraphModel', self._graph_attrs())
+        writer.start('root')
+        writer.empty('mxCell', {'id': '0'})
+        writer.empty('mxCell', {'id': '1', 'parent': '0'})
+        for cell in self.cells:
+            cell.write(writer)
+        writer.end('root')
+        writer.end('mxGraphModel')
+
+    def model_xml(self, compact: bool = True) -> str:
+        """<mxGraphModel> XML"""
+        output = io.StringIO()
+        self.write_model(XmlStreamWriter(output, compact=compact))
+        return output.getvalue()
+
+    def write(self, stream: TextIO, compact: bool = False, compressed: bool = False):
+        """
+        mxfile 문서를 스트림에 기록
+
+        Args:
+            compressed: True면 <diagram> 본문을 draw.io 압축 형식(deflate+base64)으로 기록
+        """
+        writer = XmlStreamWriter(stream, compact=compact)
+        self._write_file(writer, compress_diagram(self.model_xml()) if compressed else None)
+
+    def _write_file(self, writer: XmlStreamWriter, payload: Optional[str]):
+        """mxfile 기록 (payload가 있으면 <diagram> 본문 문자열, 없으면 mxGraphModel 요소)"""
+        writer.declaration()
+        writer.start('mxfile', self._file_attrs())
+        diagram_attrs = {'name': str(self.name), 'id': self.diagram_id}
+        if payload is not None:
+            writer.text_element('diagram', payload, diagram_attrs)
+        else:
+            writer.start('diagram', diagram_attrs)
+            self.write_model(writer)
+            writer.end('diagram')
+        writer.end('mxfile')
+
+    def file_xml(self, payload: str) -> str:
+        """<diagram> 본문 자리에 payload 문자열을 넣은 mxfile XML (payload는 이스케이프됨)"""
+        output = io.StringIO()
+        self._write_file(XmlStreamWriter(output), payload)
+        return output.getvalue()
+
+    def to_xml(self, compact: bool = False, compressed: bool = False) -> str:
+        output = io.StringIO()
+        self.write(output, compact=compact, compressed=compressed)
+        return output.getvalue()
+
+    # ---------- XML 읽기 ----------
+
+    @classmethod
+    def from_xml(cls, xml_content: str) -> 'DiagramModel':
+        """
+        Draw.io XML → 모델 (압축/비압축 모두 지원)
+
+        Raises:
+            ET.ParseError: XML 형식 오류
+            ValueError: 압축 해제 실패 / mxGraphModel이 없을 때
+        """
+        return cls.from_element(parse_drawio_xml(xml_content))
+
+    @classmethod
+    def from_element(cls, root: ET.Element) -> 'DiagramModel':
+        """압축을 푼 mxfile(또는 mxGraphModel) 요소 → 모델"""
+        diagram = root.find('.//diagram') if root.tag != 'diagram' else root
+        graph_model = root if root.tag == 'mxGraphModel' else root.find('.//mxGraphModel')
+        if graph_model is None:
+            raise ValueError("mxGraphModel이 없는 다이어그램입니다")
+
+        model = cls(
+            name=diagram.get('name', 'diagram') if diagram is not None else 'diagram',
+            page_width=int(float(graph_model.get('pageWidth', 1400))),
+            page_height=int(float(graph_model.get('pageHeight', 900))),
+            diagram_id=diagram.get('id') if diagram is not None else None,
+        )
+        if root.tag == 'mxfile':
+            model.file_attrs = dict(root.attrib)
+        model.graph_attrs = dict(graph_model.attrib)
+
+        graph_root = graph_model.find('root')
+        if graph_root is not None:
+            for elem in graph_root.findall('mxCell'):
+                if elem.get('id', '') in ('0', '1'):
+                    continue
+                model.add(Cell.from_element(elem))
+        return model
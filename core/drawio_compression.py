@@ -0,0 +1,102 @@
+"""
+AutoArchitect - Draw.io 다이어그램 압축
+<diagram> 본문을 draw.io 압축 형식(raw deflate + base64)으로 변환
+"""
+
+import base64
+import binascii
+import urllib.parse
+import xml.etree.ElementTree as ET
+import zlib
+
+from core.xml_writer import serialize_element
+
+
+# encodeURIComponent가 이스케이프하지 않는 문자
+_URI_SAFE = "-_.!~*'()"
+
+
+def uri_encode(text: str) -> bytes:
+    """
+    JavaScript encodeURIComponent와 같은 인코딩 (deflate 입력용 ASCII 바이트)
+
+    압축 문자열을 조각 단위로 만드는 쪽(증분 압축)도 같은 함수를 써야 draw.io와 결과가 같음
+    """
+    return urllib.parse.quote(text, safe=_URI_SAFE).encode('ascii')
+
+
+def compress_diagram(model_xml: str) -> str:
+    """
+    mxGraphModel XML을 draw.io 압축 문자열로 변환
+
+    encodeURIComponent → raw deflate → base64 (draw.io와 동일한 순서)
+
+    Args:
+        model_xml: <mxGraphModel> XML 문자열
+
+    Returns:
+        <diagram> 본문에 넣을 압축 문자열
+    """
+    encoded = uri_encode(model_xml)
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+    deflated = compressor.compress(encoded) + compressor.flush()
+    return base64.b64encode(deflated).decode('ascii')
+
+
+def decompress_diagram(payload: str) -> str:
+    """
+    draw.io 압축 문자열을 mxGraphModel XML로 복원
+
+    Raises:
+        ValueError: 압축 형식이 아닐 때
+    """
+    try:
+        deflated = base64.b64decode(payload.strip(), validate=False)
+        encoded = zlib.decompress(deflated, -zlib.MAX_WBITS)
+    except (binascii.Error, zlib.error) as e:
+        raise ValueError(f"압축된 다이어그램을 해제할 수 없습니다: {e}")
+    return urllib.parse.unquote(encoded.decode('utf-8'))
+
+
+def is_compressed(root: ET.Element) -> bool:
+    """mxfile 안에 압축된 diagram이 있는지 확인"""
+    for diagram in root.iter('diagram'):
+        if diagram.find('mxGraphModel') is None and (diagram.text or '').strip():
+            return True
+    return False
+
+
+def expand_mxfile(root: ET.Element) -> ET.Element:
+    """압축된 diagram 본문을 mxGraphModel 요소로 풀어서 붙임 (제자리 변경)"""
+    for diagram in root.iter('diagram'):
+        payload = (diagram.text or '').strip()
+        if diagram.find('mxGraphModel') is not None or not payload:
+            continue
+
+        diagram.append(ET.fromstring(decompress_diagram(payload)))
+        diagram.text = None
+    return root
+
+
+def compress_mxfile(root: ET.Element) -> ET.Element:
+    """diagram의 mxGraphModel 요소를 압축 문자열로 바꿈 (제자리 변경)"""
+    for diagram in root.iter('diagram'):
+        graph_model = diagram.find('mxGraphModel')
+        if graph_model is None:
+            continue
+
+        model_xml = serialize_element(graph_model, compact=True, declaration=False)
+        diagram.remove(graph_model)
+        diagram.text = compress_diagram(model_xml)
+    return root
+
+
+def parse_drawio_xml(xml_content: str) -> ET.Element:
+    """
+    Draw.io XML 파싱 (압축/비압축 모두 지원)
+
+    Raises:
+        ET.ParseError: XML 형식 오류
+        ValueError: 압축 해제 실패
+    """
+    return expand_mxfile(ET.fromstring(xml_content))
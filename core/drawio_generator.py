@@ -4,11 +4,15 @@ AutoArchitect - Draw.io 생성기
 - app.py와 호환되는 클래스명 사용
 """
 
-import xml.etree.ElementTree as ET
-from typing import Dict, List, Any
-from datetime import datetime
-import uuid
-import pandas as pd
+import io
+from typing import Dict, List, Any, TextIO, Tuple
+from utils.values import is_missing, is_truthy
+from core.diagram_model import (
+    CELL_BOX, CELL_COMPONENT, CELL_EDGE, CELL_HEADER, CELL_LAYER, Cell, DiagramModel,
+)
+from core.edge_router import OrthogonalRouter
+from core.instrumentation import get_profiler
+from core.records import Rect
 
 # 색상 매핑
 COLOR_MAP = {
@@ -60,6 +64,9 @@ CONNECTION_STYLES = {
     }
 }
 
+# CONFIG 시트에서 연결선 경로 계산을 켜는 항목
+EDGE_ROUTING_CONFIG_KEY = '연결선경로계산'
+
 LINE_STYLES = {
     '실선': '',
     '점선': 'dashed=1;dashPattern=3 3;',
@@ -71,46 +78,99 @@ LINE_STYLES = {
 class DrawioGenerator:
     """Draw.io XML 생성기 - 헤더 영역 확보 버전"""
 
+    # 출력 형식이 바뀌면 올림 (파이프라인 캐시 무효화)
+    VERSION = '2'
+
     LAYER_HEADER_HEIGHT = 20
     BOX_HEADER_HEIGHT = 25
     HEADER_TOP_MARGIN = 3
     HEADER_SIDE_MARGIN = 5
 
-    def __init__(self):
+    def __init__(self, profiler=None, route_edges: bool = False):
+        """
+        Args:
+            profiler: 단계별 시간을 기록할 Profiler
+            route_edges: True면 연결선 꺾는 점을 미리 계산해 기록
+                (CONFIG 시트의 '연결선경로계산' 값으로도 켤 수 있음)
+        """
+        self.profiler = get_profiler(profiler)
+        self.route_edges = route_edges
         self.cell_id_counter = 2
         self.positions = {}
         self.cell_map = {}
         self.box_children = {}
+        self.model = None
+        self._waypoints = {}
 
-    def generate_xml(self, data: Dict[str, Any], positions: Dict[str, Dict]) -> str:
+    def generate_xml(self, data: Dict[str, Any], positions: Dict[str, Dict],
+                     compact: bool = False, compressed: bool = False) -> str:
         """전체 XML 생성"""
+        output = io.StringIO()
+        self.write_xml(data, positions, output, compact=compact, compressed=compressed)
+        return output.getvalue()
+
+    def write_xml(self, data: Dict[str, Any], positions: Dict[str, Dict],
+                  stream: TextIO, compact: bool = False, compressed: bool = False):
+        """
+        XML을 스트림에 바로 기록
+
+        Args:
+            data: parse_to_dict 결과
+            positions: 레이아웃 결과
+            stream: 텍스트 스트림 (파일, io.StringIO 등)
+            compact: True면 들여쓰기 없이 기록
+            compressed: True면 <diagram> 본문을 draw.io 압축 형식(deflate+base64)으로 기록
+        """
+        model = self.build_model(data, positions)
+        with self.profiler.span('generate.compress' if compressed else 'generate.close'):
+            model.write(stream, compact=compact, compressed=compressed)
+
+    def build_model(self, data: Dict[str, Any], positions: Dict[str, Dict]) -> DiagramModel:
+        """
+        레이아웃 결과로 다이어그램 모델 생성 (XML 직렬화 전 단계)
+
+        Returns:
+            DiagramModel (셀마다 kind / item_id 기록)
+        """
         self.positions = positions
         self.cell_id_counter = 2
         self.cell_map = {}
+        self._waypoints = {}
 
         self._calculate_children_count(data)
 
-        canvas_width = data.get('config', {}).get('캔버스너비', 1200)
-        canvas_height = data.get('config', {}).get('캔버스높이', 900)
-        diagram_name = data.get('config', {}).get('다이어그램명', 'System Architecture')
+        config = data.get('config', {})
+        self.model = DiagramModel(
+            name=config.get('다이어그램명', 'System Architecture'),
+            page_width=config.get('캔버스너비', 1200),
+            page_height=config.get('캔버스높이', 900),
+        )
 
-        root = self._create_root_structure(diagram_name, canvas_width, canvas_height)
-        graph_root = root.find('.//root')
+        with self.profiler.span('generate.layers'):
+            for layer in data.get('layers', []):
+                self._create_layer_with_header(layer)
 
-        for layer in data.get('layers', []):
-            self._create_layer_with_header(layer, graph_root)
+        with self.profiler.span('generate.boxes'):
+            for box in data.get('boxes', []):
+                self._create_box_with_header(box)
 
-        for box in data.get('boxes', []):
-            self._create_box_with_header(box, graph_root)
+        with self.profiler.span('generate.components'):
+            for comp in data.get('components', []):
+                self._create_component(comp)
 
-        for comp in data.get('components', []):
-            self._create_component(comp, graph_root)
+        vertex_count = self.cell_id_counter - 2
+        if data.get('connections') and self._routing_enabled(config):
+            with self.profiler.span('generate.routing'):
+                self._route_connections(data)
+            self.profiler.count('drawio.routed_edges', len(self._waypoints))
 
         if 'connections' in data:
-            self._create_connections(data['connections'], graph_root)
+            with self.profiler.span('generate.connections'):
+                self._create_connections(data['connections'])
 
-        xml_str = self._prettify_xml(root)
-        return xml_str
+        self.profiler.count('drawio.cells', self.cell_id_counter - 2)
+        self.profiler.count('drawio.edges', self.cell_id_counter - 2 - vertex_count)
+        return self.model
 
     def _calculate_children_count(self, data: Dict[str, Any]):
         self.box_children = {}
@@ -128,53 +188,38 @@ class DrawioGenerator:
     def _has_children(self, item_id: str) -> bool:
         return self.box_children.get(item_id, 0) > 0
 
-    def _create_root_structure(self, diagram_name: str, width: int, height: int) -> ET.Element:
-        mxfile = ET.Element('mxfile', {
-            'host': 'app.diagrams.net',
-            'modified': datetime.now().isoformat(),
-            'agent': 'AutoArchitect',
-            'version': '1.0',
-            'type': 'device'
-        })
-
-        diagram = ET.SubElement(mxfile, 'diagram', {
-            'name': diagram_name,
-            'id': str(uuid.uuid4())
-        })
-
-        graph_model = ET.SubElement(diagram, 'mxGraphModel', {
-            'dx': '1422',
-            'dy': '794',
-            'grid': '1',
-            'gridSize': '10',
-            'guides': '1',
-            'tooltips': '1',
-            'connect': '1',
-            'arrows': '1',
-            'fold': '1',
-            'page': '1',
-            'pageScale': '1',
-            'pageWidth': str(width),
-            'pageHeight': str(height),
-            'math': '0',
-            'shadow': '0'
-        })
-
-        root = ET.SubElement(graph_model, 'root')
-        ET.SubElement(root, 'mxCell', {'id': '0'})
-        ET.SubElement(root, 'mxCell', {'id': '1', 'parent': '0'})
-
-        return mxfile
-
-    def _create_layer_with_header(self, layer: Dict, parent: ET.Element):
-        cell_id = str(self._get_next_id())
-        self.cell_map[layer['id']] = cell_id
-
-        pos = self.positions.get(layer['id'], {})
-        x = pos.get('x', 0)
-        y = pos.get('y', 0)
-        width = pos.get('width', 1200)
-        height = pos.get('height', 200)
+    def _routing_enabled(self, config: Dict[str, Any]) -> bool:
+        return self.route_edges or is_truthy(config.get(EDGE_ROUTING_CONFIG_KEY))
+
+    def _route_connections(self, data: Dict[str, Any]):
+        """하위 항목이 없는 박스/컴포넌트를 장애물로 보고 모든 연결선 경로를 한 번에 계산"""
+        leaves = [
+            item['id'] for item in data.get('boxes', []) + data.get('components', [])
+            if not self._has_children(item['id'])
+        ]
+        router = OrthogonalRouter(self.positions, leaves)
+        self._waypoints = router.route_all(data['connections'])
+
+    def _add_vertex(self, value: str, style: str, x: float, y: float, width: float, height: float,
+                    kind: str, item_id: Any) -> Cell:
+        """정점 셀 추가 (좌표는 정수로 내림)"""
+        return self.model.add(Cell(
+            str(self._get_next_id()), value=value, style=style, parent='1', vertex=True,
+            x=int(x), y=int(y), width=int(width), height=int(height),
+            kind=kind, item_id=item_id,
+        ))
+
+    def _geometry(self, item_id: Any, width: float, height: float) -> Tuple[float, float, float, float]:
+        """항목 위치 (x, y, width, height) - 없는 값은 0 / 기본 크기"""
+        pos = self.positions.get(item_id)
+        if pos is None:
+            return 0, 0, width, height
+        if pos.__class__ is Rect:
+            return pos.x, pos.y, pos.width, pos.height
+        return pos.get('x', 0), pos.get('y', 0), pos.get('width', width), pos.get('height', height)
+
+    def _create_layer_with_header(self, layer: Dict):
+        x, y, width, height = self._geometry(layer['id'], 1200, 200)
 
         bg_color = self._get_color(layer.get('bg_color', '흰색'))
         layer_name = layer.get('name', '')
@@ -184,23 +229,8 @@ class DrawioGenerator:
             f"fillColor={bg_color};strokeColor=none;"
         )
 
-        cell = ET.SubElement(parent, 'mxCell', {
-            'id': cell_id,
-            'value': '',
-            'style': style,
-            'parent': '1',
-            'vertex': '1'
-        })
-
-        ET.SubElement(cell, 'mxGeometry', {
-            'x': str(int(x)),
-            'y': str(int(y)),
-            'width': str(int(width)),
-            'height': str(int(height)),
-            'as': 'geometry'
-        })
-
-        header_cell_id = str(self._get_next_id())
+        cell = self._add_vertex('', style, x, y, width, height, CELL_LAYER, layer['id'])
+        self.cell_map[layer['id']] = cell.id
 
         header_x = x + (width / 2) - 150
         header_y = y + self.HEADER_TOP_MARGIN
@@ -213,68 +243,34 @@ class DrawioGenerator:
             f"fontSize=12;fontStyle=1;"
         )
 
-        header_cell = ET.SubElement(parent, 'mxCell', {
-            'id': header_cell_id,
-            'value': str(layer_name),
-            'style': header_style,
-            'parent': '1',
-            'vertex': '1'
-        })
-
-        ET.SubElement(header_cell, 'mxGeometry', {
-            'x': str(int(header_x)),
-            'y': str(int(header_y)),
-            'width': str(int(header_width)),
-            'height': str(int(header_height)),
-            'as': 'geometry'
-        })
-
-    def _create_box_with_header(self, box: Dict, parent: ET.Element):
+        self._add_vertex(str(layer_name), header_style,
+                         header_x, header_y, header_width, header_height,
+                         CELL_HEADER, layer['id'])
+
+    def _create_box_with_header(self, box: Dict):
         box_id = box['id']
         has_children = self._has_children(box_id)
 
-        pos = self.positions.get(box_id, {})
-        box_x = pos.get('x', 0)
-        box_y = pos.get('y', 0)
-        box_width = pos.get('width', 200)
-        box_height = pos.get('height', 100)
+        box_x, box_y, box_width, box_height = self._geometry(box_id, 200, 100)
 
         bg_color = self._get_color(box.get('bg_color', '연회색'))
         border_color = self._get_border_color(box.get('border_color', '회색'))
         font_size = box.get('font_size', 11)
 
-        if pd.isna(font_size):
+        if is_missing(font_size):
             font_size = 11
 
         box_name = box.get('name', '')
-        if pd.isna(box_name):
+        if is_missing(box_name):
             box_name = ''
 
-        cell_id = str(self._get_next_id())
-        self.cell_map[box_id] = cell_id
-
         style = (
             f"rounded=0;whiteSpace=wrap;html=1;"
             f"fillColor={bg_color};strokeColor={border_color};"
         )
 
-        cell = ET.SubElement(parent, 'mxCell', {
-            'id': cell_id,
-            'value': '',
-            'style': style,
-            'parent': '1',
-            'vertex': '1'
-        })
-
-        ET.SubElement(cell, 'mxGeometry', {
-            'x': str(int(box_x)),
-            'y': str(int(box_y)),
-            'width': str(int(box_width)),
-            'height': str(int(box_height)),
-            'as': 'geometry'
-        })
-
-        header_cell_id = str(self._get_next_id())
+        cell = self._add_vertex('', style, box_x, box_y, box_width, box_height, CELL_BOX, box_id)
+        self.cell_map[box_id] = cell.id
 
         if has_children:
             header_x = box_x + self.HEADER_SIDE_MARGIN
@@ -297,34 +293,16 @@ class DrawioGenerator:
                 f"fontSize={int(font_size)};fontStyle=1;"
             )
 
-        header_cell = ET.SubElement(parent, 'mxCell', {
-            'id': header_cell_id,
-            'value': str(box_name),
-            'style': header_style,
-            'parent': '1',
-            'vertex': '1'
-        })
-
-        ET.SubElement(header_cell, 'mxGeometry', {
-            'x': str(int(header_x)),
-            'y': str(int(header_y)),
-            'width': str(int(header_width)),
-            'height': str(int(header_height)),
-            'as': 'geometry'
-        })
-
-    def _create_component(self, comp: Dict, parent: ET.Element):
-        cell_id = str(self._get_next_id())
-        self.cell_map[comp['id']] = cell_id
-
-        pos = self.positions.get(comp['id'], {})
-        x = pos.get('x', 0)
-        y = pos.get('y', 0)
-        width = pos.get('width', 100)
-        height = pos.get('height', 60)
+        self._add_vertex(str(box_name), header_style,
+                         header_x, header_y, header_width, header_height,
+                         CELL_HEADER, box_id)
+
+    def _create_component(self, comp: Dict):
+
+        x, y, width, height = self._geometry(comp['id'], 100, 60)
 
         font_size = comp.get('font_size', 10)
-        if pd.isna(font_size):
+        if is_missing(font_size):
             font_size = 10
 
         comp_type = comp.get('type', '단일박스')
@@ -349,35 +327,20 @@ class DrawioGenerator:
             )
 
         comp_name = comp.get('name', '')
-        if pd.isna(comp_name):
+        if is_missing(comp_name):
             comp_name = ''
 
-        cell = ET.SubElement(parent, 'mxCell', {
-            'id': cell_id,
-            'value': str(comp_name),
-            'style': style,
-            'parent': '1',
-            'vertex': '1'
-        })
-
-        ET.SubElement(cell, 'mxGeometry', {
-            'x': str(int(x)),
-            'y': str(int(y)),
-            'width': str(int(width)),
-            'height': str(int(height)),
-            'as': 'geometry'
-        })
-
-    def _create_connections(self, connections: List[Dict], parent: ET.Element):
-        for conn in connections:
+        cell = self._add_vertex(str(comp_name), style, x, y, width, height, CELL_COMPONENT, comp['id'])
+        self.cell_map[comp['id']] = cell.id
+
+    def _create_connections(self, connections: List[Dict]):
+        for index, conn in enumerate(connections):
             from_cell_id = self.cell_map.get(conn.get('from_id'))
             to_cell_id = self.cell_map.get(conn.get('to_id'))
 
             if not from_cell_id or not to_cell_id:
                 continue
 
-            cell_id = str(self._get_next_id())
-
             conn_type = conn.get('type', '데이터흐름')
             conn_style = CONNECTION_STYLES.get(conn_type, CONNECTION_STYLES['데이터흐름'])
             style = conn_style['style']
@@ -391,31 +354,25 @@ class DrawioGenerator:
                 style += f"startArrow={conn_style['start_arrow']};"
 
             label = conn.get('label', '')
-            if pd.isna(label):
+            if is_missing(label):
                 label = ''
 
-            cell = ET.SubElement(parent, 'mxCell', {
-                'id': cell_id,
-                'value': str(label),
-                'style': style,
-                'parent': '1',
-                'edge': '1',
-                'source': from_cell_id,
-                'target': to_cell_id
-            })
-
-            ET.SubElement(cell, 'mxGeometry', {
-                'relative': '1',
-                'as': 'geometry'
-            })
+            # 꺾는 점은 정수로 내려 기록
+            points = self._waypoints.get(index)
+            self.model.add(Cell(
+                str(self._get_next_id()), value=str(label), style=style, parent='1', edge=True,
+                source=from_cell_id, target=to_cell_id,
+                points=[(int(x), int(y)) for x, y in points] if points else None,
+                kind=CELL_EDGE, item_id=index,
+            ))
 
     def _get_color(self, color_name: str) -> str:
-        if pd.isna(color_name):
+        if is_missing(color_name):
             return '#FFFFFF'
         return COLOR_MAP.get(str(color_name), '#FFFFFF')
 
     def _get_border_color(self, color_name: str) -> str:
-        if pd.isna(color_name):
+        if is_missing(color_name):
             return '#999999'
         return BORDER_COLOR_MAP.get(str(color_name), '#999999')
 
@@ -423,16 +380,3 @@ class DrawioGenerator:
         current = self.cell_id_counter
         self.cell_id_counter += 1
         return current
-
-    def _prettify_xml(self, element: ET.Element) -> str:
-        from xml.dom import minidom
-        rough_string = ET.tostring(element, encoding='unicode')
-        reparsed = minidom.parseString(rough_string)
-        # Draw.io 호환 형식: UTF-8 인코딩 명시, 들여쓰기 제거
-        pretty = reparsed.toprettyxml(indent="  ", encoding=None)
-        # toprettyxml이 bytes를 반환하면 decode
-        if isinstance(pretty, bytes):
-            pretty = pretty.decode('utf-8')
-        # <?xml version="1.0" ?> 를 <?xml version="1.0" encoding="UTF-8"?>로 교체
-        pretty = pretty.replace('<?xml version="1.0" ?>', '<?xml version="1.0" encoding="UTF-8"?>')
-        return pretty
@@ -0,0 +1,37 @@
+"""
+AutoArchitect - draw.io 스타일 문자열 파서
+'key=value;key2=value2;' 형식을 한 번만 나눠 dict로 변환하고 스타일 문자열별로 캐시
+(생성된 다이어그램은 같은 스타일이 반복되므로 셀마다 다시 파싱하지 않음)
+"""
+
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
+
+# 캐시할 서로 다른 스타일 문자열 수
+STYLE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def parse_style(style: str) -> Mapping[str, str]:
+    """
+    스타일 문자열 → 읽기 전용 dict
+
+    - '='가 없는 토큰('text', 'ellipse' 등)은 값이 빈 문자열인 키
+    - 같은 키가 여러 번 나오면 draw.io처럼 마지막 값 사용
+    - 캐시된 결과를 공유하므로 수정할 수 없는 MappingProxyType으로 반환
+
+    Args:
+        style: mxCell의 style 속성
+
+    Returns:
+        키 → 값
+    """
+    entries = {}
+    for token in (style or '').split(';'):
+        token = token.strip()
+        if not token:
+            continue
+        key, _, value = token.partition('=')
+        entries[key.strip()] = value.strip()
+    return MappingProxyType(entries)
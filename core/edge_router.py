@@ -0,0 +1,176 @@
+"""
+AutoArchitect - 연결선 경로 계산
+배치된 항목을 장애물로 보고 직교 경로를 미리 계산해 꺾는 점(waypoint) 목록 생성
+
+- 장애물 좌표(여백 포함)의 x/y 경계선으로 만든 희소 격자 위에서 A* 탐색
+- 같은 장애물 색인으로 여러 연결선을 한 번에 계산 (route_all)
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+from core.spatial_index import SpatialIndex
+
+Point = Tuple[float, float]
+
+# 진행 방향 (dx, dy)
+_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+# A* 휴리스틱 가중치 (1보다 크면 최단 보장 대신 탐색량이 크게 줄어듦)
+HEURISTIC_WEIGHT = 2.0
+
+
+class OrthogonalRouter:
+    """
+    장애물을 피하는 직교 연결선 경로 계산
+
+    - 출발/도착 항목 중심을 잇고, 지나는 길이 + 꺾임 벌점이 작은 경로 선택
+    - 출발/도착 점을 포함한 장애물(자기 자신 등)은 통과 허용
+    - 탐색 범위는 두 점을 감싼 창(window)과 max_expansions로 제한하고, 실패하면 경로 없음(None)
+    """
+
+    def __init__(self, positions: Dict[Any, Dict[str, float]], obstacle_ids: Iterable[Any],
+                 margin: float = 10, bend_penalty: float = 20, max_expansions: int = 5000):
+        self.positions = positions
+        # 장애물은 margin만큼 넓혀 색인 (연결선이 항목에 붙지 않도록)
+        self.index = SpatialIndex(
+            {item_id: positions[item_id] for item_id in obstacle_ids if item_id in positions},
+            margin=margin,
+        )
+        # 격자선 후보: 넓힌 장애물의 경계 좌표
+        rects = self.index.rects.values()
+        self.xs = sorted({value for x1, _, x2, _ in rects for value in (x1, x2)})
+        self.ys = sorted({value for _, y1, _, y2 in rects for value in (y1, y2)})
+        self.bend_penalty = bend_penalty
+        self.max_expansions = max_expansions
+        self.padding = 4 * margin
+        self._hits: Dict[Point, Tuple[Any, ...]] = {}
+
+    @staticmethod
+    def _center(pos: Dict[str, float]) -> Point:
+        return pos['x'] + pos['width'] / 2, pos['y'] + pos['height'] / 2
+
+    def _window(self, values: List[float], low: float, high: float, extra: Tuple[float, float]) -> List[float]:
+        """low~high 범위의 격자선 + 출발/도착 좌표"""
+        window = values[bisect_left(values, low):bisect_right(values, high)]
+        return sorted(set(window).union(extra))
+
+    def route(self, from_id: Any, to_id: Any) -> Optional[List[Point]]:
+        """
+        두 항목 사이 꺾는 점 목록
+
+        Returns:
+            출발/도착 점을 뺀 꺾는 점 목록 (직선이면 빈 목록, 경로가 없으면 None)
+        """
+        source = self.positions.get(from_id)
+        target = self.positions.get(to_id)
+        if source is None or target is None:
+            return None
+
+        start, goal = self._center(source), self._center(target)
+        exempt = set(self.index.at_point(*start)) | set(self.index.at_point(*goal))
+
+        pad = self.padding + max(abs(goal[0] - start[0]), abs(goal[1] - start[1])) / 2
+        xs = self._window(self.xs, min(start[0], goal[0]) - pad, max(start[0], goal[0]) + pad,
+                          (start[0], goal[0]))
+        ys = self._window(self.ys, min(start[1], goal[1]) - pad, max(start[1], goal[1]) + pad,
+                          (start[1], goal[1]))
+
+        path = self._search(xs, ys, (xs.index(start[0]), ys.index(start[1])),
+                            (xs.index(goal[0]), ys.index(goal[1])), exempt)
+        if path is None:
+            return None
+        return self._bends([(xs[i], ys[j]) for i, j in path])
+
+    def route_all(self, connections: List[Dict]) -> Dict[int, List[Point]]:
+        """
+        연결선 일괄 계산 (같은 장애물 색인 재사용)
+
+        Returns:
+            연결 번호 → 꺾는 점 목록 (경로를 찾은 연결만)
+        """
+        routes = {}
+        for index, conn in enumerate(connections):
+            points = self.route(conn.get('from_id'), conn.get('to_id'))
+            if points is not None:
+                routes[index] = points
+        return routes
+
+    def _obstacles_at(self, x: float, y: float) -> Tuple[Any, ...]:
+        """점을 포함한 장애물 (일괄 계산 중 재사용)"""
+        key = (x, y)
+        found = self._hits.get(key)
+        if found is None:
+            found = self._hits[key] = tuple(self.index.at_point(x, y))
+        return found
+
+    def _search(self, xs: List[float], ys: List[float], start: Tuple[int, int], goal: Tuple[int, int],
+                exempt: set) -> Optional[List[Tuple[int, int]]]:
+        """
+        격자 인덱스 위 A*
+
+        - 꺾임 벌점은 각 점에 도착한 방향 기준으로 계산 (상태 수를 격자 점 수로 유지)
+        - 휴리스틱에 HEURISTIC_WEIGHT를 곱한 가중 A* (촘촘한 배치에서도 탐색량 제한)
+        """
+        gx, gy = xs[goal[0]], ys[goal[1]]
+        weight = HEURISTIC_WEIGHT
+        obstacles_at = self._obstacles_at
+        bend_penalty = self.bend_penalty
+        width, height = len(xs), len(ys)
+
+        best = {start: 0.0}
+        arrival = {start: -1}
+        came_from = {}
+        heap = [(abs(xs[start[0]] - gx) + abs(ys[start[1]] - gy), 0.0, start)]
+        expansions = 0
+
+        while heap:
+            _, cost, node = heapq.heappop(heap)
+            if node == goal:
+                path = [node]
+                while node in came_from:
+                    node = came_from[node]
+                    path.append(node)
+                return path[::-1]
+            if cost > best[node]:
+                continue
+
+            expansions += 1
+            if expansions > self.max_expansions:
+                return None
+
+            i, j = node
+            direction = arrival[node]
+            for new_direction, (dx, dy) in enumerate(_DIRECTIONS):
+                ni, nj = i + dx, j + dy
+                if not (0 <= ni < width and 0 <= nj < height):
+                    continue
+                # 이웃 격자선 사이에는 장애물 경계가 없으므로 중점만 검사하면 충분
+                hits = obstacles_at((xs[i] + xs[ni]) / 2, (ys[j] + ys[nj]) / 2)
+                if hits and any(item_id not in exempt for item_id in hits):
+                    continue
+
+                new_cost = cost + abs(xs[ni] - xs[i]) + abs(ys[nj] - ys[j])
+                if direction not in (-1, new_direction):
+                    new_cost += bend_penalty
+
+                neighbour = (ni, nj)
+                if new_cost < best.get(neighbour, float('inf')):
+                    best[neighbour] = new_cost
+                    arrival[neighbour] = new_direction
+                    came_from[neighbour] = node
+                    estimate = new_cost + weight * (abs(xs[ni] - gx) + abs(ys[nj] - gy))
+                    heapq.heappush(heap, (estimate, new_cost, neighbour))
+        return None
+
+    @staticmethod
+    def _bends(points: List[Point]) -> List[Point]:
+        """격자 경로에서 방향이 바뀌는 점만 남김 (양 끝 제외)"""
+        bends = []
+        for previous, current, following in zip(points, points[1:], points[2:]):
+            same_x = previous[0] == current[0] == following[0]
+            same_y = previous[1] == current[1] == following[1]
+            if not (same_x or same_y):
+                bends.append(current)
+        return bends
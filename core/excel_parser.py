@@ -3,50 +3,125 @@ AutoArchitect - Excel Parser
 행번호 기반 엑셀 파싱
 """
 
-import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterable, Optional
 import io
 
+from utils.values import is_missing
+from core.records import BoxRecord, ComponentRecord, ConnectionRecord, LayerRecord
+
+
+# 지원하는 읽기 백엔드
+# - pandas: 시트를 DataFrame으로 읽음 (기존 방식)
+# - openpyxl: read-only 모드로 행을 스트리밍하여 레코드 리스트로 읽음 (pandas 불필요)
+PARSER_BACKENDS = ('pandas', 'openpyxl')
+
 
 class ExcelParser:
     """행번호 기반 엑셀 파서"""
 
-    def __init__(self):
+    def __init__(self, backend: str = 'pandas'):
         self.errors = []
         self.warnings = []
         self.infos = []
+        self.backend = backend
 
-    def read_excel(self, file) -> Dict[str, pd.DataFrame]:
-        """엑셀 파일 읽기"""
-        sheets = {}
+    def read_excel(self, file, backend: Optional[str] = None) -> Dict[str, Any]:
+        """
+        엑셀 파일 읽기
+
+        Args:
+            file: 파일 경로 또는 file-like 객체
+            backend: 'pandas' 또는 'openpyxl' (None이면 생성 시 지정한 백엔드)
+
+        Returns:
+            시트명 → DataFrame (pandas) 또는 행 딕셔너리 리스트 (openpyxl)
+        """
+        backend = backend or self.backend
 
         self.errors = []
         self.warnings = []
         self.infos = []
 
+        if backend not in PARSER_BACKENDS:
+            self.errors.append(f"지원하지 않는 파서 백엔드: {backend}")
+            return {}
+
         try:
             if hasattr(file, 'read'):
                 file_content = io.BytesIO(file.read())
                 file.seek(0)
-                excel_file = pd.ExcelFile(file_content)
             else:
-                excel_file = pd.ExcelFile(file)
+                file_content = file
 
-            for sheet_name in excel_file.sheet_names:
-                if sheet_name == 'GUIDE':
-                    continue
-
-                df = pd.read_excel(excel_file, sheet_name=sheet_name)
-                df = df.dropna(how='all')
-                sheets[sheet_name] = df
-
-            return sheets
+            if backend == 'openpyxl':
+                return self._read_openpyxl(file_content)
+            return self._read_pandas(file_content)
 
         except Exception as e:
             self.errors.append(f"엑셀 파일 읽기 실패: {str(e)}")
             return {}
 
-    def validate_data(self, sheets: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
+    def _read_pandas(self, file) -> Dict[str, Any]:
+        """pandas로 시트별 DataFrame 읽기"""
+        import pandas as pd
+
+        sheets = {}
+        excel_file = pd.ExcelFile(file)
+
+        for sheet_name in excel_file.sheet_names:
+            if sheet_name == 'GUIDE':
+                continue
+
+            df = pd.read_excel(excel_file, sheet_name=sheet_name)
+            df = df.dropna(how='all')
+            sheets[sheet_name] = df
+
+        return sheets
+
+    def _read_openpyxl(self, file) -> Dict[str, List[Dict]]:
+        """openpyxl read-only 모드로 시트별 행 레코드 읽기"""
+        from openpyxl import load_workbook
+
+        sheets = {}
+        workbook = load_workbook(file, read_only=True, data_only=True)
+
+        try:
+            for worksheet in workbook.worksheets:
+                if worksheet.title == 'GUIDE':
+                    continue
+
+                rows = worksheet.iter_rows(values_only=True)
+                header = next(rows, None)
+                if header is None:
+                    sheets[worksheet.title] = []
+                    continue
+
+                # 헤더가 비어있는 열은 건너뜀
+                columns = [
+                    (idx, name) for idx, name in enumerate(header)
+                    if name is not None
+                ]
+
+                records = []
+                for row in rows:
+                    record = {}
+                    has_value = False
+                    for idx, name in columns:
+                        value = row[idx] if idx < len(row) else None
+                        if value is not None:
+                            has_value = True
+                        record[name] = value
+                    # 모든 값이 빈 행은 제외 (pandas dropna(how='all')와 동일)
+                    if has_value:
+                        records.append(record)
+
+                sheets[worksheet.title] = records
+        finally:
+            workbook.close()
+
+        return sheets
+
+    def validate_data(self, sheets: Dict[str, Any]) -> Dict[str, Any]:
         """데이터 검증"""
         if self.errors:
             return {
@@ -101,8 +176,12 @@ class ExcelParser:
             'infos': self.infos
         }
 
-    def parse_to_dict(self, sheets: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
-        """엑셀을 딕셔너리로 변환"""
+    def parse_to_dict(self, sheets: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        엑셀을 딕셔너리로 변환
+
+        레이어/박스/컴포넌트/연결 행은 dict처럼 쓸 수 있는 __slots__ 레코드(core.records)로 만듦
+        """
         result = {
             'config': {},
             'layers': [],
@@ -134,82 +213,88 @@ class ExcelParser:
 
         return result
 
-    def _parse_config(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _iter_rows(self, sheet) -> Iterable[Dict]:
+        """시트 행을 딕셔너리로 순회 (DataFrame/레코드 리스트 모두 지원)"""
+        if isinstance(sheet, list):
+            return sheet
+        return sheet.to_dict('records')
+
+    def _parse_config(self, sheet) -> Dict[str, Any]:
         config = {}
-        for _, row in df.iterrows():
+        for row in self._iter_rows(sheet):
             key = row.get('항목')
             value = row.get('값')
-            if pd.notna(key):
+            if not is_missing(key):
                 config[key] = value
         return config
 
-    def _parse_layers(self, df: pd.DataFrame) -> List[Dict]:
+    def _parse_layers(self, sheet) -> List[LayerRecord]:
         layers = []
-        for _, row in df.iterrows():
-            if pd.isna(row.get('레이어ID')):
+        for row in self._iter_rows(sheet):
+            if is_missing(row.get('레이어ID')):
                 continue
 
-            layer = {
-                'id': row['레이어ID'],
-                'name': row.get('레이어명', ''),
-                'order': row.get('순서', 1),
-                'bg_color': row.get('배경색', '흰색'),
-                'height_percent': row.get('높이%', 50)
-            }
+            layer = LayerRecord(
+                row['레이어ID'],
+                row.get('레이어명', ''),
+                row.get('순서', 1),
+                row.get('배경색', '흰색'),
+                row.get('높이%', 50),
+            )
             layers.append(layer)
         return layers
 
-    def _parse_boxes(self, df: pd.DataFrame) -> List[Dict]:
+    def _parse_boxes(self, sheet) -> List[BoxRecord]:
         boxes = []
-        for _, row in df.iterrows():
-            if pd.isna(row.get('박스ID')):
+        for row in self._iter_rows(sheet):
+            if is_missing(row.get('박스ID')):
                 continue
 
-            box = {
-                'id': row['박스ID'],
-                'name': row.get('박스명', ''),
-                'parent_id': row.get('부모ID'),
-                'row_number': row.get('행번호', 1),
-                'y_percent': row.get('Y%', 0),
-                'height_percent': row.get('높이%', 100),
-                'bg_color': row.get('배경색', '흰색'),
-                'border_color': row.get('테두리색', '회색'),
-                'font_size': row.get('폰트크기', 11)
-            }
+            box = BoxRecord(
+                row['박스ID'],
+                row.get('박스명', ''),
+                row.get('부모ID'),
+                row.get('행번호', 1),
+                row.get('Y%', 0),
+                row.get('높이%', 100),
+                row.get('배경색', '흰색'),
+                row.get('테두리색', '회색'),
+                row.get('폰트크기', 11),
+            )
             boxes.append(box)
         return boxes
 
-    def _parse_components(self, df: pd.DataFrame) -> List[Dict]:
+    def _parse_components(self, sheet) -> List[ComponentRecord]:
         components = []
-        for _, row in df.iterrows():
-            if pd.isna(row.get('ID')):
+        for row in self._iter_rows(sheet):
+            if is_missing(row.get('ID')):
                 continue
 
-            comp = {
-                'id': row['ID'],
-                'name': row.get('컴포넌트명', ''),
-                'parent_id': row.get('부모ID'),
-                'row_number': row.get('행번호', 1),
-                'y_percent': row.get('Y%', 0),
-                'height_percent': row.get('높이%', 100),
-                'font_size': row.get('폰트크기', 10),
-                'type': row.get('타입', '단일박스')
-            }
+            comp = ComponentRecord(
+                row['ID'],
+                row.get('컴포넌트명', ''),
+                row.get('부모ID'),
+                row.get('행번호', 1),
+                row.get('Y%', 0),
+                row.get('높이%', 100),
+                row.get('폰트크기', 10),
+                row.get('타입', '단일박스'),
+            )
             components.append(comp)
         return components
 
-    def _parse_connections(self, df: pd.DataFrame) -> List[Dict]:
+    def _parse_connections(self, sheet) -> List[ConnectionRecord]:
         connections = []
-        for _, row in df.iterrows():
-            if pd.isna(row.get('출발ID')) or pd.isna(row.get('도착ID')):
+        for row in self._iter_rows(sheet):
+            if is_missing(row.get('출발ID')) or is_missing(row.get('도착ID')):
                 continue
 
-            conn = {
-                'from_id': row['출발ID'],
-                'to_id': row['도착ID'],
-                'type': row.get('연결타입', '데이터흐름'),
-                'label': row.get('라벨', ''),
-                'style': row.get('선스타일', '실선')
-            }
+            conn = ConnectionRecord(
+                row['출발ID'],
+                row['도착ID'],
+                row.get('연결타입', '데이터흐름'),
+                row.get('라벨', ''),
+                row.get('선스타일', '실선'),
+            )
             connections.append(conn)
         return connections
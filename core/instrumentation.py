@@ -0,0 +1,122 @@
+"""
+AutoArchitect - 단계별 계측
+파이프라인 단계의 시간/메모리 최고치/카운터 기록 (선택 사용)
+
+사용 예:
+    profiler = Profiler(trace_memory=True)
+    with profiler.span('parse'):
+        ...
+    profiler.count('drawio.cells', 120)
+    print(profiler.to_json())
+"""
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Any, List, Optional
+
+
+class Profiler:
+    """
+    단계 구간(span)과 카운터 기록
+
+    - span: 중첩 가능한 시간 구간 (trace_memory=True면 구간별 메모리 최고치 포함)
+    - count: 이름별 누적 카운터
+    """
+
+    enabled = True
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.spans: List[Dict[str, Any]] = []
+        self.counters: Dict[str, int] = {}
+        self._stack: List[Dict[str, Any]] = []
+        self._owns_tracing = False
+
+    @contextmanager
+    def span(self, name: str):
+        """구간 측정 (with 문)"""
+        record = {'name': name, 'depth': len(self._stack), 'ms': 0.0}
+        self.spans.append(record)
+
+        if self.trace_memory:
+            self._enter_memory(record)
+
+        self._stack.append(record)
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['ms'] = round((time.perf_counter() - started) * 1000, 3)
+            self._stack.pop()
+            if self.trace_memory:
+                self._exit_memory(record)
+
+    def count(self, name: str, value: int = 1):
+        """카운터 증가"""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def _enter_memory(self, record: Dict[str, Any]):
+        if not self._stack and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+
+        current, peak = tracemalloc.get_traced_memory()
+        # 부모 구간의 최고치를 넘겨받은 뒤 이 구간 기준으로 초기화
+        if self._stack:
+            parent = self._stack[-1]
+            parent['_peak'] = max(parent['_peak'], peak)
+        tracemalloc.reset_peak()
+
+        record['_start'] = current
+        record['_peak'] = current
+
+    def _exit_memory(self, record: Dict[str, Any]):
+        _, peak = tracemalloc.get_traced_memory()
+        peak = max(peak, record.pop('_peak'))
+        record['peak_kib'] = round((peak - record.pop('_start')) / 1024, 1)
+
+        if self._stack:
+            parent = self._stack[-1]
+            parent['_peak'] = max(parent['_peak'], peak)
+        elif self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    @property
+    def total_ms(self) -> float:
+        """최상위 구간 시간 합계"""
+        return round(sum(span['ms'] for span in self.spans if span['depth'] == 0), 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON으로 저장 가능한 결과"""
+        return {
+            'total_ms': self.total_ms,
+            'spans': [dict(span) for span in self.spans],
+            'counters': dict(self.counters),
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+
+class _NullProfiler:
+    """계측을 끈 상태 (기본값) - 아무것도 기록하지 않음"""
+
+    enabled = False
+    _context = nullcontext()
+
+    def span(self, name: str):
+        return self._context
+
+    def count(self, name: str, value: int = 1):
+        pass
+
+
+NULL_PROFILER = _NullProfiler()
+
+
+def get_profiler(profiler: Optional[Profiler]):
+    """None이면 아무것도 기록하지 않는 프로파일러 반환"""
+    return profiler if profiler is not None else NULL_PROFILER
@@ -3,26 +3,197 @@ AutoArchitect - Layout Engine
 행번호 기반 레이아웃 계산
 """
 
-from typing import Dict, List, Any
-import pandas as pd
+import heapq
+import time
+from bisect import bisect_left
+from typing import Dict, List, Any, Iterable, Optional, Set
+from utils.constants import WARNING_MESSAGES
+from utils.values import is_missing, is_truthy
+from core import layout_kernel
+from core.crossings import detect_crossings
+from core.instrumentation import get_profiler
+from core.records import Rect, field_values
+from core.row_ordering import RowOrderOptimizer
+from core.spatial_index import SpatialIndex, to_rect
+
+
+BOX, COMPONENT = 0, 1
+
+# 겹침/벗어남 경고에 나열할 최대 예시 수
+MAX_GEOMETRY_EXAMPLES = 5
+
+# CONFIG 시트에서 행 순서 최적화를 켜는 항목
+ROW_ORDER_CONFIG_KEY = '행순서최적화'
+
+# 박스/컴포넌트가 이 개수 이상이면 행 배치를 NumPy 커널로 계산 (vectorized=None일 때)
+VECTOR_LAYOUT_THRESHOLD = 2000
+
+# 커널로 한 번에 보낼 최소 항목 수 (작은 묶음은 배열 준비 비용 때문에 파이썬 경로가 빠름)
+VECTOR_BATCH_MIN_ITEMS = 32
+
+
+def _normalize_parent(parent_id: Any) -> Optional[Any]:
+    """부모ID 값 정규화 - 빈 셀과 빈 문자열은 None (캔버스 기준 배치)"""
+    if parent_id.__class__ is str:
+        return parent_id or None
+    return None if is_missing(parent_id) else parent_id
+
+
+def _parent_key(item: Dict) -> Optional[Any]:
+    """부모ID (빈 값은 None)"""
+    return _normalize_parent(item.get('parent_id'))
+
+
+class _TreeIndex:
+    """
+    증분 배치용 부모-자식 색인
+
+    - children_of: 부모ID → (자식 박스 목록, 자식 컴포넌트 목록), 시트 순서 유지
+    - order: 항목ID → 시트 순서 (추가된 항목은 맨 뒤)
+    """
+
+    def __init__(self, boxes: List[Dict], components: List[Dict], children_of: Dict[Any, tuple]):
+        self.items = {}
+        self.kind = {}
+        self.order = {}
+        self.children_of = children_of
+        self.parent_of = {
+            child['id']: parent_id
+            for parent_id, groups in children_of.items() for group in groups for child in group
+        }
+        self.duplicates = set()
+        self._next_order = 0
+
+        for kind, items in ((BOX, boxes), (COMPONENT, components)):
+            for item in items:
+                item_id = item['id']
+                if item_id in self.items:
+                    self.duplicates.add(item_id)
+                self.items[item_id] = item
+                self.kind[item_id] = kind
+                self.order[item_id] = self._next_order
+                self._next_order += 1
+
+        # 순환을 끊으면서 부모 목록에서 뺀 항목은 원래 부모에 다시 연결
+        for item_id, item in self.items.items():
+            if item_id not in self.parent_of:
+                self._attach(item, self.kind[item_id])
+
+    def add(self, item: Dict, kind: int):
+        item_id = item['id']
+        self.items[item_id] = item
+        self.kind[item_id] = kind
+        if item_id not in self.order:
+            self.order[item_id] = self._next_order
+            self._next_order += 1
+        self._attach(item, kind)
+
+    def remove(self, item_id: Any) -> Dict:
+        item = self.items.pop(item_id)
+        self._detach(item, self.kind.pop(item_id))
+        del self.parent_of[item_id]
+        del self.order[item_id]
+        return item
+
+    def replace(self, item: Dict):
+        item_id = item['id']
+        kind = self.kind[item_id]
+        self._detach(self.items[item_id], kind)
+        self.items[item_id] = item
+        self._attach(item, kind)
+
+    def group(self, parent_id: Any, kind: int) -> List[Dict]:
+        groups = self.children_of.get(parent_id)
+        return groups[kind] if groups else []
+
+    def lists(self):
+        """시트 순서의 (박스 목록, 컴포넌트 목록)"""
+        ordered = sorted(self.items, key=self.order.__getitem__)
+        return ([self.items[i] for i in ordered if self.kind[i] == BOX],
+                [self.items[i] for i in ordered if self.kind[i] == COMPONENT])
+
+    def depth(self, item_id: Any) -> int:
+        """루트(레이어/캔버스)까지의 단계 수 (None은 -1)"""
+        if item_id is None:
+            return -1
+        depth = 0
+        while item_id in self.parent_of:
+            item_id = self.parent_of[item_id]
+            depth += 1
+        return depth
+
+    def is_ancestor(self, ancestor_id: Any, item_id: Any) -> bool:
+        """ancestor_id가 item_id 자신이거나 조상인지 (순환 검사)"""
+        seen = set()
+        while item_id is not None and item_id not in seen:
+            if item_id == ancestor_id:
+                return True
+            seen.add(item_id)
+            item_id = self.parent_of.get(item_id)
+        return False
+
+    def _attach(self, item: Dict, kind: int):
+        parent_id = _parent_key(item)
+        self.parent_of[item['id']] = parent_id
+        groups = self.children_of.get(parent_id)
+        if groups is None:
+            groups = self.children_of[parent_id] = ([], [])
+
+        group = groups[kind]
+        keys = [self.order[child['id']] for child in group]
+        group.insert(bisect_left(keys, self.order[item['id']]), item)
+
+    def _detach(self, item: Dict, kind: int):
+        parent_id = self.parent_of[item['id']]
+        groups = self.children_of[parent_id]
+        groups[kind].remove(item)
+        if not groups[BOX] and not groups[COMPONENT]:
+            del self.children_of[parent_id]
 
 
 class LayoutEngine:
     """행번호 기반 레이아웃 엔진"""
 
-    def __init__(self):
+    # 배치 규칙이 바뀌면 올림 (파이프라인 캐시 무효화)
+    VERSION = '2'
+
+    def __init__(self, profiler=None, optimize_rows: bool = False, row_order_budget_ms: float = 50,
+                 vectorized: Optional[bool] = None):
+        """
+        Args:
+            profiler: 단계별 시간을 기록할 Profiler
+            optimize_rows: True면 연결선 교차가 줄도록 같은 행의 형제 순서를 바꿈
+                (CONFIG 시트의 '행순서최적화' 값으로도 켤 수 있음)
+            row_order_budget_ms: 행 순서 최적화에 쓸 최대 시간
+            vectorized: 행 배치를 NumPy 커널로 계산할지 여부
+                (None이면 항목이 VECTOR_LAYOUT_THRESHOLD개 이상일 때 자동, NumPy가 없으면 항상 파이썬 경로)
+        """
+        self.profiler = get_profiler(profiler)
+        self.optimize_rows = optimize_rows
+        self.row_order_budget_ms = row_order_budget_ms
+        self.vectorized = vectorized
         self.canvas_width = 1400
         self.canvas_height = 900
         self.positions = {}
+        self.warnings = []
+        self._source = None
+        self._snapshot = None
+        self._index = None
+        self._rows_reordered = False
 
         # 레이아웃 설정
         self.LEFT_MARGIN = 5
         self.RIGHT_MARGIN = 5
         self.GAP = 2
 
-    def calculate_positions(self, data: Dict[str, Any], pattern: str = None) -> Dict[str, Dict]:
-        """모든 요소의 위치 계산"""
+    def calculate_positions(self, data: Dict[str, Any], pattern: str = None) -> Dict[str, Rect]:
+        """모든 요소의 위치 계산 (항목ID → Rect, dict처럼 읽을 수 있음)"""
         self.positions = {}
+        self.warnings = []
+        self._source = data
+        self._snapshot = None
+        self._index = None
+        self._rows_reordered = False
 
         # 캔버스 크기
         if 'config' in data:
@@ -30,81 +201,367 @@ class LayoutEngine:
             self.canvas_height = data['config'].get('캔버스높이', self.canvas_height)
 
         # 1. 레이어 위치 계산
-        self._calculate_layer_positions(data.get('layers', []))
+        with self.profiler.span('layout.layers'):
+            self._calculate_layer_positions(data.get('layers', []))
 
-        # 2. 박스 위치 계산
-        self._calculate_box_positions(data.get('boxes', []))
+        # 2. 박스/컴포넌트 위치 계산 (부모 → 자식 순서로 한 번에)
+        with self.profiler.span('layout.tree'):
+            self._calculate_nested_positions(data.get('boxes', []), data.get('components', []))
 
-        # 3. 컴포넌트 위치 계산
-        self._calculate_component_positions(data.get('components', []))
+        # 3. 연결선 교차가 줄도록 행 안 순서 조정 (선택)
+        if data.get('connections') and self._row_ordering_enabled(data.get('config', {})):
+            with self.profiler.span('layout.row_order'):
+                self._optimize_row_order(data)
 
+        self.profiler.count('layout.items', len(self.positions))
         return self.positions
 
+    def update_positions(self, added_boxes: Iterable[Dict] = (), added_components: Iterable[Dict] = (),
+                         changed: Iterable[Dict] = (), removed: Iterable[Any] = ()) -> Set[Any]:
+        """
+        직전 calculate_positions 결과에 변경분만 반영
+
+        변경된 항목의 형제 그룹만 다시 배치하고, 위치가 바뀐 항목의 하위 트리만 따라 내려감.
+        하위 항목이 있는 항목 삭제, 없는 부모/순환이 생기는 변경은 전체 재계산.
+        레이어나 캔버스 크기가 바뀌면 calculate_positions를 다시 호출해야 함.
+
+        Args:
+            added_boxes: 추가된 박스 (시트 맨 뒤에 추가된 것으로 처리)
+            added_components: 추가된 컴포넌트
+            changed: 내용이 바뀐 박스/컴포넌트 (같은 ID의 새 항목)
+            removed: 삭제된 박스/컴포넌트 ID
+
+        Returns:
+            추가/변경/삭제되었거나 위치가 바뀐 항목 ID
+
+        Raises:
+            ValueError: calculate_positions 전에 호출했거나, 없는 ID를 변경/삭제하거나, ID가 중복될 때
+        """
+        if self._source is None:
+            raise ValueError("calculate_positions를 먼저 호출해야 합니다.")
+
+        with self.profiler.span('layout.update'):
+            index = self._index
+            if index is None:
+                index = self._index = _TreeIndex(*self._snapshot)
+
+            removed, changed = list(removed), list(changed)
+            added = [(BOX, item) for item in added_boxes] + [(COMPONENT, item) for item in added_components]
+            self._check_diff(index, added, changed, removed)
+
+            touched = set()
+            dirty = set()
+            # 행 순서 최적화 결과는 전체 배치에 따라 달라지므로 다시 계산
+            rebuild = bool(self.warnings) or self._rows_reordered
+
+            for item_id in removed:
+                if item_id in index.children_of:
+                    rebuild = True
+                dirty.add((index.parent_of[item_id], index.kind[item_id]))
+                index.remove(item_id)
+                self.positions.pop(item_id, None)
+                touched.add(item_id)
+
+            for kind, item in added:
+                item_id = item['id']
+                # 없는 부모로 가리키던 항목들의 부모가 생기면 배치 기준이 바뀜
+                if item_id in index.children_of:
+                    rebuild = True
+                index.add(item, kind)
+                dirty.add((index.parent_of[item_id], kind))
+                touched.add(item_id)
+
+            for item in changed:
+                item_id = item['id']
+                kind = index.kind[item_id]
+                dirty.add((index.parent_of[item_id], kind))
+                parent_id = _parent_key(item)
+                if parent_id != index.parent_of[item_id] and index.is_ancestor(item_id, parent_id):
+                    rebuild = True
+                index.replace(item)
+                dirty.add((parent_id, kind))
+                touched.add(item_id)
+
+            # 없는 부모를 가리키게 되면 경고가 필요하므로 전체 재계산
+            for parent_id, _ in dirty:
+                if parent_id is not None and parent_id not in index.items and parent_id not in self.positions:
+                    rebuild = True
+
+            if rebuild:
+                return touched | self._rebuild(index)
+
+            touched |= self._relayout_groups(index, dirty)
+
+        return touched
+
+    def _check_diff(self, index: _TreeIndex, added: List[tuple], changed: List[Dict], removed: List[Any]):
+        """변경분 검증 (색인을 바꾸기 전에 실패하도록)"""
+        if index.duplicates:
+            raise ValueError(f"ID가 중복되어 증분 배치를 할 수 없습니다: {sorted(map(str, index.duplicates))}")
+
+        existing = set(index.items)
+        for item_id in removed:
+            if item_id not in existing:
+                raise ValueError(f"없는 항목은 삭제할 수 없습니다: {item_id}")
+            existing.discard(item_id)
+
+        for item in changed:
+            if item['id'] not in existing:
+                raise ValueError(f"없는 항목은 변경할 수 없습니다: {item['id']}")
+
+        for _, item in added:
+            item_id = item['id']
+            if item_id in existing or (item_id in self.positions and item_id not in index.items):
+                raise ValueError(f"이미 있는 ID입니다: {item_id}")
+            existing.add(item_id)
+
+    def _relayout_groups(self, index: _TreeIndex, dirty: Set[tuple]) -> Set[Any]:
+        """형제 그룹을 얕은 것부터 다시 배치하고 위치가 바뀐 항목의 하위 그룹으로 전파"""
+        moved = set()
+        done = set()
+        # (깊이, 순번, (부모ID, 종류)) - 부모가 먼저 확정되도록 얕은 그룹부터
+        heap = [(index.depth(key[0]), seq, key) for seq, key in enumerate(dirty)]
+        heapq.heapify(heap)
+        seq = len(heap)
+
+        while heap:
+            depth, _, key = heapq.heappop(heap)
+            if key in done:
+                continue
+            done.add(key)
+
+            parent_id, kind = key
+            group = index.group(parent_id, kind)
+            previous = [self.positions.get(item['id']) for item in group]
+            self._layout_items_by_row(group, parent_id)
+
+            for item, before in zip(group, previous):
+                item_id = item['id']
+                if self.positions[item_id] != before:
+                    moved.add(item_id)
+                    if item_id in index.children_of:
+                        for child_key in ((item_id, BOX), (item_id, COMPONENT)):
+                            heapq.heappush(heap, (depth + 1, seq, child_key))
+                            seq += 1
+        return moved
+
+    def _rebuild(self, index: _TreeIndex) -> Set[Any]:
+        """전체 재계산 후 위치가 바뀐 ID"""
+        previous = self.positions
+        boxes, components = index.lists()
+        data = dict(self._source, boxes=boxes, components=components)
+        current = self.calculate_positions(data)
+        return {item_id for item_id in previous.keys() | current.keys()
+                if previous.get(item_id) != current.get(item_id)}
+
+    def _row_ordering_enabled(self, config: Dict[str, Any]) -> bool:
+        if self.optimize_rows:
+            return True
+        return is_truthy(config.get(ROW_ORDER_CONFIG_KEY))
+
+    def _optimize_row_order(self, data: Dict[str, Any]):
+        """같은 행 형제 순서를 교차가 줄도록 바꾼 뒤 다시 배치"""
+        started = time.perf_counter()
+        boxes, components, children_of = self._snapshot
+        parent_of = {}
+        row_groups = []
+        for parent_id, groups in children_of.items():
+            for group in groups:
+                rows = {}
+                for item in group:
+                    parent_of[item['id']] = parent_id
+                    rows.setdefault(self._row_number(item), []).append(item['id'])
+                row_groups += [ids for ids in rows.values() if len(ids) > 1]
+
+        optimizer = RowOrderOptimizer(self.positions, parent_of, row_groups, data['connections'])
+        # 준비 시간도 예산에 포함
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        rank = optimizer.optimize(self.row_order_budget_ms - elapsed_ms)
+        if rank is None:
+            return
+
+        def reorder(items):
+            # 같은 (부모, 행) 항목이 차지하던 시트 위치에 새 순서대로 채움
+            result = list(items)
+            slots = {}
+            for index, item in enumerate(items):
+                if item['id'] in rank:
+                    slots.setdefault((parent_of.get(item['id']), self._row_number(item)), []).append(index)
+            for indices in slots.values():
+                members = sorted((items[i] for i in indices), key=lambda member: rank[member['id']])
+                for index, member in zip(indices, members):
+                    result[index] = member
+            return result
+
+        self.positions = {}
+        self.warnings = []
+        self._calculate_layer_positions(data.get('layers', []))
+        self._calculate_nested_positions(reorder(boxes), reorder(components))
+        # 증분 갱신 색인은 시트 순서 기준 (재계산 시 같은 결과가 나오도록)
+        self._snapshot = (boxes, components, children_of)
+        self._rows_reordered = True
+
+    @staticmethod
+    def _row_number(item: Dict) -> int:
+        row_num = item.get('row_number', 1)
+        return 1 if is_missing(row_num) else int(row_num)
+
     def _calculate_layer_positions(self, layers: List[Dict]):
         """레이어 위치 계산"""
         current_y = 0
 
         for layer in layers:
             layer_id = layer['id']
-            height_percent = layer.get('height_percent', 100 / max(len(layers), 1))
+            height_percent = layer.get('height_percent')
+            if is_missing(height_percent):
+                height_percent = 100 / max(len(layers), 1)
 
             height_px = self.canvas_height * (height_percent / 100)
 
-            self.positions[layer_id] = {
-                'x': 0,
-                'y': current_y,
-                'width': self.canvas_width,
-                'height': height_px
-            }
+            self.positions[layer_id] = Rect(0, current_y, self.canvas_width, height_px)
 
             current_y += height_px
 
-    def _calculate_box_positions(self, boxes: List[Dict]):
-        """박스 위치 계산 - 행번호 기반"""
-        # 부모별로 그룹화
-        parent_groups = {}
-        for box in boxes:
-            parent_id = box.get('parent_id')
-            if parent_id not in parent_groups:
-                parent_groups[parent_id] = []
-            parent_groups[parent_id].append(box)
-
-        # 각 그룹 내에서 행 기반 배치
-        for parent_id, children in parent_groups.items():
-            self._layout_items_by_row(children, parent_id)
-
-    def _calculate_component_positions(self, components: List[Dict]):
-        """컴포넌트 위치 계산"""
-        # 부모별로 그룹화
-        parent_groups = {}
-        for comp in components:
-            parent_id = comp.get('parent_id')
-            if parent_id not in parent_groups:
-                parent_groups[parent_id] = []
-            parent_groups[parent_id].append(comp)
-
-        # 각 그룹 내에서 행 기반 배치
-        for parent_id, children in parent_groups.items():
-            self._layout_items_by_row(children, parent_id)
+    def _calculate_nested_positions(self, boxes: List[Dict], components: List[Dict]):
+        """
+        박스/컴포넌트를 부모-자식 트리로 묶어 위에서 아래로 한 번에 배치
+
+        - 시트 순서와 관계없이 부모가 먼저 배치됨
+        - 같은 부모의 박스와 컴포넌트는 종류별로 따로 행 배치 (기존 배치 규칙 유지)
+        - 부모ID가 비어 있으면(빈 문자열 포함) 캔버스 기준으로 배치
+        - 없는 부모를 가리키면 캔버스 기준으로 배치하고 경고
+        - 부모 관계가 순환하면 순환을 끊어 캔버스 기준으로 배치하고 경고
+        """
+        # 부모ID → (자식 박스 목록, 자식 컴포넌트 목록)
+        children_of = {}
+        for kind, items in enumerate((boxes, components)):
+            for item, parent_id in zip(items, field_values(items, 'parent_id')):
+                parent_id = _normalize_parent(parent_id)
+                groups = children_of.get(parent_id)
+                if groups is None:
+                    groups = children_of[parent_id] = ([], [])
+                groups[kind].append(item)
+
+        # 증분 배치(update_positions)용 - 호출자가 목록을 바꿔도 배치 당시 상태 유지
+        self._snapshot = (list(boxes), list(components), children_of)
+
+        placed = set()
+        vectorize = self._vector_layout_enabled(boxes, components)
+
+        def place_subtree(root_id):
+            # 너비 우선 순회 - 한 단계의 형제 그룹을 모아 배치 (부모는 앞 단계에서 확정됨)
+            level = [root_id]
+            while level:
+                batch = []
+                next_level = []
+                for current in level:
+                    if current in placed:
+                        continue
+                    placed.add(current)
+                    for group in children_of.get(current, ()):
+                        if group:
+                            batch.append((current, group))
+                            next_level += [child_id for child_id in field_values(group, 'id')
+                                           if child_id in children_of]
+                if batch:
+                    self._layout_batch(batch, vectorize)
+                level = next_level
+
+        # 루트: 레이어, 부모 없음
+        for parent_id in children_of:
+            if parent_id is None or parent_id in self.positions:
+                place_subtree(parent_id)
+
+        if len(placed) < len(children_of):
+            self._place_unreachable(children_of, placed, place_subtree)
+
+    def _place_unreachable(self, children_of: Dict[Any, tuple], placed: set, place_subtree):
+        """루트에서 닿지 않은 항목 배치 (없는 부모 → 순환 순서로 처리)"""
+        parent_of = {}
+        for parent_id, groups in children_of.items():
+            for group in groups:
+                for item in group:
+                    parent_of[item['id']] = parent_id
+
+        for parent_id in list(children_of):
+            if parent_id in placed or parent_id in parent_of:
+                continue
+            items = ', '.join(str(item['id']) for group in children_of[parent_id] for item in group)
+            self.warnings.append(WARNING_MESSAGES['orphan_parent'].format(parent_id=parent_id, items=items))
+            place_subtree(parent_id)
+
+        # 그래도 위치가 없는 항목은 순환 안에 있음
+        for item_id in parent_of:
+            if item_id in self.positions:
+                continue
+
+            cycle = self._find_cycle(item_id, parent_of)
+            start = cycle[0]
+            self.warnings.append(WARNING_MESSAGES['parent_cycle'].format(
+                cycle=' → '.join(str(node) for node in cycle + [start]), item_id=start))
+
+            # 순환 시작 항목만 부모에서 떼어 캔버스 기준으로 배치 후 그 아래로 진행
+            for group in children_of[parent_of[start]]:
+                item = next((child for child in group if child['id'] == start), None)
+                if item is not None:
+                    group.remove(item)
+                    self._layout_items_by_row([item], None)
+                    break
+            place_subtree(start)
+
+    @staticmethod
+    def _find_cycle(item_id: Any, parent_of: Dict[Any, Any]) -> List[Any]:
+        """item_id에서 부모를 따라가며 만나는 순환 (부모 순서)"""
+        order = {}
+        path = []
+        current = item_id
+        while current not in order:
+            order[current] = len(path)
+            path.append(current)
+            current = parent_of[current]
+        return path[order[current]:]
+
+    def _vector_layout_enabled(self, boxes: List[Dict], components: List[Dict]) -> bool:
+        """NumPy 커널 사용 여부 (ID가 겹치면 배치 순서에 따라 결과가 달라지므로 파이썬 경로)"""
+        if self.vectorized is False or not layout_kernel.available():
+            return False
+        if self.vectorized is None and len(boxes) + len(components) < VECTOR_LAYOUT_THRESHOLD:
+            return False
+        ids = field_values(boxes, 'id') + field_values(components, 'id')
+        return len(set(ids)) == len(ids) and self.positions.keys().isdisjoint(ids)
+
+    def _layout_batch(self, batch: List[tuple], vectorize: bool):
+        """(부모ID, 형제 그룹) 묶음 배치 - 부모 위치는 모두 확정된 상태"""
+        if vectorize:
+            count = sum(len(group) for _, group in batch)
+            if self.vectorized or count >= VECTOR_BATCH_MIN_ITEMS:
+                result = layout_kernel.layout_groups(
+                    [(self._parent_rect(parent_id), group) for parent_id, group in batch],
+                    self.LEFT_MARGIN, self.RIGHT_MARGIN, self.GAP,
+                )
+                if result is not None:
+                    self.positions.update(zip(*result))
+                    self.profiler.count('layout.vector_items', count)
+                    return
+
+        for parent_id, group in batch:
+            self._layout_items_by_row(group, parent_id)
+
+    def _parent_rect(self, parent_id: Any) -> Rect:
+        """부모 영역 (부모가 없으면 캔버스 전체)"""
+        if parent_id and parent_id in self.positions:
+            return self.positions[parent_id]
+        return Rect(0, 0, self.canvas_width, self.canvas_height)
 
     def _layout_items_by_row(self, items: List[Dict], parent_id: str):
         """행 기반 배치"""
-        # 부모 영역
-        if parent_id and parent_id in self.positions:
-            parent_pos = self.positions[parent_id]
-        else:
-            parent_pos = {
-                'x': 0,
-                'y': 0,
-                'width': self.canvas_width,
-                'height': self.canvas_height
-            }
+        parent_pos = self._parent_rect(parent_id)
 
         # 행번호별로 그룹화
         row_groups = {}
         for item in items:
             row_num = item.get('row_number', 1)
-            if pd.isna(row_num):
+            if is_missing(row_num):
                 row_num = 1
             row_num = int(row_num)
             if row_num not in row_groups:
@@ -115,7 +572,7 @@ class LayoutEngine:
         for row_num, row_items in row_groups.items():
             self._layout_single_row(row_items, parent_pos)
 
-    def _layout_single_row(self, items: List[Dict], parent_pos: Dict):
+    def _layout_single_row(self, items: List[Dict], parent_pos: Rect):
         """한 행의 아이템들을 균등 배치"""
         count = len(items)
         if count == 0:
@@ -125,6 +582,8 @@ class LayoutEngine:
         available_width = 100 - self.LEFT_MARGIN - self.RIGHT_MARGIN
         total_gap = self.GAP * (count - 1) if count > 1 else 0
         item_width = (available_width - total_gap) / count
+        parent_x, parent_y = parent_pos.x, parent_pos.y
+        parent_width, parent_height = parent_pos.width, parent_pos.height
 
         # 각 아이템 배치
         for i, item in enumerate(items):
@@ -133,27 +592,73 @@ class LayoutEngine:
 
             # Y%, 높이% 가져오기
             y_percent = item.get('y_percent', 0)
-            if pd.isna(y_percent):
+            if is_missing(y_percent):
                 y_percent = 0
             height_percent = item.get('height_percent', 100)
-            if pd.isna(height_percent):
+            if is_missing(height_percent):
                 height_percent = 100
 
             # 픽셀 계산
-            x_px = parent_pos['x'] + (parent_pos['width'] * (x_percent / 100))
-            y_px = parent_pos['y'] + (parent_pos['height'] * (y_percent / 100))
-            width_px = parent_pos['width'] * (item_width / 100)
-            height_px = parent_pos['height'] * (height_percent / 100)
+            x_px = parent_x + (parent_width * (x_percent / 100))
+            y_px = parent_y + (parent_height * (y_percent / 100))
+            width_px = parent_width * (item_width / 100)
+            height_px = parent_height * (height_percent / 100)
 
             # 저장
-            item_id = item['id']
-            self.positions[item_id] = {
-                'x': x_px,
-                'y': y_px,
-                'width': width_px,
-                'height': height_px
-            }
+            self.positions[item['id']] = Rect(x_px, y_px, width_px, height_px)
 
     def detect_crossings(self, positions: Dict, connections: List[Dict]) -> int:
-        """연결선 교차 개수 추정"""
-        return 0  # 간단히 0 반환
+        """연결선 교차 개수 추정 (셀 중심 간 직교 경로 기준)"""
+        with self.profiler.span('layout.crossings'):
+            return detect_crossings(positions, connections)
+
+    def check_geometry(self, data: Dict[str, Any], positions: Optional[Dict] = None) -> List[str]:
+        """
+        배치 결과 검사 (Y%/높이% 값 때문에 생기는 문제)
+
+        - 같은 부모 안에서 서로 겹치는 형제
+        - 부모 영역을 벗어나는 항목
+
+        Returns:
+            경고 메시지 목록 (종류별 1건, 예시는 MAX_GEOMETRY_EXAMPLES개까지)
+        """
+        positions = self.positions if positions is None else positions
+        with self.profiler.span('layout.geometry'):
+            parent_of = {
+                item['id']: _parent_key(item)
+                for item in data.get('boxes', []) + data.get('components', [])
+                if item['id'] in positions
+            }
+            # 정수 좌표로 기록되므로 0.5px 이내 차이는 무시
+            index = SpatialIndex({item_id: positions[item_id] for item_id in parent_of}, tolerance=0.5)
+
+            overlaps = [
+                (first, second) for first, second in index.overlapping_pairs()
+                if parent_of[first] == parent_of[second]
+            ]
+            overflows = []
+            for item_id, parent_id in parent_of.items():
+                if parent_id not in positions:
+                    continue
+                x1, y1, x2, y2 = index.rects[item_id]
+                px1, py1, px2, py2 = to_rect(positions[parent_id])
+                if x1 < px1 - 0.5 or y1 < py1 - 0.5 or x2 > px2 + 0.5 or y2 > py2 + 0.5:
+                    overflows.append(item_id)
+
+        warnings = []
+        if overlaps:
+            warnings.append(WARNING_MESSAGES['overlapping_siblings'].format(
+                count=len(overlaps), pairs=self._examples(f"{first}↔{second}" for first, second in overlaps)))
+        if overflows:
+            warnings.append(WARNING_MESSAGES['parent_overflow'].format(
+                count=len(overflows), items=self._examples(overflows)))
+        return warnings
+
+    @staticmethod
+    def _examples(values: Iterable[Any]) -> str:
+        """앞의 몇 개만 나열 (나머지는 '외 N개')"""
+        values = [str(value) for value in values]
+        text = ', '.join(values[:MAX_GEOMETRY_EXAMPLES])
+        if len(values) > MAX_GEOMETRY_EXAMPLES:
+            text += f" 외 {len(values) - MAX_GEOMETRY_EXAMPLES}개"
+        return text
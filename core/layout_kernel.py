@@ -0,0 +1,122 @@
+"""
+AutoArchitect - 행 배치 NumPy 커널
+LayoutEngine._layout_single_row와 같은 계산을 여러 형제 그룹에 대해 배열 연산으로 한 번에 수행
+
+- (부모, 행번호)별 묶음과 행 안 순번을 정렬 한 번으로 계산
+- 좌표는 파이썬 경로와 같은 순서의 부동소수점 연산으로 계산하므로 결과가 같음
+- 숫자가 아닌 값(문자열, pandas NA 등)이 섞이면 None을 반환 → 호출자가 파이썬 경로로 처리
+- NumPy는 선택 의존성 (없으면 available()이 False)
+"""
+
+from typing import Any, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy가 없으면 파이썬 경로만 사용
+    np = None
+
+from core.records import Rect, field_values
+
+# float64로 정확히 나타낼 수 있는 정수 범위 (넘으면 파이썬 정수 연산과 결과가 달라질 수 있음)
+_EXACT_LIMIT = 2 ** 53
+
+
+def available() -> bool:
+    """NumPy 커널을 쓸 수 있는지"""
+    return np is not None
+
+
+def _numeric(values: Sequence[Any], missing: Optional[float]) -> Optional['np.ndarray']:
+    """
+    숫자 열 → float64 배열
+
+    Args:
+        missing: 빈 값(None/NaN)을 바꿀 값 - None이면 빈 값을 받지 않음 (NaN은 그대로)
+
+    Returns:
+        배열, 숫자가 아닌 값이 있으면 None
+    """
+    for kind in set(map(type, values)):
+        if kind is type(None) and missing is not None:
+            continue
+        if not issubclass(kind, (int, float, np.number, np.bool_)):
+            return None
+
+    array = np.array(values, dtype=np.float64)
+    if missing is not None:
+        array[np.isnan(array)] = missing
+    if (np.abs(array[np.isfinite(array)]) >= _EXACT_LIMIT).any():
+        return None
+    return array
+
+
+def layout_groups(groups: Sequence[Tuple[Rect, Sequence[Any]]], left_margin: float, right_margin: float,
+                  gap: float) -> Optional[Tuple[List[Any], List[Rect]]]:
+    """
+    형제 그룹들의 행 기반 균등 배치
+
+    Args:
+        groups: (부모 사각형, 자식 항목 목록) - 항목은 시트 순서
+        left_margin, right_margin, gap: 부모 너비 대비 % (LayoutEngine 설정)
+
+    Returns:
+        (항목ID 목록, Rect 목록) - 파이썬 경로가 기록하는 순서 (그룹 → 행 첫 등장 → 시트 순서),
+        숫자가 아닌 값이 있으면 None
+    """
+    items = [item for _, group in groups for item in group]
+    count = len(items)
+    if count == 0:
+        return [], []
+
+    # 필드별로 한 번에 꺼냄 (없는 값은 파이썬 경로와 같은 기본값)
+    ids = field_values(items, 'id')
+    rows = _numeric(field_values(items, 'row_number', 1), 1)
+    y_percents = _numeric(field_values(items, 'y_percent', 0), 0)
+    height_percents = _numeric(field_values(items, 'height_percent', 100), 100)
+    parents = [(rect.x, rect.y, rect.width, rect.height) for rect, _ in groups]
+    parent_values = _numeric([value for parent in parents for value in parent], None)
+    if rows is None or y_percents is None or height_percents is None or parent_values is None:
+        return None
+    if not np.isfinite(rows).all():
+        return None
+    rows = np.trunc(rows).astype(np.int64)
+    parent_values = parent_values.reshape(-1, 4)
+
+    # 항목별 그룹 번호
+    sizes = np.fromiter((len(group) for _, group in groups), dtype=np.int64, count=len(groups))
+    group_of = np.repeat(np.arange(len(groups)), sizes)
+    position = np.arange(count)
+
+    # (그룹, 행) 묶음: 그룹 → 행 → 시트 순서로 정렬하면 같은 묶음이 연속
+    by_row = np.lexsort((position, rows, group_of))
+    sorted_groups, sorted_rows = group_of[by_row], rows[by_row]
+    run_start = np.ones(count, dtype=bool)
+    run_start[1:] = (sorted_groups[1:] != sorted_groups[:-1]) | (sorted_rows[1:] != sorted_rows[:-1])
+    run_of = np.cumsum(run_start) - 1
+    starts = np.flatnonzero(run_start)
+    run_sizes = np.diff(np.append(starts, count))
+
+    # 항목별 행 크기 / 행 안 순번 / 행이 처음 나온 위치
+    row_count = np.empty(count, dtype=np.int64)
+    row_count[by_row] = run_sizes[run_of]
+    row_index = np.empty(count, dtype=np.int64)
+    row_index[by_row] = np.arange(count) - starts[run_of]
+    first_seen = np.empty(count, dtype=np.int64)
+    first_seen[by_row] = by_row[starts][run_of]
+
+    # LayoutEngine._layout_single_row와 같은 식 (연산 순서 유지)
+    available_width = 100 - left_margin - right_margin
+    item_width = (available_width - gap * (row_count - 1)) / row_count
+    x_percent = left_margin + (item_width + gap) * row_index
+
+    parent_x, parent_y, parent_width, parent_height = parent_values[group_of].T
+    x = parent_x + (parent_width * (x_percent / 100))
+    y = parent_y + (parent_height * (y_percents / 100))
+    width = parent_width * (item_width / 100)
+    height = parent_height * (height_percents / 100)
+
+    # 파이썬 경로의 기록 순서: 그룹 → 행 첫 등장 순서 → 시트 순서
+    order = np.lexsort((position, first_seen))
+    rects = [Rect(*values) for values in zip(x[order].tolist(), y[order].tolist(),
+                                             width[order].tolist(), height[order].tolist())]
+    return [ids[index] for index in order.tolist()], rects
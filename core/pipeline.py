@@ -0,0 +1,204 @@
+"""
+AutoArchitect - 생성 파이프라인
+엑셀 → 파싱 → 레이아웃 → Draw.io XML 변환과 결과 캐시
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+from core import __version__
+from core.excel_parser import ExcelParser
+from core.layout_engine import LayoutEngine
+from core.drawio_generator import DrawioGenerator
+from core.instrumentation import Profiler, get_profiler
+
+
+# 캐시 디스크 경로 환경변수 (설정 시 디스크 캐시 사용)
+CACHE_DIR_ENV = 'AUTOARCHITECT_CACHE_DIR'
+
+
+def get_pipeline_version() -> str:
+    """파이프라인 버전 문자열 (엔진/생성기 버전이 바뀌면 캐시 무효화)"""
+    return f"{__version__}/{LayoutEngine.VERSION}/{DrawioGenerator.VERSION}"
+
+
+def compute_cache_key(excel_bytes: bytes, compressed: bool = False) -> str:
+    """엑셀 바이트 + 파이프라인 버전 + 출력 옵션으로 캐시 키 계산"""
+    digest = hashlib.sha256()
+    digest.update(get_pipeline_version().encode('utf-8'))
+    digest.update(b'\0compressed\0' if compressed else b'\0')
+    digest.update(excel_bytes)
+    return digest.hexdigest()
+
+
+class PipelineCache:
+    """
+    완성된 XML 캐시
+
+    - 메모리: LRU (OrderedDict)
+    - 디스크: cache_dir 지정 시 {key}.json 파일로 보관
+      (저장 실패는 RuntimeWarning만 내고 메모리 캐시로 계속 동작)
+    """
+
+    def __init__(self, max_entries: int = 64, cache_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Tuple[str, str]]:
+        """캐시 조회 - (xml_content, diagram_name) 또는 None"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store_memory(key, entry)
+        return entry
+
+    def put(self, key: str, xml_content: str, diagram_name: str):
+        """캐시 저장"""
+        entry = (xml_content, diagram_name)
+        with self._lock:
+            self._store_memory(key, entry)
+        self._write_disk(key, entry)
+
+    def clear(self):
+        """메모리 캐시 비우기 (디스크 파일은 유지)"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def _store_memory(self, key: str, entry: Tuple[str, str]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[Tuple[str, str]]:
+        if not self.cache_dir:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+            return payload['xml'], payload['diagram_name']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, key: str, entry: Tuple[str, str]):
+        if not self.cache_dir:
+            return
+
+        path = self._disk_path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'xml': entry[0], 'diagram_name': entry[1]}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            tmp_path.unlink(missing_ok=True)
+            warnings.warn(f"캐시 저장 실패: {e}", RuntimeWarning, stacklevel=3)
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_pipeline_cache() -> PipelineCache:
+    """프로세스 공용 캐시 반환"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = PipelineCache(cache_dir=os.environ.get(CACHE_DIR_ENV) or None)
+        return _default_cache
+
+
+def build_xml(data: Dict[str, Any], positions: Optional[Dict[str, Dict]] = None,
+              compressed: bool = False, profiler: Optional[Profiler] = None) -> str:
+    """파싱된 데이터로 레이아웃 계산 후 XML 생성 (positions가 있으면 재사용)"""
+    profiler = get_profiler(profiler)
+
+    if positions is None:
+        with profiler.span('layout'):
+            layout_engine = LayoutEngine(profiler=profiler)
+            positions = layout_engine.calculate_positions(data)
+
+    with profiler.span('generate'):
+        generator = DrawioGenerator(profiler=profiler)
+        return generator.generate_xml(data, positions, compressed=compressed)
+
+
+def generate_xml_from_excel(excel_bytes: bytes, cache: Optional[PipelineCache] = None,
+                            use_cache: bool = True, compressed: bool = False,
+                            profiler: Optional[Profiler] = None) -> Tuple[str, str]:
+    """
+    엑셀 바이트로 XML 생성 (캐시 사용)
+
+    Args:
+        excel_bytes: 엑셀 파일 바이트
+        cache: 사용할 캐시 (None이면 프로세스 공용 캐시)
+        use_cache: False면 캐시를 건너뛰고 항상 새로 생성
+        compressed: True면 draw.io 압축 형식으로 생성
+        profiler: 단계별 시간/메모리를 기록할 Profiler (None이면 기록 안 함)
+
+    Returns:
+        (xml_content, diagram_name)
+    """
+    profiler = get_profiler(profiler)
+
+    key = None
+    if use_cache:
+        if cache is None:
+            cache = get_pipeline_cache()
+        with profiler.span('cache.lookup'):
+            key = compute_cache_key(excel_bytes, compressed)
+            cached = cache.get(key)
+        if cached is not None:
+            profiler.count('cache.hits')
+            return cached
+        profiler.count('cache.misses')
+
+    parser = ExcelParser(backend='openpyxl')
+    with profiler.span('read'):
+        sheets = parser.read_excel(io.BytesIO(excel_bytes))
+    with profiler.span('parse'):
+        data = parser.parse_to_dict(sheets)
+
+    xml_content = build_xml(data, compressed=compressed, profiler=profiler)
+    diagram_name = data.get('config', {}).get('다이어그램명', 'diagram')
+
+    if key is not None and not parser.errors:
+        cache.put(key, xml_content, diagram_name)
+
+    return xml_content, diagram_name
@@ -0,0 +1,96 @@
+"""
+AutoArchitect - 빈 공간 배치
+기존 다이어그램 항목을 피해 새 블록(컴포넌트)을 놓을 위치 계산
+
+- 기존 항목은 SpatialIndex(균일 격자)에 담아 겹침 검사
+- 다른 항목 안에 들어 있는 항목은 빈 공간 판단에 영향이 없으므로 가장 바깥 항목만 사용
+- 후보 위치는 각 항목의 오른쪽 위 / 왼쪽 아래 모서리 (간격 포함)
+- 전체 영역이 가장 덜 커지는 후보부터 겹치지 않는 첫 위치 선택
+"""
+
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+from core.spatial_index import SpatialIndex, to_rect
+
+# 새 블록과 기존 항목 사이 최소 간격
+PLACEMENT_GAP = 40
+
+
+class FreeSpacePlacer:
+    """
+    빈 공간 찾기
+
+    - 후보는 (오른쪽 끝 + 간격, 위쪽) / (왼쪽, 아래쪽 끝 + 간격) 모서리와 전체 영역 오른쪽/아래
+    - 점수: 배치 후 전체 영역의 긴 변 → 넓이 → y → x (캔버스가 한쪽으로만 길어지지 않도록)
+    - 전체 영역 오른쪽 후보는 항상 비어 있으므로 반드시 위치를 찾음
+    """
+
+    def __init__(self, positions: Dict[Any, Dict[str, float]], gap: float = PLACEMENT_GAP):
+        self.gap = gap
+        self.index = SpatialIndex(self._outermost(positions))
+        self.bbox: Optional[Tuple[float, float, float, float]] = None
+        for rect in self.index.rects.values():
+            self._extend(rect)
+
+    @staticmethod
+    def _outermost(positions: Dict[Any, Dict[str, float]]) -> Dict[Any, Dict[str, float]]:
+        """다른 항목에 들어 있지 않은 항목 (같은 사각형이면 먼저 나온 항목만)"""
+        index = SpatialIndex(positions)
+        order = {item_id: rank for rank, item_id in enumerate(positions)}
+        rects = index.rects
+        outer = {}
+        for item_id, pos in positions.items():
+            inside = any(
+                rects[other] != rects[item_id] or order[other] < order[item_id]
+                for other in index.containers(item_id)
+            )
+            if not inside:
+                outer[item_id] = pos
+        return outer
+
+    def _extend(self, rect: Tuple[float, float, float, float]):
+        if self.bbox is None:
+            self.bbox = rect
+        else:
+            x1, y1, x2, y2 = self.bbox
+            self.bbox = (min(x1, rect[0]), min(y1, rect[1]), max(x2, rect[2]), max(y2, rect[3]))
+
+    def add(self, item_id: Any, pos: Dict[str, float]):
+        """배치된 항목 추가 (이후 find에서 피함, 바깥 항목 안에 들어가면 무시)"""
+        if self.index.containers(to_rect(pos)):
+            return
+        self.index.insert(item_id, pos)
+        self._extend(self.index.rects[item_id])
+
+    def _candidates(self) -> Iterable[Tuple[float, float]]:
+        gap = self.gap
+        x1, y1, x2, y2 = self.bbox
+        candidates = {(x2 + gap, y1), (x1, y2 + gap)}
+        for left, top, right, bottom in self.index.rects.values():
+            candidates.add((right + gap, top))
+            candidates.add((left, bottom + gap))
+        return candidates
+
+    def find(self, width: float, height: float) -> Tuple[float, float]:
+        """
+        width x height 블록을 놓을 왼쪽 위 좌표
+
+        Returns:
+            (x, y) - 기존 항목이 없으면 (0, 0)
+        """
+        if self.bbox is None:
+            return 0.0, 0.0
+
+        gap = self.gap
+        bx1, by1, bx2, by2 = self.bbox
+
+        def score(point):
+            x, y = point
+            new_width = max(bx2, x + width) - min(bx1, x)
+            new_height = max(by2, y + height) - min(by1, y)
+            return max(new_width, new_height), new_width * new_height, y, x
+
+        for x, y in sorted(self._candidates(), key=score):
+            if not self.index.overlapping((x - gap, y - gap, x + width + gap, y + height + gap)):
+                return x, y
+        return bx2 + gap, by1
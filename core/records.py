@@ -0,0 +1,244 @@
+"""
+AutoArchitect - 행 레코드
+파서가 만드는 레이어/박스/컴포넌트/연결 행과 레이아웃 좌표를 __slots__ 레코드로 보관
+
+- 행마다 dict를 만들지 않으므로 큰 다이어그램(수만 개 항목)에서 메모리가 적게 듦
+- 기존 코드와 호환되도록 dict처럼 읽고 쓸 수 있음 (get, [], in, items, ==)
+- 정해진 필드 밖의 키는 레코드별 extras dict에 보관
+- ID / 색상 이름 같은 반복 문자열은 sys.intern으로 공유
+- JSON으로 저장할 때는 to_dict 또는 json_default 사용
+"""
+
+import sys
+from collections.abc import Mapping, MutableMapping
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 필드가 비어 있음을 나타내는 값 (None과 구분)
+_UNSET = object()
+
+
+def _intern(value: Any) -> Any:
+    """문자열이면 intern (그 밖의 값은 그대로)"""
+    return sys.intern(value) if value.__class__ is str else value
+
+
+class Record(MutableMapping):
+    """
+    __slots__ 레코드 기반 클래스
+
+    하위 클래스는 FIELDS(필드 이름 순서)와 같은 이름의 __slots__를 정의하고,
+    INTERNED에 intern할 문자열 필드를 적음 (생성자는 하위 클래스가 필드별로 직접 대입)
+    """
+
+    __slots__ = ('_extras',)
+
+    FIELDS: Tuple[str, ...] = ()
+    INTERNED: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_mapping(cls, values: Mapping) -> 'Record':
+        """
+        dict 등 → 레코드 (이미 같은 레코드면 그대로)
+
+        dict에 없는 필드는 비워 둠 (get은 기본값, []는 KeyError - 원래 dict와 같은 동작)
+        """
+        if values.__class__ is cls:
+            return values
+        record = cls.__new__(cls)
+        record._extras = None
+        for key, value in values.items():
+            record[key] = _intern(value) if key in cls.INTERNED else value
+        return record
+
+    # ---------- dict 보기 ----------
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.FIELDS:
+            value = getattr(self, key, _UNSET)
+            if value is not _UNSET:
+                return value
+        elif self._extras is not None and key in self._extras:
+            return self._extras[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.FIELDS:
+            return getattr(self, key, default)
+        if self._extras is not None:
+            return self._extras.get(key, default)
+        return default
+
+    def __setitem__(self, key: str, value: Any):
+        if key in self.FIELDS:
+            setattr(self, key, value)
+        else:
+            if self._extras is None:
+                self._extras = {}
+            self._extras[key] = value
+
+    def __delitem__(self, key: str):
+        if key in self.FIELDS:
+            if getattr(self, key, _UNSET) is _UNSET:
+                raise KeyError(key)
+            delattr(self, key)
+        elif self._extras is not None and key in self._extras:
+            del self._extras[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self.FIELDS:
+            return getattr(self, key, _UNSET) is not _UNSET
+        return self._extras is not None and key in self._extras
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self.FIELDS:
+            if getattr(self, name, _UNSET) is not _UNSET:
+                yield name
+        if self._extras:
+            yield from self._extras
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is self.__class__:
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.to_dict()!r})"
+
+    def __reduce__(self):
+        return self.__class__.from_mapping, (self.to_dict(),)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """일반 dict 복사본"""
+        values = {name: getattr(self, name) for name in self.FIELDS if getattr(self, name, _UNSET) is not _UNSET}
+        if self._extras:
+            values.update(self._extras)
+        return values
+
+    def copy(self) -> 'Record':
+        return self.__class__.from_mapping(self.to_dict())
+
+
+class LayerRecord(Record):
+    """LAYERS 시트 한 행"""
+    __slots__ = ('id', 'name', 'order', 'bg_color', 'height_percent')
+    FIELDS = __slots__
+    INTERNED = ('id', 'bg_color')
+
+    def __init__(self, id: Any, name: Any = '', order: Any = 1, bg_color: Any = '흰색',
+                 height_percent: Any = 50):
+        self._extras = None
+        self.id = _intern(id)
+        self.name = name
+        self.order = order
+        self.bg_color = _intern(bg_color)
+        self.height_percent = height_percent
+
+
+class BoxRecord(Record):
+    """BOXES 시트 한 행"""
+    __slots__ = ('id', 'name', 'parent_id', 'row_number', 'y_percent', 'height_percent',
+                 'bg_color', 'border_color', 'font_size')
+    FIELDS = __slots__
+    INTERNED = ('id', 'parent_id', 'bg_color', 'border_color')
+
+    def __init__(self, id: Any, name: Any = '', parent_id: Any = None, row_number: Any = 1,
+                 y_percent: Any = 0, height_percent: Any = 100, bg_color: Any = '흰색',
+                 border_color: Any = '회색', font_size: Any = 11):
+        self._extras = None
+        self.id = _intern(id)
+        self.name = name
+        self.parent_id = _intern(parent_id)
+        self.row_number = row_number
+        self.y_percent = y_percent
+        self.height_percent = height_percent
+        self.bg_color = _intern(bg_color)
+        self.border_color = _intern(border_color)
+        self.font_size = font_size
+
+
+class ComponentRecord(Record):
+    """COMPONENTS 시트 한 행"""
+    __slots__ = ('id', 'name', 'parent_id', 'row_number', 'y_percent', 'height_percent',
+                 'font_size', 'type')
+    FIELDS = __slots__
+    INTERNED = ('id', 'parent_id', 'type')
+
+    def __init__(self, id: Any, name: Any = '', parent_id: Any = None, row_number: Any = 1,
+                 y_percent: Any = 0, height_percent: Any = 100, font_size: Any = 10,
+                 type: Any = '단일박스'):
+        self._extras = None
+        self.id = _intern(id)
+        self.name = name
+        self.parent_id = _intern(parent_id)
+        self.row_number = row_number
+        self.y_percent = y_percent
+        self.height_percent = height_percent
+        self.font_size = font_size
+        self.type = _intern(type)
+
+
+class ConnectionRecord(Record):
+    """CONNECTIONS 시트 한 행"""
+    __slots__ = ('from_id', 'to_id', 'type', 'label', 'style')
+    FIELDS = __slots__
+    INTERNED = ('from_id', 'to_id', 'type', 'style')
+
+    def __init__(self, from_id: Any, to_id: Any, type: Any = '데이터흐름', label: Any = '',
+                 style: Any = '실선'):
+        self._extras = None
+        self.from_id = _intern(from_id)
+        self.to_id = _intern(to_id)
+        self.type = _intern(type)
+        self.label = label
+        self.style = _intern(style)
+
+
+class Rect(Record):
+    """레이아웃 좌표 {x, y, width, height}"""
+    __slots__ = ('x', 'y', 'width', 'height')
+    FIELDS = __slots__
+
+    def __init__(self, x: float = 0, y: float = 0, width: float = 0, height: float = 0):
+        self._extras = None
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is Rect and not self._extras and not other._extras:
+            return (self.x == other.x and self.y == other.y
+                    and self.width == other.width and self.height == other.height)
+        return super().__eq__(other)
+
+    __hash__ = None
+
+
+def field_values(items: Iterable[Any], name: str, default: Any = None) -> List[Any]:
+    """
+    항목 목록에서 한 필드 값만 꺼냄
+
+    모두 필드가 채워진 레코드면 attrgetter로 한 번에 읽고, dict가 섞여 있으면 get(name, default)
+    """
+    items = items if isinstance(items, list) else list(items)
+    try:
+        return list(map(attrgetter(name), items))
+    except AttributeError:
+        return [item.get(name, default) for item in items]
+
+
+def json_default(value: Any) -> Any:
+    """json.dump(default=...)용 - 레코드를 dict로"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
@@ -0,0 +1,174 @@
+"""
+AutoArchitect - 행 내 순서 최적화
+같은 행의 형제 순서를 바꿔 연결선 교차를 줄임 (barycentre 휴리스틱 + 인접 교환)
+"""
+
+import time
+from typing import Dict, List, Any, Optional
+
+from core.crossings import count_crossings, route_centers
+
+
+def _center(pos: Dict[str, float]) -> tuple:
+    return pos['x'] + pos['width'] / 2, pos['y'] + pos['height'] / 2
+
+
+class RowOrderOptimizer:
+    """
+    행 그룹별 형제 순서 최적화
+
+    - 같은 행 항목은 너비가 같으므로 순서를 바꾸면 슬롯 x만 바뀌고 하위 트리는 함께 평행 이동
+    - 1단계: 연결된 바깥 항목들의 평균 x(barycentre) 순으로 정렬, 위→아래/아래→위 번갈아 반복
+    - 2단계: 남은 시간 동안 이웃한 두 항목을 바꿔 보고 교차가 줄면 유지
+    - 교차 수가 줄어든 순서만 채택하며 시간 예산을 넘기면 중단
+    """
+
+    def __init__(self, positions: Dict[Any, Dict], parent_of: Dict[Any, Any],
+                 row_groups: List[List[Any]], connections: List[Dict]):
+        self.positions = positions
+        self.parent_of = parent_of
+        self.connections = [
+            conn for conn in connections
+            if conn.get('from_id') in positions and conn.get('to_id') in positions
+        ]
+        self._chains = {}
+        self.shift = {}
+
+        # 연결 끝점의 원래 중심 좌표
+        self._endpoints = {}
+        for conn in self.connections:
+            for node in (conn['from_id'], conn['to_id']):
+                if node not in self._endpoints:
+                    self._endpoints[node] = _center(positions[node])
+
+        # 연결이 있는 항목을 포함한 행 그룹만 대상
+        self.neighbours = self._collect_neighbours(row_groups)
+        self.groups = [list(group) for group in row_groups if any(self.neighbours.get(i) for i in group)]
+        self.groups.sort(key=lambda group: min(positions[i]['y'] for i in group))
+
+    def _chain(self, node: Any) -> List[Any]:
+        """node와 조상 목록"""
+        chain = self._chains.get(node)
+        if chain is None:
+            chain = []
+            current = node
+            while current is not None and current not in chain:
+                chain.append(current)
+                current = self.parent_of.get(current)
+            self._chains[node] = chain
+        return chain
+
+    def _collect_neighbours(self, row_groups: List[List[Any]]) -> Dict[Any, List[Any]]:
+        """행 그룹 항목 → 하위 트리 바깥의 연결 상대 목록"""
+        members = {item_id for group in row_groups for item_id in group}
+        neighbours = {}
+        for conn in self.connections:
+            ends = (conn['from_id'], conn['to_id'])
+            for this, other in (ends, ends[::-1]):
+                other_chain = set(self._chain(other))
+                for ancestor in self._chain(this):
+                    if ancestor in members and ancestor not in other_chain:
+                        neighbours.setdefault(ancestor, []).append(other)
+        return neighbours
+
+    def current_x(self, node: Any) -> float:
+        """평행 이동을 반영한 중심 x"""
+        x = _center(self.positions[node])[0]
+        shift = self.shift
+        for ancestor in self._chain(node):
+            x += shift.get(ancestor, 0.0)
+        return x
+
+    def crossings(self) -> int:
+        """현재 순서의 교차 수"""
+        shift = self.shift
+        centers = {}
+        for node, (x, y) in self._endpoints.items():
+            for ancestor in self._chain(node):
+                x += shift.get(ancestor, 0.0)
+            centers[node] = (x, y)
+        return count_crossings(route_centers(centers, self.connections))
+
+    def _reorder(self, group: List[Any]):
+        """barycentre 순으로 정렬하고 슬롯에 다시 배치 (group을 새 순서로 바꿈)"""
+        current = {item_id: self.current_x(item_id) for item_id in group}
+        slots = sorted(current.values())
+
+        def barycentre(item_id):
+            others = self.neighbours.get(item_id)
+            if not others:
+                return current[item_id]
+            return sum(self.current_x(other) for other in others) / len(others)
+
+        group.sort(key=lambda item_id: (barycentre(item_id), current[item_id]))
+        for item_id, slot in zip(group, slots):
+            self.shift[item_id] = self.shift.get(item_id, 0.0) + slot - current[item_id]
+
+    def _swap(self, group: List[Any], index: int):
+        """이웃한 두 항목의 슬롯 교환"""
+        left, right = group[index], group[index + 1]
+        dx = self.current_x(right) - self.current_x(left)
+        self.shift[left] = self.shift.get(left, 0.0) + dx
+        self.shift[right] = self.shift.get(right, 0.0) - dx
+        group[index], group[index + 1] = right, left
+
+    def optimize(self, time_budget_ms: float = 50, max_iterations: int = 8) -> Optional[Dict[Any, int]]:
+        """
+        교차를 줄이는 행 순서 계산
+
+        Returns:
+            항목 ID → 행 안의 새 순번 (개선이 없으면 None)
+        """
+        if not self.groups or time_budget_ms <= 0:
+            return None
+
+        started = time.perf_counter()
+        deadline = started + time_budget_ms / 1000
+        initial = best = self.crossings()
+        # 교차 계산 1회 비용 - 남은 시간이 이보다 적으면 새 시도를 시작하지 않음
+        eval_cost = time.perf_counter() - started
+
+        def out_of_time():
+            return time.perf_counter() + eval_cost > deadline
+
+        def snapshot():
+            return [list(group) for group in self.groups], dict(self.shift)
+
+        best_state = snapshot()
+        stale = 0
+
+        # 1단계: barycentre 정렬
+        for iteration in range(max_iterations):
+            if best == 0 or stale >= 2 or out_of_time():
+                break
+
+            sweep = self.groups if iteration % 2 == 0 else self.groups[::-1]
+            for group in sweep:
+                self._reorder(group)
+
+            crossings = self.crossings()
+            if crossings < best:
+                best, best_state, stale = crossings, snapshot(), 0
+            else:
+                stale += 1
+
+        self.groups, self.shift = best_state
+
+        # 2단계: 인접 교환
+        improved = True
+        while improved and best > 0 and not out_of_time():
+            improved = False
+            for group in self.groups:
+                for index in range(len(group) - 1):
+                    if out_of_time():
+                        break
+                    self._swap(group, index)
+                    crossings = self.crossings()
+                    if crossings < best:
+                        best, improved = crossings, True
+                    else:
+                        self._swap(group, index)
+
+        if best >= initial:
+            return None
+        return {item_id: rank for group in self.groups for rank, item_id in enumerate(group)}
@@ -0,0 +1,213 @@
+"""
+AutoArchitect - 공간 색인
+positions 형식({id: {x, y, width, height}})의 사각형을 균일 격자 버킷에 담아
+겹침 / 포함 / 최근접 조회를 버킷 단위로 처리
+"""
+
+import heapq
+import math
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+
+Rect = Tuple[float, float, float, float]  # (x1, y1, x2, y2)
+
+
+def to_rect(pos: Dict[str, float], margin: float = 0) -> Rect:
+    """positions 항목 → (x1, y1, x2, y2)"""
+    return (
+        pos['x'] - margin,
+        pos['y'] - margin,
+        pos['x'] + pos['width'] + margin,
+        pos['y'] + pos['height'] + margin,
+    )
+
+
+class SpatialIndex:
+    """
+    사각형 균일 격자 색인
+
+    - 버킷 크기 기본값은 사각형 평균 크기의 2배 (버킷당 항목 수가 작게 유지됨)
+    - 겹침은 안쪽끼리 닿을 때만 (경계만 맞닿으면 겹침 아님)
+    - 포함은 tolerance만큼 벗어나도 포함으로 봄 (정수 좌표 반올림 대비)
+    """
+
+    def __init__(self, positions: Dict[Any, Dict[str, float]], margin: float = 0,
+                 bucket_size: float = 0, tolerance: float = 0):
+        self.rects: Dict[Any, Rect] = {item_id: to_rect(pos, margin) for item_id, pos in positions.items()}
+        self.tolerance = tolerance
+
+        if bucket_size <= 0:
+            sizes = [max(x2 - x1, y2 - y1) for x1, y1, x2, y2 in self.rects.values()]
+            bucket_size = 2 * sum(sizes) / len(sizes) if sizes else 100
+        self.bucket_size = bucket_size or 100
+
+        self.buckets: Dict[Tuple[int, int], List[Any]] = {}
+        for item_id, rect in self.rects.items():
+            for key in self._bucket_keys(rect):
+                self.buckets.setdefault(key, []).append(item_id)
+
+        bucket_xs = [bx for bx, _ in self.buckets] or [0]
+        bucket_ys = [by for _, by in self.buckets] or [0]
+        self._bounds = (min(bucket_xs), min(bucket_ys), max(bucket_xs), max(bucket_ys))
+
+    def insert(self, item_id: Any, pos: Dict[str, float], margin: float = 0):
+        """항목 추가 (버킷 크기는 그대로)"""
+        rect = self.rects[item_id] = to_rect(pos, margin)
+        for key in self._bucket_keys(rect):
+            self.buckets.setdefault(key, []).append(item_id)
+            min_bx, min_by, max_bx, max_by = self._bounds
+            self._bounds = (min(min_bx, key[0]), min(min_by, key[1]), max(max_bx, key[0]), max(max_by, key[1]))
+
+    def __len__(self) -> int:
+        return len(self.rects)
+
+    def __contains__(self, item_id: Any) -> bool:
+        return item_id in self.rects
+
+    def _bucket(self, value: float) -> int:
+        return int(value // self.bucket_size)
+
+    def _bucket_keys(self, rect: Rect) -> Iterator[Tuple[int, int]]:
+        x1, y1, x2, y2 = rect
+        for bx in range(self._bucket(x1), self._bucket(x2) + 1):
+            for by in range(self._bucket(y1), self._bucket(y2) + 1):
+                yield bx, by
+
+    def _candidates(self, rect: Rect) -> Iterator[Any]:
+        """rect가 걸친 버킷의 항목 (중복 제거)"""
+        seen = set()
+        for key in self._bucket_keys(rect):
+            for item_id in self.buckets.get(key, ()):
+                if item_id not in seen:
+                    seen.add(item_id)
+                    yield item_id
+
+    def _rect(self, target: Any) -> Rect:
+        """ID 또는 사각형"""
+        return self.rects[target] if not isinstance(target, tuple) else target
+
+    def at_point(self, x: float, y: float) -> List[Any]:
+        """점을 안쪽(경계 제외)에 포함하는 항목"""
+        rects = self.rects
+        return [
+            item_id for item_id in self.buckets.get((self._bucket(x), self._bucket(y)), ())
+            if rects[item_id][0] < x < rects[item_id][2] and rects[item_id][1] < y < rects[item_id][3]
+        ]
+
+    def overlapping(self, target: Any) -> List[Any]:
+        """
+        안쪽이 겹치는 항목
+
+        Args:
+            target: 항목 ID 또는 (x1, y1, x2, y2) (ID면 자기 자신 제외)
+        """
+        x1, y1, x2, y2 = self._rect(target)
+        rects = self.rects
+        return [
+            item_id for item_id in self._candidates((x1, y1, x2, y2))
+            if item_id != target
+            and rects[item_id][0] < x2 and x1 < rects[item_id][2]
+            and rects[item_id][1] < y2 and y1 < rects[item_id][3]
+        ]
+
+    def containers(self, target: Any) -> List[Any]:
+        """
+        target을 감싸는 항목 (ID면 자기 자신 제외)
+
+        감싸는 사각형은 반드시 target 중심을 덮으므로 중심점 버킷만 확인
+        """
+        x1, y1, x2, y2 = self._rect(target)
+        tol = self.tolerance
+        key = (self._bucket((x1 + x2) / 2), self._bucket((y1 + y2) / 2))
+        rects = self.rects
+        return [
+            item_id for item_id in self.buckets.get(key, ())
+            if item_id != target
+            and rects[item_id][0] - tol <= x1 and x2 <= rects[item_id][2] + tol
+            and rects[item_id][1] - tol <= y1 and y2 <= rects[item_id][3] + tol
+        ]
+
+    def contained(self, target: Any) -> List[Any]:
+        """target 안에 들어가는 항목 (ID면 자기 자신 제외)"""
+        x1, y1, x2, y2 = self._rect(target)
+        tol = self.tolerance
+        rects = self.rects
+        return [
+            item_id for item_id in self._candidates((x1, y1, x2, y2))
+            if item_id != target
+            and x1 - tol <= rects[item_id][0] and rects[item_id][2] <= x2 + tol
+            and y1 - tol <= rects[item_id][1] and rects[item_id][3] <= y2 + tol
+        ]
+
+    def nearest(self, x: float, y: float, k: int = 1, exclude: Iterable[Any] = ()) -> List[Any]:
+        """
+        점에서 가까운 항목 k개 (사각형까지의 거리, 안쪽이면 0)
+
+        점이 든 버킷부터 고리 모양으로 넓혀 가며 찾고,
+        찾은 k번째 거리가 다음 고리까지의 최소 거리보다 작으면 중단
+        """
+        exclude = set(exclude)
+        if k <= 0 or len(self.rects) <= len(exclude & self.rects.keys()):
+            return []
+
+        bx, by = self._bucket(x), self._bucket(y)
+        min_bx, min_by, max_bx, max_by = self._bounds
+        max_radius = max(bx - min_bx, max_bx - bx, by - min_by, max_by - by, 0)
+
+        found: List[Tuple[float, int, Any]] = []  # (-거리, 순번, ID) 최대 힙
+        seen = set(exclude)
+        for radius in range(max_radius + 1):
+            for key in self._ring(bx, by, radius):
+                for item_id in self.buckets.get(key, ()):
+                    if item_id in seen:
+                        continue
+                    seen.add(item_id)
+                    entry = (-self._distance(item_id, x, y), len(seen), item_id)
+                    if len(found) < k:
+                        heapq.heappush(found, entry)
+                    elif entry > found[0]:
+                        heapq.heapreplace(found, entry)
+
+            # 다음 고리의 버킷은 최소 radius * bucket_size 이상 떨어져 있음
+            if len(found) == k and -found[0][0] <= radius * self.bucket_size:
+                break
+
+        return [item_id for _, _, item_id in sorted(found, key=lambda entry: (-entry[0], entry[1]))]
+
+    @staticmethod
+    def _ring(bx: int, by: int, radius: int) -> Iterator[Tuple[int, int]]:
+        """(bx, by)에서 체비쇼프 거리가 radius인 버킷"""
+        if radius == 0:
+            yield bx, by
+            return
+        for dx in range(-radius, radius + 1):
+            yield bx + dx, by - radius
+            yield bx + dx, by + radius
+        for dy in range(-radius + 1, radius):
+            yield bx - radius, by + dy
+            yield bx + radius, by + dy
+
+    def _distance(self, item_id: Any, x: float, y: float) -> float:
+        x1, y1, x2, y2 = self.rects[item_id]
+        dx = max(x1 - x, 0, x - x2)
+        dy = max(y1 - y, 0, y - y2)
+        return math.hypot(dx, dy)
+
+    def overlapping_pairs(self, item_ids: Optional[Iterable[Any]] = None) -> List[Tuple[Any, Any]]:
+        """
+        안쪽이 겹치는 항목 쌍 (각 쌍은 한 번만)
+
+        Args:
+            item_ids: 이 항목들끼리만 비교 (None이면 전체)
+        """
+        if item_ids is None:
+            members = self.rects
+        else:
+            members = {item_id: True for item_id in item_ids}
+
+        order = {item_id: index for index, item_id in enumerate(members)}
+        pairs = []
+        for item_id in members:
+            for other in self.overlapping(item_id):
+                if other in order and order[item_id] < order[other]:
+                    pairs.append((item_id, other))
+        return pairs
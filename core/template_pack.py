@@ -0,0 +1,251 @@
+"""
+AutoArchitect - 템플릿 팩
+카탈로그 템플릿(엑셀)과 컴포넌트를 미리 파싱/배치/XML 생성해 둔 JSON 산출물
+
+- scripts/build_template_pack.py로 templates/template_pack.json 생성
+- 갤러리는 팩에서 XML을 바로 꺼내 쓰므로 엑셀 파싱(openpyxl)을 거치지 않음
+- 원본 엑셀 해시나 파이프라인 버전이 달라진 항목은 실행 중에 메모리에서만 다시 만듦
+  (팩 파일은 빌드 스크립트만 저장 - 앱 사용 중에 소스 트리를 고치지 않음)
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from core.components import COMPONENT_CATALOG, generate_component_data
+from core.diagram_model import DiagramModel
+from core.excel_parser import ExcelParser
+from core.layout_engine import LayoutEngine
+from core.drawio_generator import DrawioGenerator
+from core.pipeline import get_pipeline_version
+from core.templates import TemplateAssetStore, get_templates_dir, get_template_store
+
+# 팩 파일 형식 버전 (구조가 바뀌면 올림)
+PACK_FORMAT = 2
+PACK_FILE_NAME = 'template_pack.json'
+
+
+def get_pack_path() -> Path:
+    """기본 팩 파일 경로"""
+    return get_templates_dir() / PACK_FILE_NAME
+
+
+def _hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _compile(data: Dict[str, Any], source_hash: str, diagram_name: str) -> Dict[str, Any]:
+    """파싱된 데이터 → 팩 항목 (일반/압축 XML)"""
+    positions = LayoutEngine().calculate_positions(data)
+    generator = DrawioGenerator()
+    return {
+        'source_hash': source_hash,
+        'diagram_name': diagram_name,
+        'xml': generator.generate_xml(data, positions),
+        'xml_compressed': generator.generate_xml(data, positions, compressed=True),
+    }
+
+
+def compile_template(excel_bytes: bytes) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    템플릿 엑셀 → 팩 항목
+
+    Returns:
+        (항목, 파싱 오류 목록)
+    """
+    parser = ExcelParser(backend='openpyxl')
+    data = parser.parse_to_dict(parser.read_excel(io.BytesIO(excel_bytes)))
+    diagram_name = data.get('config', {}).get('다이어그램명', 'diagram')
+    return _compile(data, _hash_bytes(excel_bytes), diagram_name), parser.errors
+
+
+def component_source(component_id: str) -> Dict[str, Any]:
+    """컴포넌트 데이터 (카탈로그 크기를 캔버스로 사용)"""
+    data = generate_component_data(component_id)
+    meta = COMPONENT_CATALOG[component_id]
+    data['config']['캔버스너비'] = meta['width']
+    data['config']['캔버스높이'] = meta['height']
+    return data
+
+
+def _component_hash(data: Dict[str, Any]) -> str:
+    return _hash_bytes(json.dumps(data, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+
+
+def compile_component(component_id: str) -> Dict[str, Any]:
+    """컴포넌트 → 팩 항목"""
+    data = component_source(component_id)
+    return _compile(data, _component_hash(data), COMPONENT_CATALOG[component_id]['name'])
+
+
+class TemplatePack:
+    """
+    템플릿 팩 조회
+
+    - 팩 파일은 처음 조회할 때 한 번 읽음 (형식/파이프라인 버전이 다르면 빈 팩으로 시작)
+    - 조회할 때마다 원본 해시를 비교해 바뀐 항목만 메모리에서 다시 만듦 (파일 저장은 save 호출 시에만)
+    - 파싱 오류가 있는 템플릿은 팩에 넣지 않고 ValueError
+    - 원본 엑셀 바이트와 해시는 TemplateAssetStore 단위로 재사용 (파일이 안 바뀌면 다시 해시하지 않음)
+    """
+
+    def __init__(self, path: Optional[Path] = None, store: Optional[TemplateAssetStore] = None):
+        self.path = Path(path) if path else get_pack_path()
+        self.store = store or get_template_store()
+        self.rebuilt: List[str] = []
+        self._pack: Optional[Dict[str, Any]] = None
+        self._source_hashes: Dict[str, Tuple[bytes, str]] = {}
+        self._component_hashes: Dict[str, str] = {}
+        self._component_models: Dict[str, Tuple[Dict[str, Any], DiagramModel]] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def empty() -> Dict[str, Any]:
+        return {
+            'format': PACK_FORMAT,
+            'pipeline_version': get_pipeline_version(),
+            'templates': {},
+            'components': {},
+        }
+
+    def _load(self) -> Dict[str, Any]:
+        if self._pack is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    pack = json.load(f)
+            except (OSError, ValueError):
+                pack = None
+
+            if (not isinstance(pack, dict) or pack.get('format') != PACK_FORMAT
+                    or pack.get('pipeline_version') != get_pipeline_version()):
+                pack = self.empty()
+            self._pack = pack
+        return self._pack
+
+    def _template_hash(self, template_id: str) -> str:
+        excel_bytes = self.store.get_bytes(template_id)
+        cached = self._source_hashes.get(template_id)
+        if cached is None or cached[0] is not excel_bytes:
+            cached = self._source_hashes[template_id] = (excel_bytes, _hash_bytes(excel_bytes))
+        return cached[1]
+
+    def template_entry(self, template_id: str) -> Dict[str, Any]:
+        """
+        최신 템플릿 항목 (원본이 바뀌었으면 다시 만듦)
+
+        Raises:
+            ValueError: 템플릿 ID가 존재하지 않거나 엑셀 파싱 오류가 있을 때
+            FileNotFoundError: 엑셀 파일이 없을 때
+        """
+        with self._lock:
+            source_hash = self._template_hash(template_id)
+            entries = self._load()['templates']
+            entry = entries.get(template_id)
+            if entry is None or entry.get('source_hash') != source_hash:
+                entry, errors = compile_template(self.store.get_bytes(template_id))
+                if errors:
+                    raise ValueError(f"템플릿 '{template_id}' 파싱 오류: " + '; '.join(errors))
+                entries[template_id] = entry
+                self.rebuilt.append(template_id)
+            return entry
+
+    def component_entry(self, component_id: str) -> Dict[str, Any]:
+        """
+        최신 컴포넌트 항목
+
+        Raises:
+            ValueError: 컴포넌트 ID가 존재하지 않을 때
+        """
+        if component_id not in COMPONENT_CATALOG:
+            raise ValueError(f"Unknown component: {component_id}")
+
+        with self._lock:
+            source_hash = self._component_hashes.get(component_id)
+            if source_hash is None:
+                source_hash = self._component_hashes[component_id] = _component_hash(component_source(component_id))
+
+            entries = self._load()['components']
+            entry = entries.get(component_id)
+            if entry is None or entry.get('source_hash') != source_hash:
+                entry = entries[component_id] = compile_component(component_id)
+                self.rebuilt.append(component_id)
+            return entry
+
+    def template_xml(self, template_id: str, compressed: bool = False) -> Tuple[str, str]:
+        """템플릿 (xml_content, diagram_name)"""
+        entry = self.template_entry(template_id)
+        return entry['xml_compressed' if compressed else 'xml'], entry['diagram_name']
+
+    def component_xml(self, component_id: str, compressed: bool = False) -> str:
+        """컴포넌트 XML"""
+        return self.component_entry(component_id)['xml_compressed' if compressed else 'xml']
+
+    def component_model(self, component_id: str) -> DiagramModel:
+        """
+        컴포넌트 모델 (항목이 그대로면 한 번 읽은 모델을 재사용)
+
+        병합(MergeDocument.append)은 셀을 복사해 쓰므로 반환된 모델을 수정하지 말 것
+        """
+        entry = self.component_entry(component_id)
+        with self._lock:
+            cached = self._component_models.get(component_id)
+            if cached is None or cached[0] is not entry:
+                cached = self._component_models[component_id] = (entry, DiagramModel.from_xml(entry['xml']))
+            return cached[1]
+
+    def build(self, force: bool = False) -> List[str]:
+        """
+        사용 가능한 모든 템플릿/컴포넌트를 최신으로 맞춤
+
+        Args:
+            force: True면 바뀌지 않은 항목도 다시 만듦
+
+        Returns:
+            다시 만든 항목 ID 목록
+
+        Raises:
+            ValueError: 파싱 오류가 있는 템플릿이 있을 때
+        """
+        with self._lock:
+            if force:
+                self._pack = self.empty()
+            start = len(self.rebuilt)
+            for template_id in self.store.available():
+                self.template_entry(template_id)
+            for component_id in COMPONENT_CATALOG:
+                self.component_entry(component_id)
+            return self.rebuilt[start:]
+
+    def save(self):
+        """
+        팩 파일 저장 (빌드 스크립트용 - 앱은 호출하지 않음)
+
+        Raises:
+            OSError: 파일을 쓸 수 없을 때
+        """
+        with self._lock:
+            pack = self._load()
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(pack, f, ensure_ascii=False, separators=(',', ':'))
+                os.replace(tmp_path, self.path)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+
+
+_default_pack = None
+_default_pack_lock = threading.Lock()
+
+
+def get_template_pack() -> TemplatePack:
+    """프로세스 공용 템플릿 팩"""
+    global _default_pack
+    with _default_pack_lock:
+        if _default_pack is None:
+            _default_pack = TemplatePack()
+        return _default_pack
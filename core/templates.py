@@ -3,8 +3,10 @@ AutoArchitect - 템플릿 관리
 엑셀 파일 기반 템플릿 카탈로그
 """
 
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
 
 # ==================== 템플릿 카탈로그 ====================
@@ -82,9 +84,99 @@ def get_template_list() -> List[Dict[str, Any]]:
     ]
 
 
+class TemplateAssetStore:
+    """
+    템플릿 엑셀 바이트 저장소 (프로세스당 한 번 읽기)
+
+    - 파일 바이트는 처음 요청될 때 읽고 (mtime, 크기)가 바뀌면 다시 읽음
+    - 반환하는 bytes는 불변이므로 모든 세션이 같은 객체를 공유
+    - 사용 가능 템플릿 목록은 디렉토리 mtime이 바뀔 때만 다시 계산
+      (mtime이 방금 전이면 같은 시각에 또 바뀌었을 수 있으므로 캐시를 믿지 않음)
+    """
+
+    # 이 시간(초) 안에 바뀐 디렉토리 mtime은 믿지 않음 (파일시스템 시각 단위 대비)
+    RACY_SECONDS = 2
+
+    def __init__(self, templates_dir: Optional[Path] = None, catalog: Optional[Dict[str, Dict]] = None):
+        self.templates_dir = Path(templates_dir) if templates_dir else get_templates_dir()
+        self.catalog = TEMPLATE_CATALOG if catalog is None else catalog
+        self.reads = 0
+        self._entries: Dict[str, Tuple[int, int, bytes]] = {}  # ID → (mtime_ns, 크기, 바이트)
+        self._available: Optional[Tuple[int, List[str]]] = None  # (디렉토리 mtime_ns, ID 목록)
+        self._lock = threading.Lock()
+
+    def path(self, template_id: str) -> Path:
+        """템플릿 파일 경로"""
+        if template_id not in self.catalog:
+            raise ValueError(f"Unknown template: {template_id}")
+        return self.templates_dir / self.catalog[template_id]['file']
+
+    def get_bytes(self, template_id: str) -> bytes:
+        """
+        템플릿 엑셀 바이트 (변경이 없으면 보관된 바이트)
+
+        Raises:
+            ValueError: 템플릿 ID가 존재하지 않을 때
+            FileNotFoundError: 엑셀 파일이 없을 때
+        """
+        file_path = self.path(template_id)
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            with self._lock:
+                self._entries.pop(template_id, None)
+            raise FileNotFoundError(f"Template file not found: {file_path}")
+
+        with self._lock:
+            entry = self._entries.get(template_id)
+            if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                return entry[2]
+
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            self.reads += 1
+            self._entries[template_id] = (stat.st_mtime_ns, stat.st_size, data)
+            return data
+
+    def exists(self, template_id: str) -> bool:
+        """템플릿 파일 존재 여부"""
+        return template_id in self.available()
+
+    def available(self) -> List[str]:
+        """실제 파일이 존재하는 템플릿 ID 목록 (카탈로그 순서)"""
+        try:
+            dir_mtime = self.templates_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            return []
+
+        with self._lock:
+            racy = time.time_ns() - dir_mtime < self.RACY_SECONDS * 1_000_000_000
+            if racy or self._available is None or self._available[0] != dir_mtime:
+                found = [
+                    tid for tid, tdata in self.catalog.items()
+                    if (self.templates_dir / tdata['file']).exists()
+                ]
+                self._available = (dir_mtime, found)
+            return list(self._available[1])
+
+    def clear(self):
+        """보관된 바이트/목록 비우기"""
+        with self._lock:
+            self._entries.clear()
+            self._available = None
+
+
+_template_store = TemplateAssetStore()
+
+
+def get_template_store() -> TemplateAssetStore:
+    """프로세스 공용 템플릿 저장소"""
+    return _template_store
+
+
 def generate_template_excel(template_id: str) -> bytes:
     """
-    템플릿 ID로 엑셀 파일 바이트 반환
+    템플릿 ID로 엑셀 파일 바이트 반환 (공용 저장소에서 한 번만 읽음)
     
     Args:
         template_id: 템플릿 ID (예: 'aws_3tier')
@@ -96,17 +188,7 @@ def generate_template_excel(template_id: str) -> bytes:
         ValueError: 템플릿 ID가 존재하지 않을 때
         FileNotFoundError: 엑셀 파일이 없을 때
     """
-    if template_id not in TEMPLATE_CATALOG:
-        raise ValueError(f"Unknown template: {template_id}")
-    
-    template = TEMPLATE_CATALOG[template_id]
-    file_path = get_templates_dir() / template['file']
-    
-    if not file_path.exists():
-        raise FileNotFoundError(f"Template file not found: {file_path}")
-    
-    with open(file_path, 'rb') as f:
-        return f.read()
+    return _template_store.get_bytes(template_id)
 
 
 def get_template_path(template_id: str) -> Path:
@@ -119,16 +201,9 @@ def get_template_path(template_id: str) -> Path:
 
 def template_exists(template_id: str) -> bool:
     """템플릿 파일 존재 여부 확인"""
-    if template_id not in TEMPLATE_CATALOG:
-        return False
-    
-    file_path = get_templates_dir() / TEMPLATE_CATALOG[template_id]['file']
-    return file_path.exists()
+    return _template_store.exists(template_id)
 
 
 def get_available_templates() -> List[str]:
     """실제 파일이 존재하는 템플릿 ID 목록"""
-    return [
-        tid for tid in TEMPLATE_CATALOG.keys()
-        if template_exists(tid)
-    ]
+    return _template_store.available()
@@ -0,0 +1,133 @@
+"""
+AutoArchitect - 업로드 세션
+업로드된 엑셀을 한 번만 읽고 파싱/검증/생성 결과를 보관
+"""
+
+import hashlib
+import io
+from typing import Dict, Any, Optional, Tuple
+
+from core.excel_parser import ExcelParser
+from core.instrumentation import Profiler, get_profiler
+from core.layout_engine import LayoutEngine
+from core.pipeline import PipelineCache, build_xml, compute_cache_key, get_pipeline_cache
+from utils.constants import WARNING_MESSAGES
+
+
+class UploadSession:
+    """
+    업로드 파일 1개에 대한 처리 결과 보관
+
+    - 바이트는 한 번만 읽음
+    - 파싱/검증/레이아웃/XML 생성은 처음 요청될 때 한 번만 실행
+    - profiler를 넘기면 각 단계를 처음 실행할 때의 시간/메모리 기록
+    """
+
+    def __init__(self, excel_bytes: bytes, file_name: str = '', cache: Optional[PipelineCache] = None,
+                 profiler: Optional[Profiler] = None):
+        self.excel_bytes = excel_bytes
+        self.file_name = file_name
+        self.file_hash = self.hash_bytes(excel_bytes)
+        self.cache = cache
+        self.profiler = profiler
+
+        self._parser = ExcelParser(backend='openpyxl')
+        self._sheets = None
+        self._validation = None
+        self._data = None
+        self._positions = None
+        self._layout_engine = None
+        self._xml = {}
+
+    @staticmethod
+    def hash_bytes(excel_bytes: bytes) -> str:
+        """업로드 파일 해시"""
+        return hashlib.sha256(excel_bytes).hexdigest()
+
+    @property
+    def sheets(self) -> Dict[str, Any]:
+        """시트별 행 레코드"""
+        if self._sheets is None:
+            with get_profiler(self.profiler).span('read'):
+                self._sheets = self._parser.read_excel(io.BytesIO(self.excel_bytes))
+        return self._sheets
+
+    def has_sheet(self, sheet_name: str) -> bool:
+        """시트 존재 여부"""
+        return sheet_name in self.sheets
+
+    @property
+    def validation(self) -> Dict[str, Any]:
+        """검증 결과 (유효하면 레이아웃 경고/연결선 교차 경고 포함)"""
+        if self._validation is None:
+            sheets = self.sheets
+            with get_profiler(self.profiler).span('validate'):
+                validation = self._parser.validate_data(sheets)
+            if validation['is_valid']:
+                validation = dict(validation, warnings=validation['warnings'] + self._layout_warnings())
+            self._validation = validation
+        return self._validation
+
+    def _layout_warnings(self) -> list:
+        """레이아웃 계산 중 나온 경고 + 겹침/벗어남 + 예상 연결선 교차"""
+        positions = self.positions
+        warnings = list(self._layout_engine.warnings)
+        warnings += self._layout_engine.check_geometry(self.data, positions)
+
+        crossings = self._layout_engine.detect_crossings(positions, self.data.get('connections', []))
+        if crossings:
+            warnings.append(WARNING_MESSAGES['crossing_expected'].format(count=crossings))
+        return warnings
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """parse_to_dict 결과"""
+        if self._data is None:
+            sheets = self.sheets
+            with get_profiler(self.profiler).span('parse'):
+                self._data = self._parser.parse_to_dict(sheets)
+        return self._data
+
+    @property
+    def positions(self) -> Dict[str, Dict]:
+        """레이아웃 계산 결과"""
+        if self._positions is None:
+            data = self.data
+            profiler = get_profiler(self.profiler)
+            with profiler.span('layout'):
+                self._layout_engine = LayoutEngine(profiler=profiler)
+                self._positions = self._layout_engine.calculate_positions(data)
+        return self._positions
+
+    @property
+    def diagram_name(self) -> str:
+        """다이어그램명"""
+        return self.data.get('config', {}).get('다이어그램명', 'diagram')
+
+    def generate(self, compressed: bool = False) -> Tuple[str, str]:
+        """
+        XML 생성 (세션 및 파이프라인 캐시 사용)
+
+        Args:
+            compressed: True면 draw.io 압축 형식으로 생성
+
+        Returns:
+            (xml_content, diagram_name)
+        """
+        if compressed not in self._xml:
+            profiler = get_profiler(self.profiler)
+            cache = self.cache if self.cache is not None else get_pipeline_cache()
+            key = compute_cache_key(self.excel_bytes, compressed)
+
+            result = cache.get(key)
+            if result is None:
+                profiler.count('cache.misses')
+                result = (build_xml(self.data, self.positions, compressed=compressed, profiler=self.profiler),
+                          self.diagram_name)
+                if self.validation['is_valid']:
+                    cache.put(key, *result)
+            else:
+                profiler.count('cache.hits')
+            self._xml[compressed] = result
+
+        return self._xml[compressed]
@@ -6,11 +6,16 @@ Draw.io XML을 엑셀 파일로 역변환
 import xml.etree.ElementTree as ET
 import pandas as pd
 import io
-import re
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Mapping, Optional
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
 
+from core.diagram_model import CELL_BOX, CELL_COMPONENT, CELL_HEADER, CELL_LAYER, Cell, DiagramModel
+from core.drawio_generator import DrawioGenerator
+from core.drawio_style import parse_style
+from core.spatial_index import SpatialIndex
+from utils.constants import WARNING_MESSAGES
+
 
 # 색상 역매핑 (HEX → 한글)
 HEX_TO_COLOR = {
@@ -39,7 +44,6 @@ HEX_TO_BORDER = {
     '#000000': '검정',
 }
 
-
 class XmlToExcelConverter:
     """Draw.io XML을 엑셀로 변환"""
     
@@ -49,6 +53,7 @@ class XmlToExcelConverter:
         self.canvas_width = 1400
         self.canvas_height = 900
         self.diagram_name = 'diagram'
+        self.warnings: List[str] = []
     
     def convert(self, xml_content: str) -> bytes:
         """
@@ -62,64 +67,106 @@ class XmlToExcelConverter:
         """
         # XML 파싱
         self._parse_xml(xml_content)
-        
+        return self._convert()
+
+    def convert_model(self, model: DiagramModel) -> bytes:
+        """
+        이미 읽어 둔 다이어그램 모델을 엑셀 바이트로 변환 (XML을 다시 파싱하지 않음)
+
+        Args:
+            model: 생성기 / 병합 문서의 DiagramModel
+
+        Returns:
+            엑셀 파일 바이트
+        """
+        self._load_model(model)
+        return self._convert()
+
+    def _convert(self) -> bytes:
         # 데이터 추출
         config_data = self._extract_config()
-        layers_data, boxes_data = self._extract_layers_and_boxes()
+        layers_data, boxes_data, components_data = self._extract_layers_and_boxes()
         connections_data = self._extract_connections()
         
         # 엑셀 생성
-        return self._create_excel(config_data, layers_data, boxes_data, connections_data)
+        return self._create_excel(config_data, layers_data, boxes_data, connections_data, components_data)
     
     def _parse_xml(self, xml_content: str):
         """XML 파싱"""
         try:
-            root = ET.fromstring(xml_content)
-            
-            # 다이어그램 이름
-            diagram = root.find('.//diagram')
-            if diagram is not None:
-                self.diagram_name = diagram.get('name', 'diagram')
-            
-            # 캔버스 크기
-            graph_model = root.find('.//mxGraphModel')
-            if graph_model is not None:
-                self.canvas_width = int(graph_model.get('pageWidth', 1400))
-                self.canvas_height = int(graph_model.get('pageHeight', 900))
-            
-            # 모든 mxCell 수집
-            graph_root = root.find('.//root')
-            if graph_root is not None:
-                for cell in graph_root.findall('mxCell'):
-                    cell_id = cell.get('id', '')
-                    if cell_id not in ['0', '1']:  # 기본 셀 제외
-                        cell_data = self._parse_cell(cell)
-                        self.cells.append(cell_data)
-                        self.id_to_cell[cell_id] = cell_data
-        
-        except ET.ParseError as e:
+            self._load_model(DiagramModel.from_xml(xml_content))
+        except (ET.ParseError, ValueError) as e:
             print(f"XML 파싱 오류: {e}")
+
+    def _load_model(self, model: DiagramModel):
+        """
+        모델의 다이어그램 이름 / 캔버스 크기 / 셀 수집
+
+        연결선 안에 든 정점(draw.io 연결선 라벨)은 셀로 수집하지 않고 그 연결선의 라벨로 합침
+        """
+        self.diagram_name = model.name
+        self.canvas_width = model.page_width
+        self.canvas_height = model.page_height
+        edge_labels: Dict[str, List[str]] = {}
+        for cell in model:
+            parent = model.get(cell.parent) if cell.parent is not None else None
+            if cell.vertex and parent is not None and parent.edge:
+                if cell.value:
+                    edge_labels.setdefault(parent.id, []).append(cell.value)
+                continue
+            cell_data = self._parse_cell(cell)
+            self.cells.append(cell_data)
+            self.id_to_cell[cell.id] = cell_data
+
+        for edge_id, labels in edge_labels.items():
+            edge = self.id_to_cell[edge_id]
+            edge['value'] = ' / '.join([edge['value']] + labels if edge['value'] else labels)
+        self._resolve_absolute_geometry()
     
-    def _parse_cell(self, cell: ET.Element) -> Dict[str, Any]:
-        """개별 셀 파싱"""
+    def _resolve_absolute_geometry(self):
+        """다른 vertex 안에 든 셀(parent 속성)의 상대 좌표를 캔버스 기준으로 변환"""
+        def vertex_parent(cell):
+            parent = self.id_to_cell.get(cell['parent'])
+            return parent if parent is not None and parent['vertex'] else None
+
+        resolved = set()
+        for cell in self.cells:
+            chain = []
+            chain_ids = set()
+            current = cell
+            while current is not None and current['id'] not in resolved and current['id'] not in chain_ids:
+                chain.append(current)
+                chain_ids.add(current['id'])
+                current = vertex_parent(current)
+
+            # 바깥쪽부터 부모 좌표 더하기 (순환하는 부모는 무시)
+            for node in reversed(chain):
+                parent = vertex_parent(node)
+                if node['vertex'] and parent is not None and parent['id'] in resolved:
+                    node['x'] += parent['x']
+                    node['y'] += parent['y']
+                resolved.add(node['id'])
+
+    def _parse_cell(self, cell: Cell) -> Dict[str, Any]:
+        """개별 셀 → 작업용 dict (좌표는 이후 절대 좌표로 바뀌므로 모델 셀을 직접 쓰지 않음)"""
         cell_data = {
-            'id': cell.get('id', ''),
-            'value': cell.get('value', ''),
-            'parent': cell.get('parent', '1'),
-            'vertex': cell.get('vertex') == '1',
-            'edge': cell.get('edge') == '1',
-            'source': cell.get('source'),
-            'target': cell.get('target'),
-            'style': cell.get('style', ''),
+            'id': cell.id,
+            'value': cell.value or '',
+            'parent': cell.parent if cell.parent is not None else '1',
+            'vertex': cell.vertex,
+            'edge': cell.edge,
+            'source': cell.source,
+            'target': cell.target,
+            'style': cell.style or '',
         }
+        cell_data['styles'] = parse_style(cell_data['style'])
         
-        # geometry 파싱
-        geom = cell.find('mxGeometry')
-        if geom is not None:
-            cell_data['x'] = float(geom.get('x', 0))
-            cell_data['y'] = float(geom.get('y', 0))
-            cell_data['width'] = float(geom.get('width', 100))
-            cell_data['height'] = float(geom.get('height', 50))
+        # geometry (없으면 기본 크기)
+        if cell.has_geometry:
+            cell_data['x'] = cell.x
+            cell_data['y'] = cell.y
+            cell_data['width'] = cell.width if cell.width is not None else 100
+            cell_data['height'] = cell.height if cell.height is not None else 50
         else:
             cell_data['x'] = 0
             cell_data['y'] = 0
@@ -127,26 +174,28 @@ class XmlToExcelConverter:
             cell_data['height'] = 50
         
         # 스타일 파싱
-        cell_data['bg_color'] = self._extract_color_from_style(cell_data['style'], 'fillColor')
-        cell_data['border_color'] = self._extract_color_from_style(cell_data['style'], 'strokeColor')
-        cell_data['font_size'] = self._extract_font_size(cell_data['style'])
+        cell_data['bg_color'] = self._extract_color_from_style(cell_data['styles'], 'fillColor')
+        cell_data['border_color'] = self._extract_color_from_style(cell_data['styles'], 'strokeColor')
+        cell_data['font_size'] = self._extract_font_size(cell_data['styles'])
         
         return cell_data
     
-    def _extract_color_from_style(self, style: str, key: str) -> str:
+    def _extract_color_from_style(self, styles: Mapping[str, str], key: str) -> str:
         """스타일에서 색상 추출"""
-        match = re.search(rf'{key}=([^;]+)', style)
-        if match:
-            hex_color = match.group(1).upper()
+        value = styles.get(key)
+        if value:
+            hex_color = value.upper()
             if not hex_color.startswith('#'):
                 hex_color = '#' + hex_color
             return HEX_TO_COLOR.get(hex_color, HEX_TO_BORDER.get(hex_color, '흰색'))
         return '흰색' if key == 'fillColor' else '회색'
     
-    def _extract_font_size(self, style: str) -> int:
+    def _extract_font_size(self, styles: Mapping[str, str]) -> int:
         """스타일에서 폰트 크기 추출"""
-        match = re.search(r'fontSize=(\d+)', style)
-        return int(match.group(1)) if match else 11
+        try:
+            return int(float(styles['fontSize']))
+        except (KeyError, ValueError):
+            return 11
     
     def _extract_config(self) -> Dict[str, Any]:
         """CONFIG 데이터 추출"""
@@ -155,105 +204,167 @@ class XmlToExcelConverter:
             '값': [self.diagram_name, self.canvas_width, self.canvas_height]
         }
     
+    def _classify(self, cell: Dict[str, Any]) -> str:
+        """
+        셀 종류 판단 (DrawioGenerator 출력 기준)
+
+        - CELL_HEADER: 'text;' 스타일 (레이어/박스 이름 셀)
+        - CELL_LAYER: parent='1'이고 캔버스 너비의 80% 이상
+        - CELL_COMPONENT: 원통(cylinder3) 또는 값이 있는 도형
+        - CELL_BOX: 나머지 (값 없는 사각형)
+        """
+        styles = cell['styles']
+        if 'text' in styles:
+            return CELL_HEADER
+        if cell['parent'] == '1' and cell['width'] >= self.canvas_width * 0.8:
+            return CELL_LAYER
+        return self._shape_kind(cell)
+
+    @staticmethod
+    def _shape_kind(cell: Dict[str, Any]) -> str:
+        """레이어가 아닌 도형 → CELL_COMPONENT(원통 또는 값이 있는 도형) / CELL_BOX"""
+        if cell['styles'].get('shape', '').startswith('cylinder') or cell['value']:
+            return CELL_COMPONENT
+        return CELL_BOX
+
+    @staticmethod
+    def _component_type(cell: Dict[str, Any]) -> str:
+        """도형 스타일 → 컴포넌트 타입"""
+        styles = cell['styles']
+        if styles.get('shape', '').startswith('cylinder'):
+            return '데이터베이스'
+        if styles.get('rounded') == '1':
+            return '서비스'
+        return '단일박스'
+
     def _extract_layers_and_boxes(self) -> tuple:
-        """레이어와 박스 분리 추출"""
-        # parent='1'인 큰 요소들을 레이어로 간주
-        # 나머지는 박스로 처리
-        
+        """
+        레이어 / 박스 / 컴포넌트 분리 추출
+
+        - 헤더(이름) 셀은 자신을 감싸는 레이어/박스와 짝지어 이름으로 쓰고 행에서 제외
+        - 부모는 _infer_parents 결과 (감싸는 셀이 없으면 부모 없음)
+        - 부모 후보가 서로 겹치기만 하고 포함 관계가 아니면 self.warnings에 경고 (새 ID로 표시)
+        - 바깥 셀부터 처리하므로 부모 ID는 자식보다 먼저 정해짐
+
+        Returns:
+            (layers_data, boxes_data, components_data)
+        """
+        vertices = [cell for cell in self.cells if cell['vertex']]
+        # (넓이, -문서 순서)가 클수록 바깥쪽 셀
+        rank = {cell['id']: (cell['width'] * cell['height'], -order) for order, cell in enumerate(vertices)}
+        # 정수 좌표 반올림 오차 허용
+        index = SpatialIndex({cell['id']: cell for cell in vertices}, tolerance=1)
+        kind = {cell['id']: self._classify(cell) for cell in vertices}
+
+        # 다른 셀 안에 든 넓은 셀은 레이어가 아니라 박스/컴포넌트
+        for cell in vertices:
+            cell_id = cell['id']
+            if kind[cell_id] == CELL_LAYER and any(
+                    kind[other] != CELL_HEADER and rank[other] > rank[cell_id] for other in index.containers(cell_id)):
+                kind[cell_id] = self._shape_kind(cell)
+
+        names, headers = self._pair_headers(vertices, kind, rank, index)
+        vertices = [cell for cell in vertices if cell['id'] not in headers]
+        parents, ties = self._infer_parents(vertices, rank, index)
+
+        # 짝이 없는 헤더(자유 텍스트)는 박스로 유지
+        for cell in vertices:
+            if kind[cell['id']] == CELL_HEADER:
+                kind[cell['id']] = CELL_BOX
+
+        def name_of(cell, default):
+            header = names.get(cell['id'])
+            return (header['value'] if header is not None else cell['value']) or default
+
+        # 1단계: 레이어 (Y 좌표 순)
+        layer_cells = sorted((cell for cell in vertices if kind[cell['id']] == CELL_LAYER), key=lambda x: x['y'])
+        total_height = sum(c['height'] for c in layer_cells) or self.canvas_height
+
         layers = []
-        boxes = []
-        
-        # 1단계: 레이어 후보 식별 (parent='1'이고 너비가 큰 것)
-        layer_candidates = []
-        for cell in self.cells:
-            if cell['vertex'] and cell['parent'] == '1':
-                # 캔버스 너비의 80% 이상이면 레이어로 간주
-                if cell['width'] >= self.canvas_width * 0.8:
-                    layer_candidates.append(cell)
-        
-        # Y 좌표로 정렬
-        layer_candidates.sort(key=lambda x: x['y'])
-        
-        # 레이어 데이터 생성
-        total_height = sum(c['height'] for c in layer_candidates) or self.canvas_height
-        
-        for i, cell in enumerate(layer_candidates):
-            layer_id = f"L{i+1}"
-            height_percent = round((cell['height'] / total_height) * 100, 1)
-            
+        for i, cell in enumerate(layer_cells):
             layers.append({
                 'original_id': cell['id'],
-                'layer_id': layer_id,
-                'name': cell['value'] or f'Layer {i+1}',
+                'layer_id': f"L{i+1}",
+                'name': name_of(cell, f'Layer {i+1}'),
                 'order': i + 1,
                 'bg_color': cell['bg_color'],
-                'height_percent': height_percent,
-                'y': cell['y'],
-                'height': cell['height'],
+                'height_percent': round((cell['height'] / total_height) * 100, 1),
             })
-        
+
         # ID 매핑 (원본 → 새 ID)
         id_mapping = {layer['original_id']: layer['layer_id'] for layer in layers}
-        
-        # 2단계: 박스 추출 (레이어가 아닌 vertex)
-        box_index = 1
-        for cell in self.cells:
-            if cell['vertex'] and cell['id'] not in id_mapping:
-                # 부모 ID 변환
-                parent_id = cell['parent']
-                if parent_id in id_mapping:
-                    parent_id = id_mapping[parent_id]
-                elif parent_id == '1':
-                    # 레이어 없이 직접 배치된 경우
-                    parent_id = 'L1' if layers else None
-                else:
-                    # 다른 박스의 자식
-                    # 이미 처리된 박스의 ID로 변환 필요
-                    pass
-                
-                # 부모 레이어 찾기
-                parent_layer = None
-                for layer in layers:
-                    if layer['layer_id'] == parent_id:
-                        parent_layer = layer
-                        break
-                
-                # Y% 계산
-                if parent_layer:
-                    y_percent = ((cell['y'] - parent_layer['y']) / parent_layer['height']) * 100
-                    height_percent = (cell['height'] / parent_layer['height']) * 100
-                else:
-                    y_percent = (cell['y'] / self.canvas_height) * 100
-                    height_percent = (cell['height'] / self.canvas_height) * 100
-                
-                box_id = f"B{box_index}"
-                boxes.append({
-                    'original_id': cell['id'],
-                    'box_id': box_id,
-                    'name': cell['value'] or f'Box {box_index}',
-                    'parent_id': parent_id,
-                    'row_number': 1,  # 기본값
-                    'y_percent': round(y_percent, 1),
-                    'height_percent': round(height_percent, 1),
-                    'bg_color': cell['bg_color'],
-                    'border_color': cell['border_color'],
-                    'font_size': cell['font_size'],
-                })
-                
-                id_mapping[cell['id']] = box_id
-                box_index += 1
-        
-        # 행번호 계산 (같은 Y 좌표면 같은 행)
+
+        # 2단계: 박스/컴포넌트 (바깥 → 안쪽, 같은 깊이는 위 → 아래, 왼쪽 → 오른쪽)
+        depth = self._depths(parents)
+        item_cells = [cell for cell in vertices if cell['id'] not in id_mapping]
+        item_cells.sort(key=lambda cell: (depth.get(cell['id'], 0), cell['y'], cell['x']))
+
+        boxes = []
+        components = []
+        for cell in item_cells:
+            parent_cell = self.id_to_cell.get(parents.get(cell['id']))
+
+            # Y%/높이%는 실제 부모 기준 (부모가 없으면 캔버스 기준)
+            if parent_cell is not None and parent_cell['height'] > 0:
+                y_percent = ((cell['y'] - parent_cell['y']) / parent_cell['height']) * 100
+                height_percent = (cell['height'] / parent_cell['height']) * 100
+                parent_id = id_mapping.get(parent_cell['id'])
+            else:
+                y_percent = (cell['y'] / self.canvas_height) * 100
+                height_percent = (cell['height'] / self.canvas_height) * 100
+                parent_id = None
+
+            item = {
+                'parent_id': parent_id,
+                'row_number': 1,  # 기본값
+                'y_percent': round(y_percent, 1),
+                'height_percent': round(height_percent, 1),
+            }
+
+            if kind[cell['id']] == CELL_COMPONENT:
+                item_id = f"C{len(components) + 1}"
+                components.append(dict(
+                    item,
+                    id=item_id,
+                    name=cell['value'],
+                    font_size=cell['font_size'],
+                    type=self._component_type(cell),
+                ))
+            else:
+                item_id = f"B{len(boxes) + 1}"
+                header = names.get(cell['id'])
+                boxes.append(dict(
+                    item,
+                    id=item_id,
+                    name=name_of(cell, f'Box {len(boxes) + 1}'),
+                    bg_color=cell['bg_color'],
+                    border_color=cell['border_color'],
+                    font_size=header['font_size'] if header is not None else cell['font_size'],
+                ))
+
+            id_mapping[cell['id']] = item_id
+
+        self.warnings = [
+            WARNING_MESSAGES['ambiguous_parent'].format(
+                item_id=id_mapping[cell_id],
+                candidates=', '.join(id_mapping[other] for other in candidates),
+                parent_id=id_mapping[parents[cell_id]],
+            )
+            for cell_id, candidates in ties.items()
+        ]
+
+        # 헤더를 가리키는 연결은 짝지은 레이어/박스로
+        for header_id, owner in headers.items():
+            if owner in id_mapping:
+                id_mapping[header_id] = id_mapping[owner]
+
+        # 행번호 계산 (같은 Y 좌표면 같은 행, 박스/컴포넌트는 따로 배치되므로 따로 계산)
         self._calculate_row_numbers(boxes)
-        
-        # 부모 ID 최종 변환
-        for box in boxes:
-            if box['parent_id'] in id_mapping:
-                box['parent_id'] = id_mapping[box['parent_id']]
-        
+        self._calculate_row_numbers(components)
+
         # ID 매핑 저장 (연결선용)
         self.id_mapping = id_mapping
-        
+
         # 데이터프레임 형식으로 변환
         layers_data = {
             '레이어ID': [l['layer_id'] for l in layers],
@@ -262,9 +373,9 @@ class XmlToExcelConverter:
             '배경색': [l['bg_color'] for l in layers],
             '높이%': [l['height_percent'] for l in layers],
         }
-        
+
         boxes_data = {
-            '박스ID': [b['box_id'] for b in boxes],
+            '박스ID': [b['id'] for b in boxes],
             '박스명': [b['name'] for b in boxes],
             '부모ID': [b['parent_id'] for b in boxes],
             '행번호': [b['row_number'] for b in boxes],
@@ -274,9 +385,131 @@ class XmlToExcelConverter:
             '테두리색': [b['border_color'] for b in boxes],
             '폰트크기': [b['font_size'] for b in boxes],
         }
-        
-        return layers_data, boxes_data
-    
+
+        components_data = {
+            'ID': [c['id'] for c in components],
+            '컴포넌트명': [c['name'] for c in components],
+            '부모ID': [c['parent_id'] for c in components],
+            '행번호': [c['row_number'] for c in components],
+            'Y%': [c['y_percent'] for c in components],
+            '높이%': [c['height_percent'] for c in components],
+            '폰트크기': [c['font_size'] for c in components],
+            '타입': [c['type'] for c in components],
+        }
+
+        return layers_data, boxes_data, components_data
+
+    def _pair_headers(self, vertices: List[Dict[str, Any]], kind: Dict[str, str],
+                      rank: Dict[str, tuple], index: SpatialIndex) -> tuple:
+        """
+        헤더 셀과 이름 없는 레이어/박스 짝짓기
+
+        - 후보: 헤더 윗변을 감싸는 레이어/박스
+          (낮은 박스는 헤더가 아래로 넘치므로 헤더 전체 대신 윗변으로 판단)
+        - 헤더가 후보의 윗변에 붙어 있고 가로로 가운데 정렬(박스는 좌우 여백까지)된 짝을 먼저,
+          그다음 작은 후보 순으로 전체 짝을 한 번에 정함
+          (Y%=0 박스는 레이어와 윗변이 같아 레이어 헤더를 감싸므로 작은 셀 우선만으로는 뒤바뀜)
+
+        Returns:
+            (주인 ID → 헤더 셀, 헤더 ID → 주인 ID)
+        """
+        pairs = []
+        for order, cell in enumerate(vertices):
+            if kind[cell['id']] != CELL_HEADER:
+                continue
+
+            top_edge = (cell['x'], cell['y'], cell['x'] + cell['width'], cell['y'])
+            for other in index.containers(top_edge):
+                if kind[other] in (CELL_LAYER, CELL_BOX) and not self.id_to_cell[other]['value']:
+                    misfit = self._header_misfit(cell, self.id_to_cell[other], kind[other])
+                    pairs.append((misfit, rank[other], order, other, cell))
+
+        names = {}
+        headers = {}
+        for _, _, _, owner, cell in sorted(pairs, key=lambda pair: pair[:3]):
+            if owner not in names and cell['id'] not in headers:
+                names[owner] = cell
+                headers[cell['id']] = owner
+        return names, headers
+
+    @staticmethod
+    def _header_misfit(header: Dict[str, Any], owner: Dict[str, Any], owner_kind: str) -> int:
+        """
+        헤더가 주인 후보의 헤더 위치(DrawioGenerator 기준)에서 벗어난 정도 (0~2, 작을수록 잘 맞음)
+
+        - 윗변: 헤더 윗변이 후보 윗변에서 HEADER_TOP_MARGIN 이내
+        - 가로: 좌우 여백이 같고, 박스면 여백이 HEADER_SIDE_MARGIN 이내 (레이어 헤더는 폭 고정)
+        """
+        tolerance = 1  # 정수 좌표 반올림 오차
+        top_gap = header['y'] - owner['y']
+        left_gap = header['x'] - owner['x']
+        right_gap = (owner['x'] + owner['width']) - (header['x'] + header['width'])
+
+        misfit = 0
+        if not -tolerance <= top_gap <= DrawioGenerator.HEADER_TOP_MARGIN + tolerance:
+            misfit += 1
+        centered = abs(left_gap - right_gap) <= tolerance
+        if not centered or (owner_kind == CELL_BOX and left_gap > DrawioGenerator.HEADER_SIDE_MARGIN + tolerance):
+            misfit += 1
+        return misfit
+
+    def _infer_parents(self, vertices: List[Dict[str, Any]], rank: Dict[str, tuple],
+                       index: SpatialIndex) -> tuple:
+        """
+        셀 ID → 부모 셀 ID (vertices 안에서만 찾음)
+
+        - parent 속성이 다른 vertex를 가리키면 그대로 사용 (Draw.io 그룹/컨테이너)
+        - parent='1'이면 위치로 추론 (Draw.io 생성기는 모든 셀을 parent='1'로 기록)
+          - 자신을 감싸는 셀(공간 색인 조회) 중 가장 작은 셀이 부모
+          - 크기가 같으면 문서에서 먼저 나온 셀이 부모 (rank = (넓이, -문서 순서))
+          - 감싸는 셀 중 가장 안쪽 셀이 여럿이면(서로 겹치기만 함) 가장 작은 셀을 쓰되 모호한 것으로 기록
+
+        Returns:
+            (셀 ID → 부모 셀 ID, 모호한 셀 ID → 가장 안쪽 후보 목록 (작은 순))
+        """
+        members = {cell['id'] for cell in vertices}
+
+        parents = {}
+        ties = {}
+        for cell in vertices:
+            cell_id = cell['id']
+            explicit = self.id_to_cell.get(cell['parent'])
+            if explicit is not None and explicit['id'] in members:
+                parents[cell_id] = explicit['id']
+                continue
+
+            outer = sorted((other for other in index.containers(cell_id)
+                            if other in members and rank[other] > rank[cell_id]), key=rank.__getitem__)
+            if not outer:
+                continue
+            parents[cell_id] = outer[0]
+
+            # 부모를 감싸지 않는 후보가 있으면 가장 안쪽 후보가 여럿 (같은 크기로 겹치면 포함으로 봄)
+            if len(outer) > 1:
+                around_parent = set(index.containers(outer[0]))
+                rivals = [outer[0]] + [other for other in outer[1:] if other not in around_parent]
+                if len(rivals) > 1:
+                    ties[cell_id] = [
+                        other for other in rivals
+                        if not any(rank[inner] < rank[other] and other in index.containers(inner) for inner in rivals)
+                    ]
+        return parents, ties
+
+    @staticmethod
+    def _depths(parents: Dict[str, str]) -> Dict[str, int]:
+        """셀 ID → 중첩 깊이 (부모가 없으면 0, 순환은 끊음)"""
+        depth = {}
+        for cell_id in parents.keys() | set(parents.values()):
+            chain = []
+            current = cell_id
+            while current is not None and current not in depth and current not in chain:
+                chain.append(current)
+                current = parents.get(current)
+            base = depth.get(current, -1) if current not in chain else -1
+            for offset, node in enumerate(reversed(chain), start=1):
+                depth[node] = base + offset
+        return depth
+
     def _calculate_row_numbers(self, boxes: List[Dict]):
         """박스들의 행번호 계산 (비슷한 Y 좌표끼리 그룹화)"""
         # 부모별로 그룹화
@@ -327,18 +560,20 @@ class XmlToExcelConverter:
                     target_id = self.id_mapping.get(target, target)
                     
                     # 연결 타입 추론
-                    style = cell.get('style', '')
-                    if 'strokeWidth=3' in style:
+                    styles = cell['styles']
+                    thick = styles.get('strokeWidth') == '3'
+                    dashed = styles.get('dashed') == '1'
+                    if thick:
                         conn_type = '스트림'
-                    elif 'dashed=1' in style:
+                    elif dashed:
                         conn_type = '배치'
                     else:
                         conn_type = '데이터흐름'
                     
                     # 선 스타일
-                    if 'strokeWidth=3' in style:
+                    if thick:
                         line_style = '굵은실선'
-                    elif 'dashed=1' in style:
+                    elif dashed:
                         line_style = '점선'
                     else:
                         line_style = '실선'
@@ -351,8 +586,9 @@ class XmlToExcelConverter:
         
         return connections
     
-    def _create_excel(self, config_data: Dict, layers_data: Dict, 
-                      boxes_data: Dict, connections_data: Dict) -> bytes:
+    def _create_excel(self, config_data: Dict, layers_data: Dict,
+                      boxes_data: Dict, connections_data: Dict,
+                      components_data: Optional[Dict] = None) -> bytes:
         """엑셀 파일 생성"""
         output = io.BytesIO()
         
@@ -372,6 +608,11 @@ class XmlToExcelConverter:
                 df_boxes = pd.DataFrame(boxes_data)
                 df_boxes.to_excel(writer, sheet_name='BOXES', index=False)
             
+            # COMPONENTS 시트
+            if components_data and components_data['ID']:
+                df_components = pd.DataFrame(components_data)
+                df_components.to_excel(writer, sheet_name='COMPONENTS', index=False)
+            
             # CONNECTIONS 시트
             if connections_data['출발ID']:
                 df_connections = pd.DataFrame(connections_data)
@@ -380,15 +621,31 @@ class XmlToExcelConverter:
         return output.getvalue()
 
 
-def xml_to_excel(xml_content: str) -> bytes:
+def xml_to_excel(xml_content: str, converter: Optional[XmlToExcelConverter] = None) -> bytes:
     """
     편의 함수: XML을 엑셀로 변환
     
     Args:
         xml_content: Draw.io XML 문자열
+        converter: 변환에 쓸 변환기 (변환 후 converter.warnings로 경고 확인)
     
     Returns:
         엑셀 파일 바이트
     """
-    converter = XmlToExcelConverter()
+    converter = converter or XmlToExcelConverter()
     return converter.convert(xml_content)
+
+
+def model_to_excel(model: DiagramModel, converter: Optional[XmlToExcelConverter] = None) -> bytes:
+    """
+    편의 함수: 다이어그램 모델을 엑셀로 변환
+
+    Args:
+        model: DiagramModel (병합 문서 등에서 이미 읽어 둔 모델)
+        converter: 변환에 쓸 변환기 (변환 후 converter.warnings로 경고 확인)
+
+    Returns:
+        엑셀 파일 바이트
+    """
+    converter = converter or XmlToExcelConverter()
+    return converter.convert_model(model)
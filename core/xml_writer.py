@@ -0,0 +1,123 @@
+"""
+AutoArchitect - 스트리밍 XML 작성기
+ElementTree + minidom 왕복 없이 텍스트 스트림에 바로 기록
+"""
+
+import io
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, TextIO
+
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>'
+
+# 속성값 이스케이프 (줄바꿈/탭은 문자 참조로 보존)
+_ATTR_ESCAPES = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    '\n': '&#10;',
+    '\r': '&#13;',
+    '\t': '&#9;',
+})
+
+_TEXT_ESCAPES = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+})
+
+
+def escape_attr(value) -> str:
+    """속성값 이스케이프"""
+    return str(value).translate(_ATTR_ESCAPES)
+
+
+def escape_text(value) -> str:
+    """텍스트 노드 이스케이프"""
+    return str(value).translate(_TEXT_ESCAPES)
+
+
+def format_attrs(attrs: Dict[str, str]) -> str:
+    """속성 딕셔너리를 ' key="value"' 문자열로 변환 (입력 순서 유지)"""
+    return ''.join(f' {key}="{escape_attr(value)}"' for key, value in attrs.items())
+
+
+class XmlStreamWriter:
+    """
+    들여쓰기 지원 스트리밍 XML 작성기
+
+    - 요소를 만드는 즉시 스트림에 기록하므로 메모리는 트리 깊이만큼만 사용
+    - compact=True면 들여쓰기/줄바꿈 없이 기록
+    """
+
+    def __init__(self, stream: TextIO, indent: str = '  ', compact: bool = False):
+        self.stream = stream
+        self.indent = '' if compact else indent
+        self.newline = '' if compact else '\n'
+        self._stack: List[str] = []
+
+    def declaration(self):
+        """XML 선언 기록"""
+        self.stream.write(XML_DECLARATION + self.newline)
+
+    def start(self, tag: str, attrs: Optional[Dict[str, str]] = None):
+        """여는 태그"""
+        self.stream.write(f"{self._prefix()}<{tag}{format_attrs(attrs or {})}>{self.newline}")
+        self._stack.append(tag)
+
+    def end(self, tag: Optional[str] = None):
+        """닫는 태그"""
+        open_tag = self._stack.pop()
+        if tag is not None and tag != open_tag:
+            raise ValueError(f"닫는 태그 불일치: <{open_tag}> vs </{tag}>")
+        self.stream.write(f"{self._prefix()}</{open_tag}>{self.newline}")
+
+    def empty(self, tag: str, attrs: Optional[Dict[str, str]] = None):
+        """빈 요소 (<tag .../>)"""
+        self.stream.write(f"{self._prefix()}<{tag}{format_attrs(attrs or {})}/>{self.newline}")
+
+    def text_element(self, tag: str, text: str, attrs: Optional[Dict[str, str]] = None):
+        """텍스트만 가진 요소 (<tag ...>text</tag>)"""
+        self.stream.write(
+            f"{self._prefix()}<{tag}{format_attrs(attrs or {})}>{escape_text(text)}</{tag}>{self.newline}"
+        )
+
+    def element(self, elem: ET.Element):
+        """ElementTree 요소를 하위 요소까지 기록"""
+        attrs = dict(elem.attrib)
+        children = list(elem)
+        text = (elem.text or '').strip()
+
+        if not children and not text:
+            self.empty(elem.tag, attrs)
+        elif not children:
+            self.text_element(elem.tag, text, attrs)
+        else:
+            self.start(elem.tag, attrs)
+            for child in children:
+                self.element(child)
+            self.end(elem.tag)
+
+    def _prefix(self) -> str:
+        return self.indent * len(self._stack)
+
+
+def serialize_element(elem: ET.Element, compact: bool = False, declaration: bool = True) -> str:
+    """
+    ElementTree 요소를 문자열로 직렬화 (minidom 재파싱 없음)
+
+    Args:
+        elem: 루트 요소
+        compact: True면 들여쓰기 없이 출력
+        declaration: XML 선언 포함 여부
+
+    Returns:
+        XML 문자열
+    """
+    output = io.StringIO()
+    writer = XmlStreamWriter(output, compact=compact)
+    if declaration:
+        writer.declaration()
+    writer.element(elem)
+    return output.getvalue()
@@ -0,0 +1,299 @@
+"""
+AutoArchitect - 일괄 변환 CLI
+엑셀 파일들을 .drawio로 병렬 변환
+
+실행 예:
+    python -m scripts.batch_convert "proposals/**/*.xlsx" --workers 8
+    python -m scripts.batch_convert templates/*.xlsx --force --compressed
+    python -m scripts.batch_convert big.xlsx --force --profile-json profile.json
+"""
+
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+# 프로젝트 루트를 path에 추가 (python scripts/batch_convert.py 실행 지원)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.excel_parser import ExcelParser
+from core.instrumentation import Profiler, get_profiler
+from core.pipeline import build_xml, get_pipeline_version
+
+
+# 출력 파일과 같은 폴더에 저장되는 변환 기록
+MANIFEST_NAME = '.drawio_manifest.json'
+
+
+def convert_file(input_path: str, output_path: str, compressed: bool = False,
+                 profile: bool = False) -> Dict[str, Any]:
+    """
+    엑셀 1개를 .drawio로 변환 (작업 프로세스에서 실행)
+
+    Args:
+        profile: True면 단계별 시간/메모리를 결과의 'profile'에 포함
+
+    Returns:
+        변환 결과 (경로, 해시, 소요시간)
+
+    Raises:
+        ValueError: 엑셀 검증 실패
+    """
+    started = time.perf_counter()
+    profiler = Profiler(trace_memory=True) if profile else None
+    spans = get_profiler(profiler)
+
+    with spans.span('read'):
+        with open(input_path, 'rb') as f:
+            excel_bytes = f.read()
+
+        parser = ExcelParser(backend='openpyxl')
+        sheets = parser.read_excel(io.BytesIO(excel_bytes))
+
+    with spans.span('validate'):
+        validation = parser.validate_data(sheets)
+    if not validation['is_valid']:
+        raise ValueError(' / '.join(validation['errors']))
+
+    with spans.span('parse'):
+        data = parser.parse_to_dict(sheets)
+    xml_content = build_xml(data, compressed=compressed, profiler=profiler)
+
+    with spans.span('write'):
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(xml_content)
+
+    result = {
+        'input': input_path,
+        'output': output_path,
+        'sha256': hashlib.sha256(excel_bytes).hexdigest(),
+        'elapsed_ms': (time.perf_counter() - started) * 1000,
+    }
+    if profiler is not None:
+        result['profile'] = profiler.to_dict()
+    return result
+
+
+def expand_inputs(patterns: List[str]) -> List[Path]:
+    """glob 패턴을 엑셀 파일 목록으로 확장 (~$ 임시 파일 제외)"""
+    paths = set()
+    for pattern in patterns:
+        for match in glob.glob(pattern, recursive=True):
+            path = Path(match)
+            if path.is_file() and path.suffix.lower() == '.xlsx' and not path.name.startswith('~$'):
+                paths.add(path.resolve())
+    return sorted(paths)
+
+
+def output_path_for(input_path: Path, output_dir: Optional[Path], base_dir: Optional[Path] = None) -> Path:
+    """
+    입력 파일에 대응하는 .drawio 경로
+
+    Args:
+        output_dir: 출력 폴더 (None이면 입력 파일과 같은 폴더)
+        base_dir: 입력 파일들의 공통 상위 폴더 - 출력 폴더 아래에 이 폴더 기준 하위 경로를 유지
+                  (a/x.xlsx와 b/x.xlsx가 같은 출력 파일로 겹치지 않도록)
+    """
+    if output_dir is None:
+        target_dir = input_path.parent
+    elif base_dir is None:
+        target_dir = output_dir
+    else:
+        target_dir = output_dir / input_path.parent.relative_to(base_dir)
+    return target_dir / f"{input_path.stem}.drawio"
+
+
+def find_conflicts(outputs: Dict[Path, Path]) -> Dict[Path, List[Path]]:
+    """
+    같은 출력 파일로 변환되는 입력 파일들
+
+    Args:
+        outputs: 입력 경로 → 출력 경로
+
+    Returns:
+        출력 경로 → 입력 경로 목록 (2개 이상인 것만)
+    """
+    by_output: Dict[Path, List[Path]] = {}
+    for input_path, output_path in outputs.items():
+        by_output.setdefault(output_path, []).append(input_path)
+    return {output_path: paths for output_path, paths in by_output.items() if len(paths) > 1}
+
+
+class Manifest:
+    """출력 폴더별 변환 기록 (입력 파일의 mtime/크기/해시, 파이프라인 버전)"""
+
+    def __init__(self):
+        self._entries: Dict[Path, Dict[str, Any]] = {}
+        self._dirty = set()
+
+    def _load(self, directory: Path) -> Dict[str, Any]:
+        if directory not in self._entries:
+            try:
+                with open(directory / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+                    self._entries[directory] = json.load(f)
+            except (OSError, ValueError):
+                self._entries[directory] = {}
+        return self._entries[directory]
+
+    def get(self, path: Path) -> Optional[Dict[str, Any]]:
+        return self._load(path.parent).get(path.name)
+
+    def set(self, path: Path, entry: Dict[str, Any]):
+        self._load(path.parent)[path.name] = entry
+        self._dirty.add(path.parent)
+
+    def save(self):
+        for directory in self._dirty:
+            try:
+                with open(directory / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+                    json.dump(self._entries[directory], f, ensure_ascii=False, indent=2)
+            except OSError as e:
+                print(f"⚠️ 변환 기록 저장 실패 ({directory}): {e}")
+        self._dirty.clear()
+
+
+def is_up_to_date(input_path: Path, output_path: Path, entry: Optional[Dict[str, Any]],
+                  version: str) -> Optional[str]:
+    """
+    변환이 필요 없는지 확인
+
+    Returns:
+        최신이면 입력 파일 해시, 다시 변환해야 하면 None
+    """
+    if not entry or entry.get('version') != version or entry.get('input') != str(input_path):
+        return None
+    if not output_path.exists():
+        return None
+
+    stat = input_path.stat()
+    if entry.get('mtime_ns') == stat.st_mtime_ns and entry.get('size') == stat.st_size:
+        return entry['sha256']
+
+    # mtime만 바뀐 경우 (복사/체크아웃) 내용 해시로 확인
+    with open(input_path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return digest if digest == entry.get('sha256') else None
+
+
+def run(patterns: List[str], workers: Optional[int] = None, force: bool = False,
+        compressed: bool = False, output_dir: Optional[str] = None,
+        profile_json: Optional[str] = None) -> int:
+    """
+    일괄 변환 실행
+
+    Args:
+        profile_json: 지정하면 변환한 파일별 단계 계측 결과를 이 경로에 JSON으로 저장
+
+    Returns:
+        실패한 파일 수 (출력 파일이 겹치면 변환하지 않고 겹친 입력 파일 수)
+    """
+    inputs = expand_inputs(patterns)
+    if not inputs:
+        print("변환할 엑셀 파일이 없습니다.")
+        return 0
+
+    out_dir = Path(output_dir).resolve() if output_dir else None
+    base_dir = Path(os.path.commonpath([path.parent for path in inputs])) if out_dir else None
+    outputs = {input_path: output_path_for(input_path, out_dir, base_dir) for input_path in inputs}
+
+    # 대소문자만 다른 확장자(x.xlsx / x.XLSX) 등으로 출력 파일이 겹치면 아무것도 변환하지 않음
+    conflicts = find_conflicts(outputs)
+    if conflicts:
+        for output_path, paths in conflicts.items():
+            print(f"❌ 출력 파일이 겹칩니다: {output_path} ← {', '.join(str(path) for path in paths)}")
+        return sum(len(paths) for paths in conflicts.values())
+
+    for output_path in outputs.values():
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    version = get_pipeline_version() + ('/compressed' if compressed else '')
+    manifest = Manifest()
+
+    jobs = []
+    skipped = 0
+    for input_path, output_path in outputs.items():
+        digest = None if force else is_up_to_date(input_path, output_path, manifest.get(output_path), version)
+        if digest is not None:
+            skipped += 1
+            _record(manifest, input_path, output_path, digest, version)
+            print(f"⏭️  {input_path.name} (변경 없음)")
+        else:
+            jobs.append((input_path, output_path))
+
+    failed = 0
+    profiles = {}
+    started = time.perf_counter()
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(convert_file, str(input_path), str(output_path), compressed,
+                                bool(profile_json)): (input_path, output_path)
+                for input_path, output_path in jobs
+            }
+            for future in as_completed(futures):
+                input_path, output_path = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"❌ {input_path.name}: {e}")
+                    continue
+
+                _record(manifest, input_path, output_path, result['sha256'], version)
+                if 'profile' in result:
+                    profiles[str(input_path)] = result['profile']
+                print(f"✅ {input_path.name} → {output_path.name} ({result['elapsed_ms']:.1f} ms)")
+
+    manifest.save()
+
+    if profile_json:
+        try:
+            with open(profile_json, 'w', encoding='utf-8') as f:
+                json.dump(profiles, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"⚠️ 계측 결과 저장 실패 ({profile_json}): {e}")
+
+    total_ms = (time.perf_counter() - started) * 1000
+    print(f"\n완료: 변환 {len(jobs) - failed}개, 건너뜀 {skipped}개, 실패 {failed}개 ({total_ms:.1f} ms)")
+    return failed
+
+
+def _record(manifest: Manifest, input_path: Path, output_path: Path, digest: str, version: str):
+    stat = input_path.stat()
+    manifest.set(output_path, {
+        'input': str(input_path),
+        'sha256': digest,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'version': version,
+    })
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="엑셀 파일들을 Draw.io(.drawio)로 일괄 변환")
+    parser.add_argument('patterns', nargs='+', help="엑셀 파일 glob 패턴 (예: 'docs/**/*.xlsx')")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="작업 프로세스 수 (기본: CPU 수)")
+    parser.add_argument('-f', '--force', action='store_true', help="변경 여부와 관계없이 모두 변환")
+    parser.add_argument('-z', '--compressed', action='store_true', help="draw.io 압축 형식으로 저장")
+    parser.add_argument('-o', '--output-dir', default=None,
+                        help="출력 폴더 (기본: 입력 파일과 같은 폴더, 입력 파일들의 하위 폴더 구조는 유지)")
+    parser.add_argument('--profile-json', default=None,
+                        help="변환한 파일별 단계 시간/메모리/카운터를 저장할 JSON 경로")
+    args = parser.parse_args(argv)
+
+    failed = run(args.patterns, workers=args.workers, force=args.force,
+                 compressed=args.compressed, output_dir=args.output_dir,
+                 profile_json=args.profile_json)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
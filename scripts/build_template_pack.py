@@ -0,0 +1,59 @@
+"""
+AutoArchitect - 템플릿 팩 빌드 CLI
+카탈로그 템플릿과 컴포넌트를 미리 파싱/배치/XML 생성해 templates/template_pack.json으로 저장
+
+실행 예:
+    python -m scripts.build_template_pack
+    python -m scripts.build_template_pack --force
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# 프로젝트 루트를 path에 추가 (python scripts/build_template_pack.py 실행 지원)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.template_pack import TemplatePack, get_pack_path
+
+
+def run(output: Optional[str] = None, force: bool = False) -> int:
+    """
+    팩 빌드 (바뀐 항목만 다시 생성)
+
+    Returns:
+        다시 만든 항목 수
+
+    Raises:
+        ValueError: 파싱 오류가 있는 템플릿이 있을 때 (팩 파일은 저장하지 않음)
+    """
+    started = time.perf_counter()
+    pack = TemplatePack(path=Path(output) if output else get_pack_path())
+    rebuilt = pack.build(force=force)
+    pack.save()
+
+    for item_id in rebuilt:
+        print(f"✅ {item_id}")
+    total_ms = (time.perf_counter() - started) * 1000
+    print(f"\n완료: 생성 {len(rebuilt)}개 → {pack.path} ({total_ms:.1f} ms)")
+    return len(rebuilt)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="템플릿/컴포넌트 팩(JSON) 빌드")
+    parser.add_argument('-o', '--output', default=None, help="팩 파일 경로 (기본: templates/template_pack.json)")
+    parser.add_argument('-f', '--force', action='store_true', help="변경 여부와 관계없이 모두 다시 생성")
+    args = parser.parse_args(argv)
+
+    try:
+        run(output=args.output, force=args.force)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
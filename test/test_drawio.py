@@ -0,0 +1,447 @@
+"""
+AutoArchitect - Draw.io XML 생성/병합 테스트
+"""
+
+import io
+import xml.etree.ElementTree as ET
+import pytest
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.components import COMPONENT_CATALOG, generate_component_data
+from core.diagram_model import CELL_LAYER, DiagramModel
+from core.drawio_compression import compress_diagram, decompress_diagram, is_compressed, parse_drawio_xml, uri_encode
+from core.drawio_style import parse_style
+from core.diagram_merger import PLACEMENT_FREE, MergeDocument, merge_into_document, merge_xml_diagrams
+from core.drawio_generator import DrawioGenerator
+from core.excel_parser import ExcelParser
+from core.layout_engine import LayoutEngine
+from core.spatial_index import SpatialIndex
+from core.templates import get_available_templates, get_template_store
+from core.xml_to_excel import XmlToExcelConverter, model_to_excel, xml_to_excel
+from core.xml_writer import XmlStreamWriter, serialize_element
+
+
+@pytest.fixture
+def component_data():
+    """DB 클러스터 컴포넌트 데이터와 위치"""
+    data = generate_component_data('db_cluster')
+    data['config']['캔버스너비'] = COMPONENT_CATALOG['db_cluster']['width']
+    data['config']['캔버스높이'] = COMPONENT_CATALOG['db_cluster']['height']
+    positions = LayoutEngine().calculate_positions(data)
+    return data, positions
+
+
+class TestXmlStreamWriter:
+    """스트리밍 XML 작성기 테스트"""
+
+    def test_escapes_attributes(self):
+        """특수문자/줄바꿈이 왕복 후에도 유지되는지 확인"""
+        output = io.StringIO()
+        writer = XmlStreamWriter(output)
+        writer.empty('mxCell', {'value': 'A & B <"C">\n(D)'})
+
+        elem = ET.fromstring(output.getvalue())
+        assert elem.get('value') == 'A & B <"C">\n(D)'
+
+    def test_mismatched_end_tag(self):
+        """닫는 태그가 다르면 에러"""
+        writer = XmlStreamWriter(io.StringIO())
+        writer.start('root')
+        with pytest.raises(ValueError):
+            writer.end('mxCell')
+
+    def test_serialize_element(self):
+        """ElementTree 요소 직렬화"""
+        root = ET.fromstring('<a x="1"><b/><c>text</c></a>')
+        xml = serialize_element(root)
+
+        assert xml.startswith('<?xml version="1.0" encoding="UTF-8"?>\n')
+        assert '  <b/>' in xml
+        reparsed = ET.fromstring(xml)
+        assert [e.tag for e in reparsed.iter()] == ['a', 'b', 'c']
+        assert reparsed.find('c').text == 'text'
+
+
+class TestDrawioGeneratorOutput:
+    """DrawioGenerator 출력 테스트"""
+
+    def test_compact_matches_pretty(self, component_data):
+        """compact 모드도 같은 셀 구조를 생성"""
+        data, positions = component_data
+        pretty = ET.fromstring(DrawioGenerator().generate_xml(data, positions))
+        compact_xml = DrawioGenerator().generate_xml(data, positions, compact=True)
+        compact = ET.fromstring(compact_xml)
+
+        assert '\n' not in compact_xml
+        pretty_cells = [cell.attrib for cell in pretty.iter('mxCell')]
+        compact_cells = [cell.attrib for cell in compact.iter('mxCell')]
+        assert pretty_cells == compact_cells
+
+    def test_write_xml_to_stream(self, component_data):
+        """스트림에 바로 기록"""
+        data, positions = component_data
+        output = io.StringIO()
+        DrawioGenerator().write_xml(data, positions, output)
+
+        root = ET.fromstring(output.getvalue())
+        assert root.find('.//diagram').get('name') == 'DB Cluster'
+        assert len(root.findall('.//mxCell[@edge="1"]')) == len(data['connections'])
+
+
+class TestCompressedOutput:
+    """압축 출력 테스트"""
+
+    def test_roundtrip(self):
+        """압축 후 해제하면 원문과 같음"""
+        model_xml = '<mxGraphModel><root><mxCell id="0" value="한글 &amp; 100%"/></root></mxGraphModel>'
+        assert decompress_diagram(compress_diagram(model_xml)) == model_xml
+
+    def test_uri_encode_matches_encode_uri_component(self):
+        """encodeURIComponent와 같은 문자만 이스케이프"""
+        assert uri_encode("a b&c=한/-_.!~*'()") == b"a%20b%26c%3D%ED%95%9C%2F-_.!~*'()"
+
+    def test_invalid_payload(self):
+        """압축 형식이 아니면 ValueError"""
+        with pytest.raises(ValueError):
+            decompress_diagram('not compressed!')
+
+    def test_compressed_generator_output(self, component_data):
+        """압축 출력은 더 작고 같은 셀을 담고 있음"""
+        data, positions = component_data
+        plain_xml = DrawioGenerator().generate_xml(data, positions)
+        compressed_xml = DrawioGenerator().generate_xml(data, positions, compressed=True)
+
+        assert len(compressed_xml) < len(plain_xml)
+        assert is_compressed(ET.fromstring(compressed_xml))
+
+        plain_cells = [cell.attrib for cell in ET.fromstring(plain_xml).iter('mxCell')]
+        expanded_cells = [cell.attrib for cell in parse_drawio_xml(compressed_xml).iter('mxCell')]
+        assert plain_cells == expanded_cells
+
+    def test_converter_reads_compressed(self, component_data):
+        """역변환기가 압축 XML을 읽음"""
+        data, positions = component_data
+        compressed_xml = DrawioGenerator().generate_xml(data, positions, compressed=True)
+
+        converter = XmlToExcelConverter()
+        converter._parse_xml(compressed_xml)
+        assert converter.diagram_name == 'DB Cluster'
+        assert converter.cells
+
+
+class TestDiagramMerger:
+    """다이어그램 병합 테스트"""
+
+    @pytest.mark.parametrize('compressed', [False, True])
+    def test_incremental_merge_matches_one_shot(self, component_data, compressed):
+        """색인 문서로 이어 붙인 결과가 매번 새로 병합한 결과와 같은 셀을 담음"""
+        data, positions = component_data
+        base_xml = DrawioGenerator().generate_xml(data, positions, compressed=compressed)
+
+        one_shot = incremental = base_xml
+        document = None
+        for _ in range(3):
+            one_shot = merge_xml_diagrams(one_shot, base_xml)
+            reused = document
+            document, incremental = merge_into_document(document, incremental, base_xml)
+        assert reused is document
+        assert is_compressed(ET.fromstring(incremental)) == compressed
+
+        cells = [cell.attrib for cell in parse_drawio_xml(incremental).iter('mxCell')]
+        assert cells == [cell.attrib for cell in parse_drawio_xml(one_shot).iter('mxCell')]
+        assert len({cell['id'] for cell in cells}) == len(cells)
+
+        width = COMPONENT_CATALOG['db_cluster']['width']
+        assert document.bbox[2] >= 4 * width + 300
+        assert len(document.rects) == 4 * len(MergeDocument(base_xml).rects)
+
+    def test_free_placement_stays_compact(self, component_data):
+        """빈 공간 배치는 기존 항목과 겹치지 않고 한쪽으로만 늘어나지 않음"""
+        data, positions = component_data
+        base_xml = DrawioGenerator().generate_xml(data, positions)
+        width, height = COMPONENT_CATALOG['db_cluster']['width'], COMPONENT_CATALOG['db_cluster']['height']
+
+        document, merged = None, base_xml
+        for _ in range(4):
+            document, merged = merge_into_document(document, merged, base_xml,
+                                                   placement=PLACEMENT_FREE, size=(width, height))
+        x1, y1, x2, y2 = document.bbox
+        assert x2 - x1 < 4 * width and y2 - y1 < 4 * height
+
+        layers = SpatialIndex({cell_id: pos for cell_id, pos in document.rects.items()
+                               if pos['width'] == width and pos['height'] == height})
+        assert len(layers) == 5
+        assert layers.overlapping_pairs() == []
+
+    def test_rebuilds_for_other_xml(self, component_data):
+        """세션 문서와 다른 XML이면 새로 색인"""
+        data, positions = component_data
+        base_xml = DrawioGenerator().generate_xml(data, positions)
+        document, merged = merge_into_document(None, base_xml, base_xml)
+        other, _ = merge_into_document(document, base_xml, base_xml)
+        assert other is not document
+        assert merge_into_document(document, '', base_xml) == (None, base_xml)
+
+
+class TestDiagramModel:
+    """공용 다이어그램 모델 테스트"""
+
+    def test_xml_roundtrip(self, component_data):
+        """생성기 모델 → XML → 모델이 같은 셀을 담고 원본 항목 ID로 찾을 수 있음"""
+        data, positions = component_data
+        model = DrawioGenerator().build_model(data, positions)
+        layer_id = data['layers'][0]['id']
+        assert model.by_item[layer_id].kind == CELL_LAYER
+        assert not hasattr(model.cells[0], '__dict__')
+
+        parsed = DiagramModel.from_xml(model.to_xml(compressed=True))
+        assert [cell.to_xml() for cell in parsed] == [cell.to_xml() for cell in model]
+        assert parsed.name == model.name and parsed.max_id == model.max_id
+
+    def test_merge_and_convert_share_model(self, component_data):
+        """병합 문서 모델을 그대로 역변환해도 XML을 읽은 결과와 같음"""
+        data, positions = component_data
+        model = DrawioGenerator().build_model(data, positions)
+        base_xml = model.to_xml()
+
+        document, merged = merge_into_document(None, base_xml, model)
+        assert len(document.model) == 2 * len(model)
+        assert document.model.by_id[document.last_id_map[model.cells[0].id]].x > model.cells[0].x
+        assert merged == merge_xml_diagrams(base_xml, base_xml)
+
+        from_model = XmlToExcelConverter()
+        from_model._load_model(document.model)
+        from_xml = XmlToExcelConverter()
+        from_xml._parse_xml(merged)
+        assert from_model.cells == from_xml.cells
+        assert from_model._extract_layers_and_boxes() == from_xml._extract_layers_and_boxes()
+
+    def test_keeps_edge_label_geometry(self):
+        """연결선 라벨의 relative 좌표 / offset과 연결선 끝점을 그대로 다시 기록하고, 이동 시 끝점만 따라감"""
+        model = DiagramModel.from_xml(EDGE_LABEL_XML)
+        edge, label = model.get('5'), model.get('6')
+        assert edge.terminals == {'sourcePoint': (150, 130), 'targetPoint': (400, 130)}
+        assert label.relative and label.offset == (5, -10)
+
+        parsed = DiagramModel.from_xml(model.to_xml())
+        assert [cell.to_xml() for cell in parsed] == [cell.to_xml() for cell in model]
+        assert 'relative="1"' in label.to_xml() and 'as="offset"' in label.to_xml()
+
+        edge.move(10, 20)
+        label.move(10, 20)
+        assert edge.terminals['sourcePoint'] == (160, 150)
+        assert (label.x, label.y) == (-0.2, 0)
+
+
+class TestStyleParser:
+    def test_parses_tokens_and_bare_names(self):
+        styles = parse_style('text;html=1;fontSize=12;strokeColor=none;fontSize=14;')
+        assert dict(styles) == {'text': '', 'html': '1', 'fontSize': '14', 'strokeColor': 'none'}
+        assert parse_style('') == {}
+
+    def test_result_is_cached_and_read_only(self):
+        style = 'shape=cylinder3;whiteSpace=wrap;'
+        assert parse_style(style) is parse_style(style)
+        with pytest.raises(TypeError):
+            parse_style(style)['shape'] = 'rect'
+
+
+# 원본 배치에서 형제끼리 겹쳐(Y%/높이%) 위치만으로는 부모를 알 수 없는 항목 → 역변환 시 부모가 바뀜
+EXPECTED_PARENT_CHANGES = {
+    'postoffice_bigdata': {'B_MODULE', 'B_HADOOP_YARN', 'B_HADOOP_HDFS'},
+    'cloud_bigdata': {'B_K8S', 'B_STORAGE', 'C_DRG', 'C_IPS', 'C_WAF', 'C_HIVE_C', 'C_SPARK_C'},
+}
+
+
+# 서로 겹치기만 하는 두 셀이 모두 컴포넌트를 감싸는 다이어그램
+OVERLAPPING_CONTAINERS_XML = (
+    '<mxfile><diagram name="d"><mxGraphModel pageWidth="1000" pageHeight="500"><root>'
+    '<mxCell id="0"/><mxCell id="1" parent="0"/>'
+    '<mxCell id="2" value="" vertex="1" parent="1">'
+    '<mxGeometry x="0" y="0" width="300" height="200" as="geometry"/></mxCell>'
+    '<mxCell id="3" value="" vertex="1" parent="1">'
+    '<mxGeometry x="100" y="50" width="300" height="300" as="geometry"/></mxCell>'
+    '<mxCell id="4" value="API" vertex="1" parent="1">'
+    '<mxGeometry x="150" y="100" width="50" height="50" as="geometry"/></mxCell>'
+    '</root></mxGraphModel></diagram></mxfile>'
+)
+
+
+# 연결선(5)에 draw.io 라벨 셀(6)이 달린 다이어그램 (끝점 / 라벨 offset 포함)
+EDGE_LABEL_XML = (
+    '<mxfile><diagram name="d"><mxGraphModel pageWidth="1000" pageHeight="500"><root>'
+    '<mxCell id="0"/><mxCell id="1" parent="0"/>'
+    '<mxCell id="2" value="" vertex="1" parent="1">'
+    '<mxGeometry x="0" y="0" width="600" height="300" as="geometry"/></mxCell>'
+    '<mxCell id="3" value="API" style="rounded=1;" vertex="1" parent="1">'
+    '<mxGeometry x="50" y="100" width="100" height="60" as="geometry"/></mxCell>'
+    '<mxCell id="4" value="DB" style="shape=cylinder3;" vertex="1" parent="1">'
+    '<mxGeometry x="400" y="100" width="100" height="60" as="geometry"/></mxCell>'
+    '<mxCell id="5" value="" edge="1" parent="1" source="3" target="4">'
+    '<mxGeometry relative="1" as="geometry">'
+    '<mxPoint x="150" y="130" as="sourcePoint"/><mxPoint x="400" y="130" as="targetPoint"/>'
+    '</mxGeometry></mxCell>'
+    '<mxCell id="6" value="calls" style="edgeLabel;html=1;" vertex="1" connectable="0" parent="5">'
+    '<mxGeometry x="-0.2" relative="1" as="geometry"><mxPoint x="5" y="-10" as="offset"/></mxGeometry>'
+    '</mxCell>'
+    '</root></mxGraphModel></diagram></mxfile>'
+)
+
+
+def _parent_names(data):
+    """(시트, 항목명) → (원본 ID, 부모 이름)"""
+    names = {item['id']: item['name'] for key in ('layers', 'boxes', 'components') for item in data[key]}
+    return {(key, item['name']): (item['id'], names.get(item['parent_id']))
+            for key in ('boxes', 'components') for item in data[key]}
+
+
+class TestXmlToExcel:
+    """역변환 테스트"""
+
+    @pytest.mark.parametrize('template_id', get_available_templates())
+    def test_template_roundtrip_keeps_parents(self, template_id):
+        """템플릿 → XML → 엑셀 왕복 후에도 부모가 같음 (겹친 형제는 예외, 부모 후보가 겹치면 경고)"""
+        parser = ExcelParser()
+        data = parser.parse_to_dict(parser.read_excel(io.BytesIO(get_template_store().get_bytes(template_id))))
+        xml_content = DrawioGenerator().generate_xml(data, LayoutEngine().calculate_positions(data))
+
+        converter = XmlToExcelConverter()
+        result = parser.parse_to_dict(parser.read_excel(io.BytesIO(converter.convert(xml_content))))
+        expected, actual = _parent_names(data), _parent_names(result)
+        changed = {item_id for key, (item_id, parent) in expected.items() if actual[key][1] != parent}
+
+        assert actual.keys() == expected.keys()
+        assert changed == EXPECTED_PARENT_CHANGES.get(template_id, set())
+        if not changed:
+            assert converter.warnings == []
+
+    def test_warns_on_overlapping_containers(self):
+        """서로 겹치기만 하는 두 셀이 모두 감싸면 가장 작은 셀을 부모로 쓰고 경고"""
+        converter = XmlToExcelConverter()
+        converter._parse_xml(OVERLAPPING_CONTAINERS_XML)
+        _, _, components = converter._extract_layers_and_boxes()
+
+        assert components['부모ID'] == ['B1']
+        assert len(converter.warnings) == 1
+        assert 'C1' in converter.warnings[0] and 'B1, B2' in converter.warnings[0]
+
+    def test_helpers_report_warnings(self):
+        """편의 함수에 변환기를 넘기면 변환 후 경고를 읽을 수 있음"""
+        from_xml, from_model = XmlToExcelConverter(), XmlToExcelConverter()
+        xml_to_excel(OVERLAPPING_CONTAINERS_XML, from_xml)
+        model_to_excel(DiagramModel.from_xml(OVERLAPPING_CONTAINERS_XML), from_model)
+
+        assert len(from_xml.warnings) == 1
+        assert from_model.warnings == from_xml.warnings
+
+    def test_infers_nesting_from_geometry(self):
+        """parent='1'로 기록된 셀도 감싸는 셀을 부모로 복원"""
+        data = {
+            'config': {'캔버스너비': 1000, '캔버스높이': 500},
+            'layers': [{'id': 'L1', 'name': 'Layer', 'height_percent': 100}],
+            'boxes': [
+                {'id': 'B1', 'name': 'Outer', 'parent_id': 'L1', 'row_number': 1, 'y_percent': 10, 'height_percent': 80},
+                {'id': 'B2', 'name': 'Inner', 'parent_id': 'B1', 'row_number': 1, 'y_percent': 20, 'height_percent': 60},
+                {'id': 'B3', 'name': 'Side', 'parent_id': 'L1', 'row_number': 1, 'y_percent': 10, 'height_percent': 80},
+            ],
+            'components': [],
+        }
+        xml_content = DrawioGenerator().generate_xml(data, LayoutEngine().calculate_positions(data))
+
+        converter = XmlToExcelConverter()
+        converter._parse_xml(xml_content)
+        layers, boxes, _ = converter._extract_layers_and_boxes()
+        ids = dict(zip(boxes['박스명'], boxes['박스ID']))
+        parent_of = dict(zip(boxes['박스명'], boxes['부모ID']))
+
+        assert layers['레이어명'] == ['Layer']
+        assert parent_of['Outer'] == 'L1'
+        assert parent_of['Inner'] == ids['Outer']
+
+    def test_relative_geometry_and_parent_percent(self):
+        """parent 속성으로 묶인 셀은 상대 좌표, Y%/높이%는 실제 부모 기준, 감싸는 셀이 없으면 부모 없음"""
+        xml_content = (
+            '<mxfile><diagram name="d"><mxGraphModel pageWidth="1000" pageHeight="500"><root>'
+            '<mxCell id="0"/><mxCell id="1" parent="0"/>'
+            '<mxCell id="2" value="Group" vertex="1" parent="1">'
+            '<mxGeometry x="100" y="100" width="300" height="200" as="geometry"/></mxCell>'
+            '<mxCell id="3" value="Child" vertex="1" parent="2">'
+            '<mxGeometry x="10" y="50" width="100" height="100" as="geometry"/></mxCell>'
+            '<mxCell id="4" value="Free" vertex="1" parent="1">'
+            '<mxGeometry x="600" y="100" width="100" height="100" as="geometry"/></mxCell>'
+            '</root></mxGraphModel></diagram></mxfile>'
+        )
+        converter = XmlToExcelConverter()
+        converter._parse_xml(xml_content)
+        _, _, components = converter._extract_layers_and_boxes()
+        rows = {name: index for index, name in enumerate(components['컴포넌트명'])}
+
+        assert converter.id_to_cell['3']['x'] == 110
+        assert components['부모ID'][rows['Child']] == components['ID'][rows['Group']]
+        assert components['Y%'][rows['Child']] == 25.0
+        assert components['높이%'][rows['Child']] == 50.0
+        assert components['부모ID'][rows['Free']] is None
+
+    @pytest.mark.parametrize('with_child', [False, True])
+    def test_header_of_top_aligned_box(self, with_child):
+        """Y%=0 박스는 레이어와 윗변이 같아도 레이어 헤더를 가져가지 않음"""
+        data = {
+            'config': {'캔버스너비': 1000, '캔버스높이': 500},
+            'layers': [{'id': 'L1', 'name': 'Layer', 'height_percent': 100}],
+            'boxes': [{'id': 'B1', 'name': 'Top', 'parent_id': 'L1', 'row_number': 1, 'y_percent': 0,
+                       'height_percent': 60}],
+            'components': [{'id': 'C1', 'name': 'API', 'parent_id': 'B1', 'row_number': 1, 'y_percent': 30,
+                            'height_percent': 40, 'type': '서비스'}] if with_child else [],
+        }
+        xml_content = DrawioGenerator().generate_xml(data, LayoutEngine().calculate_positions(data))
+
+        converter = XmlToExcelConverter()
+        converter._parse_xml(xml_content)
+        layers, boxes, _ = converter._extract_layers_and_boxes()
+
+        assert layers['레이어명'] == ['Layer']
+        assert boxes['박스명'] == ['Top']
+        assert boxes['부모ID'] == ['L1']
+
+    def test_roundtrip_classifies_cells(self):
+        """헤더 셀은 박스/레이어 이름으로 합치고 컴포넌트는 COMPONENTS 시트로"""
+        data = {
+            'config': {'캔버스너비': 1000, '캔버스높이': 500},
+            'layers': [{'id': 'L1', 'name': 'Layer', 'height_percent': 100}],
+            'boxes': [
+                {'id': 'B1', 'name': 'Outer', 'parent_id': 'L1', 'row_number': 1, 'y_percent': 10, 'height_percent': 80},
+                {'id': 'B2', 'name': 'Side', 'parent_id': 'L1', 'row_number': 1, 'y_percent': 10, 'height_percent': 80},
+            ],
+            'components': [
+                {'id': 'C1', 'name': 'DB', 'parent_id': 'B1', 'row_number': 1, 'y_percent': 30,
+                 'height_percent': 40, 'type': '데이터베이스'},
+                {'id': 'C2', 'name': 'API', 'parent_id': 'B1', 'row_number': 1, 'y_percent': 30,
+                 'height_percent': 40, 'type': '서비스'},
+            ],
+            'connections': [{'from_id': 'C2', 'to_id': 'C1'}],
+        }
+        xml_content = DrawioGenerator().generate_xml(data, LayoutEngine().calculate_positions(data))
+
+        parser = ExcelParser()
+        result = parser.parse_to_dict(parser.read_excel(io.BytesIO(XmlToExcelConverter().convert(xml_content))))
+        names = {item['id']: item['name'] for item in result['layers'] + result['boxes'] + result['components']}
+
+        assert [layer['name'] for layer in result['layers']] == ['Layer']
+        assert sorted(box['name'] for box in result['boxes']) == ['Outer', 'Side']
+        assert {comp['name']: comp['type'] for comp in result['components']} == {'DB': '데이터베이스', 'API': '서비스'}
+        assert {names[comp['parent_id']] for comp in result['components']} == {'Outer'}
+        assert [(names[conn['from_id']], names[conn['to_id']]) for conn in result['connections']] == [('API', 'DB')]
+
+    def test_edge_label_becomes_connection_label(self):
+        """연결선 라벨 셀은 컴포넌트가 아니라 연결의 라벨로 옮겨짐"""
+        parser = ExcelParser()
+        result = parser.parse_to_dict(parser.read_excel(io.BytesIO(XmlToExcelConverter().convert(EDGE_LABEL_XML))))
+        names = {item['id']: item['name'] for item in result['layers'] + result['boxes'] + result['components']}
+
+        assert sorted(comp['name'] for comp in result['components']) == ['API', 'DB']
+        assert [(names[conn['from_id']], names[conn['to_id']], conn['label']) for conn in result['connections']] \
+            == [('API', 'DB', 'calls')]
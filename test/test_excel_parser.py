@@ -0,0 +1,131 @@
+"""
+AutoArchitect - 엑셀 파서 테스트
+"""
+
+import io
+import json
+import pytest
+from collections.abc import Mapping
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from openpyxl import Workbook
+
+from core.excel_parser import ExcelParser
+from core.layout_engine import LayoutEngine
+from core.records import BoxRecord, Rect, json_default
+from core.templates import generate_template_excel, get_available_templates
+from utils.values import is_missing
+
+
+def _normalize(value):
+    """NaN/None 차이를 없앤 비교용 값"""
+    if isinstance(value, Mapping):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_normalize(v) for v in value]
+    return None if is_missing(value) else value
+
+
+@pytest.fixture
+def small_workbook():
+    """빈 행이 섞인 작은 엑셀"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = 'CONFIG'
+    ws.append(['항목', '값'])
+    ws.append(['다이어그램명', '테스트'])
+
+    ws = wb.create_sheet('LAYERS')
+    ws.append(['레이어ID', '레이어명', '높이%'])
+    ws.append(['L1', 'Layer 1', 100])
+
+    ws = wb.create_sheet('BOXES')
+    ws.append(['박스ID', '박스명', '부모ID', '행번호'])
+    ws.append(['B1', 'Box 1', 'L1', 1])
+    ws.append([None, None, None, None])
+    ws.append(['B2', 'Box 2', 'L1', None])
+
+    ws = wb.create_sheet('GUIDE')
+    ws.append(['설명'])
+
+    output = io.BytesIO()
+    wb.save(output)
+    return output.getvalue()
+
+
+class TestParserBackends:
+    """pandas/openpyxl 백엔드 테스트"""
+
+    @pytest.mark.parametrize('template_id', get_available_templates())
+    def test_backends_produce_same_data(self, template_id):
+        """두 백엔드의 parse_to_dict 결과가 같은지 확인"""
+        excel_bytes = generate_template_excel(template_id)
+        results = []
+        for backend in ('pandas', 'openpyxl'):
+            parser = ExcelParser()
+            sheets = parser.read_excel(io.BytesIO(excel_bytes), backend=backend)
+            results.append(_normalize(parser.parse_to_dict(sheets)))
+
+        assert results[0] == results[1]
+
+    def test_openpyxl_skips_empty_rows_and_guide(self, small_workbook):
+        """빈 행과 GUIDE 시트 제외"""
+        parser = ExcelParser(backend='openpyxl')
+        sheets = parser.read_excel(io.BytesIO(small_workbook))
+
+        assert 'GUIDE' not in sheets
+        assert len(sheets['BOXES']) == 2
+
+        data = parser.parse_to_dict(sheets)
+        assert [box['id'] for box in data['boxes']] == ['B1', 'B2']
+        assert data['config']['다이어그램명'] == '테스트'
+
+        validation = parser.validate_data(sheets)
+        assert validation['is_valid'] is True
+
+    def test_unknown_backend(self, small_workbook):
+        """지원하지 않는 백엔드는 에러로 기록"""
+        parser = ExcelParser()
+        sheets = parser.read_excel(io.BytesIO(small_workbook), backend='xlrd')
+
+        assert sheets == {}
+        assert parser.errors
+
+
+class TestRecords:
+    """파서 레코드 (dict 호환 __slots__) 테스트"""
+
+    def test_rows_are_compact_dict_compatible_records(self, small_workbook):
+        """레코드는 dict처럼 읽고 쓰며 반복 문자열을 공유"""
+        parser = ExcelParser(backend='openpyxl')
+        data = parser.parse_to_dict(parser.read_excel(io.BytesIO(small_workbook)))
+        box = data['boxes'][1]
+
+        assert isinstance(box, BoxRecord) and not hasattr(box, '__dict__')
+        assert box == {
+            'id': 'B2', 'name': 'Box 2', 'parent_id': 'L1', 'row_number': None, 'y_percent': 0,
+            'height_percent': 100, 'bg_color': '흰색', 'border_color': '회색', 'font_size': 11,
+        }
+        assert box.get('row_number', 1) is None and box.get('missing', 'x') == 'x'
+        assert box['parent_id'] is data['layers'][0]['id']
+
+        box['row_number'] = 2
+        box['note'] = '추가'
+        assert box.row_number == 2 and box['note'] == '추가' and 'note' in box
+        assert json.loads(json.dumps(box, default=json_default)) == box
+
+    def test_layout_positions_are_rects(self, small_workbook):
+        """레이아웃 좌표는 Rect 레코드이며 dict와 비교 가능"""
+        parser = ExcelParser(backend='openpyxl')
+        data = parser.parse_to_dict(parser.read_excel(io.BytesIO(small_workbook)))
+        positions = LayoutEngine().calculate_positions(data)
+
+        layer = positions['L1']
+        assert isinstance(layer, Rect)
+        assert layer == {'x': 0, 'y': 0, 'width': 1400, 'height': 900}
+        assert dict(layer) == layer.to_dict()
+        assert positions['B1'] != layer
@@ -0,0 +1,406 @@
+"""
+AutoArchitect - 레이아웃 엔진 테스트
+"""
+
+import io
+import pytest
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import layout_kernel
+from core.layout_engine import LayoutEngine, ROW_ORDER_CONFIG_KEY
+from core.crossings import count_crossings, route_orthogonal
+from core.drawio_generator import DrawioGenerator
+from core.edge_router import OrthogonalRouter
+from core.placement import FreeSpacePlacer
+from core.records import Rect
+from core.spatial_index import SpatialIndex
+from core.excel_parser import ExcelParser
+from benchmarks.synthetic import SCENARIOS, build_workbook
+
+
+def _box(box_id, parent_id, row=1):
+    return {'id': box_id, 'name': box_id, 'parent_id': parent_id, 'row_number': row,
+            'y_percent': 10, 'height_percent': 80}
+
+
+@pytest.fixture
+def nested_data():
+    """레이어 L1 아래 3단계 중첩 (B1 > B2 > C1)"""
+    return {
+        'config': {'캔버스너비': 1000, '캔버스높이': 500},
+        'layers': [{'id': 'L1', 'name': 'Layer', 'height_percent': 100}],
+        'boxes': [_box('B1', 'L1'), _box('B2', 'B1')],
+        'components': [{**_box('C1', 'B2'), 'type': '단일박스'}],
+    }
+
+
+def _inside(inner, outer):
+    return (outer['x'] <= inner['x'] and outer['y'] <= inner['y']
+            and inner['x'] + inner['width'] <= outer['x'] + outer['width'] + 1e-6
+            and inner['y'] + inner['height'] <= outer['y'] + outer['height'] + 1e-6)
+
+
+class TestNestedLayout:
+    """부모-자식 트리 배치 테스트"""
+
+    def test_sheet_order_does_not_matter(self, nested_data):
+        """자식이 부모보다 먼저 나와도 같은 위치"""
+        expected = LayoutEngine().calculate_positions(nested_data)
+
+        nested_data['boxes'].reverse()
+        engine = LayoutEngine()
+        positions = engine.calculate_positions(nested_data)
+
+        assert positions == expected
+        assert _inside(positions['B2'], positions['B1'])
+        assert _inside(positions['C1'], positions['B2'])
+        assert engine.warnings == []
+
+    def test_box_inside_component(self, nested_data):
+        """컴포넌트 아래 박스도 부모 기준으로 배치"""
+        nested_data['boxes'].append(_box('B3', 'C1'))
+        positions = LayoutEngine().calculate_positions(nested_data)
+
+        assert _inside(positions['B3'], positions['C1'])
+
+    def test_deep_hierarchy(self):
+        """깊은 중첩을 역순으로 넣어도 모두 부모 안에 배치"""
+        boxes = [_box('B0', 'L1')] + [_box(f'B{i}', f'B{i - 1}') for i in range(1, 500)]
+        data = {'layers': [{'id': 'L1', 'height_percent': 100}], 'boxes': boxes[::-1], 'components': []}
+        positions = LayoutEngine().calculate_positions(data)
+
+        assert len(positions) == 501
+        assert _inside(positions['B499'], positions['B498'])
+
+    def test_orphan_warning(self, nested_data):
+        """없는 부모를 가리키면 캔버스 기준으로 배치하고 경고"""
+        nested_data['boxes'].append(_box('B9', 'NOPE'))
+        engine = LayoutEngine()
+        positions = engine.calculate_positions(nested_data)
+
+        assert 'B9' in positions
+        assert len(engine.warnings) == 1
+        assert 'NOPE' in engine.warnings[0] and 'B9' in engine.warnings[0]
+
+    def test_empty_parent_is_canvas(self, nested_data):
+        """부모ID가 빈 문자열이면 부모 없음과 같이 캔버스 기준으로 배치 (경고 없음)"""
+        nested_data['boxes'].append(_box('B9', None))
+        expected = LayoutEngine().calculate_positions(nested_data)['B9']
+
+        nested_data['boxes'][-1] = _box('B9', '')
+        engine = LayoutEngine()
+
+        assert engine.calculate_positions(nested_data)['B9'] == expected
+        assert engine.warnings == []
+
+    def test_cycle_warning(self, nested_data):
+        """순환 관계는 끊어서 배치하고 경고"""
+        nested_data['boxes'] += [_box('X1', 'X2'), _box('X2', 'X1'), _box('X3', 'X2')]
+        engine = LayoutEngine()
+        positions = engine.calculate_positions(nested_data)
+
+        assert {'X1', 'X2', 'X3'} <= set(positions)
+        assert len(engine.warnings) == 1
+        assert '순환' in engine.warnings[0]
+        assert _inside(positions['X3'], positions['X2'])
+
+
+class TestIncrementalLayout:
+    """update_positions 증분 배치 테스트"""
+
+    def _assert_matches_full(self, engine, data):
+        assert engine.positions == LayoutEngine().calculate_positions(data)
+
+    def test_name_change_moves_nothing(self, nested_data):
+        """이름만 바뀌면 해당 ID만 반환"""
+        engine = LayoutEngine()
+        engine.calculate_positions(nested_data)
+
+        renamed = dict(nested_data['boxes'][1], name='새 이름')
+        nested_data['boxes'][1] = renamed
+
+        assert engine.update_positions(changed=[renamed]) == {'B2'}
+        self._assert_matches_full(engine, nested_data)
+
+    def test_add_and_move(self, nested_data):
+        """형제 추가 시 같은 행 형제와 그 하위만 다시 배치"""
+        nested_data['boxes'].append(_box('B3', 'L1'))
+        engine = LayoutEngine()
+        engine.calculate_positions(nested_data)
+
+        added = _box('B4', 'B3')
+        nested_data['boxes'].append(added)
+        assert engine.update_positions(added_boxes=[added]) == {'B4'}
+        self._assert_matches_full(engine, nested_data)
+
+        moved = dict(nested_data['boxes'][1], parent_id='L1')
+        nested_data['boxes'][1] = moved
+        changed = engine.update_positions(changed=[moved])
+
+        assert {'B1', 'B2', 'B3', 'B4', 'C1'} <= changed
+        self._assert_matches_full(engine, nested_data)
+
+    def test_remove_parent_falls_back_to_full_layout(self, nested_data):
+        """하위 항목이 있는 항목을 지우면 전체 재계산 (없는 부모 경고 포함)"""
+        engine = LayoutEngine()
+        engine.calculate_positions(nested_data)
+
+        del nested_data['boxes'][1]
+        changed = engine.update_positions(removed=['B2'])
+
+        assert {'B2', 'C1'} <= changed
+        assert 'B2' not in engine.positions
+        assert len(engine.warnings) == 1
+        self._assert_matches_full(engine, nested_data)
+
+    def test_invalid_diff(self, nested_data):
+        """없는 ID 변경/삭제, 중복 추가는 오류 (색인은 그대로)"""
+        engine = LayoutEngine()
+        with pytest.raises(ValueError):
+            engine.update_positions(removed=['B1'])
+
+        engine.calculate_positions(nested_data)
+        with pytest.raises(ValueError):
+            engine.update_positions(removed=['NOPE'])
+        with pytest.raises(ValueError):
+            engine.update_positions(added_boxes=[_box('B1', 'L1')])
+
+        assert engine.update_positions(removed=['C1']) == {'C1'}
+
+
+def _cell(x, y, size=10):
+    return {'x': x - size / 2, 'y': y - size / 2, 'width': size, 'height': size}
+
+
+class TestCrossings:
+    """연결선 교차 계산 테스트"""
+
+    def test_plus_shape_crosses_once(self):
+        """수평선과 수직선이 가운데에서 교차"""
+        positions = {'W': _cell(0, 50), 'E': _cell(100, 50), 'N': _cell(50, 0), 'S': _cell(50, 100)}
+        connections = [{'from_id': 'W', 'to_id': 'E'}, {'from_id': 'N', 'to_id': 'S'}]
+
+        assert LayoutEngine().detect_crossings(positions, connections) == 1
+
+    def test_touching_and_parallel_are_not_crossings(self):
+        """같은 셀에서 출발하거나 평행한 선은 교차가 아님"""
+        positions = {'A': _cell(0, 0), 'B': _cell(100, 0), 'C': _cell(0, 100), 'D': _cell(100, 100)}
+        connections = [
+            {'from_id': 'A', 'to_id': 'B'},
+            {'from_id': 'A', 'to_id': 'D'},
+            {'from_id': 'C', 'to_id': 'D'},
+            {'from_id': 'A', 'to_id': 'MISSING'},
+        ]
+
+        routes = route_orthogonal(positions, connections)
+        assert routes[-1] == []
+        assert count_crossings(routes) == 0
+
+    def test_matches_pairwise_count(self):
+        """격자 위 연결들의 교차 수가 선분 쌍 비교 결과와 같음"""
+        positions = {f'{x}_{y}': _cell(x * 40, y * 40) for x in range(5) for y in range(5)}
+        connections = [{'from_id': f'{i % 5}_{i // 5 % 5}', 'to_id': f'{(i * 3) % 5}_{(i * 7) % 5}'}
+                       for i in range(25)]
+        routes = route_orthogonal(positions, connections)
+
+        expected = 0
+        segments = [segment for route in routes for segment in route]
+        for hx1, hy, hx2, _, h_conn in (s for s in segments if s[1] == s[3]):
+            for vx, vy1, _, vy2, v_conn in (s for s in segments if s[0] == s[2]):
+                if h_conn != v_conn and min(hx1, hx2) < vx < max(hx1, hx2) and min(vy1, vy2) < hy < max(vy1, vy2):
+                    expected += 1
+
+        assert expected > 0
+        assert count_crossings(routes) == expected
+
+
+@pytest.fixture(scope='module')
+def connected_data():
+    """연결선이 많은 합성 워크북 (small 시나리오)"""
+    parser = ExcelParser(backend='openpyxl')
+    return parser.parse_to_dict(parser.read_excel(io.BytesIO(build_workbook(SCENARIOS[0]))))
+
+
+class TestRowOrdering:
+    """행 순서 최적화 테스트"""
+
+    def test_reduces_crossings(self, connected_data):
+        """같은 항목을 배치하면서 교차 수는 줄어듦"""
+        connections = connected_data['connections']
+        engine = LayoutEngine()
+        before = engine.detect_crossings(engine.calculate_positions(connected_data), connections)
+
+        optimized = LayoutEngine(optimize_rows=True, row_order_budget_ms=1000)
+        positions = optimized.calculate_positions(connected_data)
+
+        assert set(positions) == set(engine.positions)
+        assert optimized.detect_crossings(positions, connections) < before
+
+    def test_zero_budget_keeps_layout(self, connected_data):
+        """예산이 없으면 순서를 바꾸지 않음"""
+        expected = LayoutEngine().calculate_positions(connected_data)
+        engine = LayoutEngine(optimize_rows=True, row_order_budget_ms=0)
+
+        assert engine.calculate_positions(connected_data) == expected
+
+    def test_config_switch_and_incremental_update(self, connected_data):
+        """CONFIG 값으로 켜지고, 순서를 바꾼 뒤의 증분 갱신은 전체 재계산"""
+        data = dict(connected_data, config={**connected_data.get('config', {}), ROW_ORDER_CONFIG_KEY: '예'})
+        engine = LayoutEngine(row_order_budget_ms=1000)
+        positions = dict(engine.calculate_positions(data))
+
+        assert positions != LayoutEngine().calculate_positions(connected_data)
+
+        renamed = dict(data['boxes'][0], name='새 이름')
+        data['boxes'] = [renamed] + data['boxes'][1:]
+        engine.update_positions(changed=[renamed])
+
+        assert engine.positions == LayoutEngine(row_order_budget_ms=1000).calculate_positions(data)
+
+
+@pytest.mark.skipif(not layout_kernel.available(), reason="NumPy 없음")
+class TestVectorLayout:
+    """NumPy 행 배치 커널 테스트"""
+
+    def test_same_as_python(self, connected_data):
+        """커널과 파이썬 경로의 결과(값, 순서)가 같음"""
+        expected = LayoutEngine(vectorized=False).calculate_positions(connected_data)
+        positions = LayoutEngine(vectorized=True).calculate_positions(connected_data)
+
+        assert list(positions) == list(expected)
+        assert positions == expected
+
+    def test_falls_back_for_unusual_values(self, nested_data):
+        """숫자가 아닌 행 값이나 중복 ID는 파이썬 경로로 처리"""
+        nested_data['boxes'] += [_box('B3', 'L1', row='2'), _box('B1', 'L1', row=3)]
+        expected = LayoutEngine(vectorized=False).calculate_positions(nested_data)
+
+        assert LayoutEngine(vectorized=True).calculate_positions(nested_data) == expected
+        assert layout_kernel.layout_groups([(Rect(0, 0, 100, 100), [_box('X', 'L1', row='1')])], 5, 5, 2) is None
+
+
+def _segments_hit(path, rect):
+    """직교 경로가 사각형 안쪽을 지나는지"""
+    x1, y1, x2, y2 = rect['x'], rect['y'], rect['x'] + rect['width'], rect['y'] + rect['height']
+    for (ax, ay), (bx, by) in zip(path, path[1:]):
+        if ax == bx and x1 < ax < x2 and min(ay, by) < y2 and max(ay, by) > y1:
+            return True
+        if ay == by and y1 < ay < y2 and min(ax, bx) < x2 and max(ax, bx) > x1:
+            return True
+    return False
+
+
+class TestEdgeRouter:
+    """연결선 경로 계산 테스트"""
+
+    def test_straight_when_clear(self):
+        """가로막는 항목이 없으면 꺾는 점 없음"""
+        positions = {'A': _cell(0, 50, 20), 'B': _cell(200, 50, 20), 'O': _cell(100, 200, 20)}
+        router = OrthogonalRouter(positions, positions)
+
+        assert router.route('A', 'B') == []
+        assert router.route('A', 'MISSING') is None
+
+    def test_detours_around_obstacle(self):
+        """가운데 항목을 돌아가는 경로"""
+        positions = {'A': _cell(0, 50, 20), 'B': _cell(300, 50, 20), 'O': _cell(150, 50, 60)}
+        router = OrthogonalRouter(positions, positions)
+        points = router.route_all([{'from_id': 'A', 'to_id': 'B'}])[0]
+
+        assert len(points) >= 2
+        assert not _segments_hit([(0, 50)] + points + [(300, 50)], positions['O'])
+
+    def test_generator_writes_waypoints(self, nested_data):
+        """route_edges=True면 연결선에 mxPoint 꺾는 점 기록"""
+        nested_data['components'] += [
+            {**_box('C0', 'B2'), 'type': '단일박스', 'row_number': 2},
+            {**_box('C2', 'B2'), 'type': '단일박스'},
+            {**_box('C3', 'B2'), 'type': '단일박스'},
+        ]
+        nested_data['connections'] = [{'from_id': 'C1', 'to_id': 'C3'}]
+        positions = LayoutEngine().calculate_positions(nested_data)
+
+        plain = DrawioGenerator().generate_xml(nested_data, positions)
+        routed = DrawioGenerator(route_edges=True).generate_xml(nested_data, positions)
+
+        assert '<Array as="points">' not in plain
+        assert '<Array as="points">' in routed and '<mxPoint ' in routed
+
+
+class TestSpatialIndex:
+    """공간 색인 테스트"""
+
+    @pytest.fixture
+    def index(self):
+        positions = {
+            'outer': {'x': 0, 'y': 0, 'width': 100, 'height': 100},
+            'inner': {'x': 10, 'y': 10, 'width': 30, 'height': 30},
+            'cross': {'x': 30, 'y': 30, 'width': 20, 'height': 20},
+            'touch': {'x': 100, 'y': 0, 'width': 50, 'height': 50},
+            'far': {'x': 500, 'y': 500, 'width': 10, 'height': 10},
+        }
+        return SpatialIndex(positions, bucket_size=25)
+
+    def test_overlap_and_containment(self, index):
+        """경계만 맞닿으면 겹침 아님, 포함 관계는 양방향 조회"""
+        assert sorted(index.overlapping('inner')) == ['cross', 'outer']
+        assert 'touch' not in index.overlapping('outer')
+        assert sorted(index.containers('inner')) == ['outer']
+        assert sorted(index.contained('outer')) == ['cross', 'inner']
+        assert index.overlapping_pairs(['inner', 'cross', 'far']) == [('inner', 'cross')]
+
+    def test_nearest(self, index):
+        """사각형까지 거리 순 (안쪽이면 0)"""
+        assert index.nearest(400, 400, k=2) == ['far', 'outer']
+        assert index.nearest(20, 20, k=1, exclude=['outer']) == ['inner']
+
+
+class TestFreeSpacePlacement:
+    """빈 공간 배치 테스트"""
+
+    def test_fills_gap_before_growing(self):
+        """기존 영역 안 빈 곳을 먼저 쓰고, 자리가 없으면 넓이가 덜 늘어나는 쪽으로"""
+        positions = {
+            'top': {'x': 0, 'y': 0, 'width': 400, 'height': 100},
+            'inner': {'x': 10, 'y': 10, 'width': 50, 'height': 50},
+            'bottom': {'x': 0, 'y': 300, 'width': 400, 'height': 100},
+        }
+        placer = FreeSpacePlacer(positions, gap=40)
+        assert set(placer.index.rects) == {'top', 'bottom'}
+        assert placer.find(100, 100) == (0, 140)
+
+        placer.add('first', {'x': 0, 'y': 140, 'width': 100, 'height': 100})
+        x, y = placer.find(100, 100)
+        assert (x, y) == (140, 140)
+
+        placer.add('second', {'x': x, 'y': y, 'width': 100, 'height': 100})
+        placer.add('third', {'x': 280, 'y': 140, 'width': 100, 'height': 100})
+        assert placer.find(300, 100) == (0, 440)
+
+    def test_empty(self):
+        assert FreeSpacePlacer({}).find(10, 10) == (0, 0)
+
+
+class TestGeometryCheck:
+    """배치 결과 겹침/벗어남 검사 테스트"""
+
+    def test_overlapping_siblings_and_overflow(self, nested_data):
+        """다른 행끼리 Y%가 겹치거나 Y%+높이%가 100을 넘으면 경고"""
+        engine = LayoutEngine()
+        engine.calculate_positions(nested_data)
+        assert engine.check_geometry(nested_data) == []
+
+        nested_data['boxes'] += [
+            {**_box('B3', 'L1', row=2), 'y_percent': 50, 'height_percent': 40},
+            {**_box('B4', 'B3'), 'y_percent': 50, 'height_percent': 80},
+        ]
+        engine.calculate_positions(nested_data)
+        warnings = engine.check_geometry(nested_data)
+
+        assert len(warnings) == 2
+        assert 'B1↔B3' in warnings[0]
+        assert 'B4' in warnings[1]
@@ -0,0 +1,302 @@
+"""
+AutoArchitect - 파이프라인 테스트
+"""
+
+import json
+import pytest
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.templates import TemplateAssetStore, generate_template_excel, get_available_templates
+from core.template_pack import TemplatePack
+from core.drawio_generator import COLOR_MAP, CONNECTION_STYLES
+from core.pipeline import PipelineCache, compute_cache_key, generate_xml_from_excel
+from core.upload_session import UploadSession
+from core.instrumentation import Profiler
+from scripts import batch_convert
+from benchmarks import run as bench
+from benchmarks.synthetic import SCENARIOS, SyntheticSpec, build_workbook
+
+
+@pytest.fixture
+def template_bytes():
+    """첫 번째 템플릿 엑셀 바이트"""
+    return generate_template_excel(get_available_templates()[0])
+
+
+class TestPipelineCache:
+    """PipelineCache 테스트"""
+
+    def test_cache_key_depends_on_content(self, template_bytes):
+        """내용이 같으면 같은 키, 다르면 다른 키"""
+        assert compute_cache_key(template_bytes) == compute_cache_key(bytes(template_bytes))
+        assert compute_cache_key(template_bytes) != compute_cache_key(template_bytes + b'\0')
+
+    def test_lru_eviction(self):
+        """최대 개수 초과 시 가장 오래된 항목 제거"""
+        cache = PipelineCache(max_entries=2)
+        cache.put('a', '<a/>', 'A')
+        cache.put('b', '<b/>', 'B')
+        cache.get('a')
+        cache.put('c', '<c/>', 'C')
+
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert 'c' in cache
+
+    def test_disk_tier(self, tmp_path):
+        """디스크 캐시는 새 인스턴스에서도 조회됨"""
+        PipelineCache(cache_dir=str(tmp_path)).put('k', '<xml/>', '이름')
+
+        cache = PipelineCache(cache_dir=str(tmp_path))
+        assert cache.get('k') == ('<xml/>', '이름')
+        assert cache.get('missing') is None
+
+    def test_disk_write_failure_warns(self, tmp_path):
+        """디스크에 쓸 수 없으면 경고만 내고 메모리 캐시는 그대로 사용"""
+        cache = PipelineCache(cache_dir=str(tmp_path))
+        (tmp_path / 'k.json').mkdir()
+
+        with pytest.warns(RuntimeWarning, match='캐시 저장 실패'):
+            cache.put('k', '<xml/>', '이름')
+        assert cache.get('k') == ('<xml/>', '이름')
+        assert [path.name for path in tmp_path.iterdir()] == ['k.json']
+
+    def test_generate_uses_cache(self, template_bytes):
+        """두 번째 호출은 캐시된 결과를 그대로 반환"""
+        cache = PipelineCache()
+        first = generate_xml_from_excel(template_bytes, cache=cache)
+        second = generate_xml_from_excel(template_bytes, cache=cache)
+
+        assert first == second
+        assert cache.hits == 1
+        assert '<mxfile' in first[0]
+
+
+class TestTemplateAssetStore:
+    """TemplateAssetStore 테스트"""
+
+    def test_reads_once_until_file_changes(self, tmp_path):
+        """변경이 없으면 같은 바이트 재사용, 파일이 바뀌면 다시 읽음"""
+        catalog = {'a': {'file': 'a.xlsx'}, 'b': {'file': 'b.xlsx'}}
+        (tmp_path / 'a.xlsx').write_bytes(b'first')
+        store = TemplateAssetStore(tmp_path, catalog)
+
+        assert store.available() == ['a']
+        data = store.get_bytes('a')
+        assert data == b'first' and store.get_bytes('a') is data
+        assert store.reads == 1
+
+        (tmp_path / 'a.xlsx').write_bytes(b'second!')
+        (tmp_path / 'b.xlsx').write_bytes(b'other')
+        assert store.get_bytes('a') == b'second!'
+        assert store.reads == 2
+        assert store.available() == ['a', 'b']
+
+        with pytest.raises(ValueError):
+            store.get_bytes('missing')
+
+
+class TestTemplatePack:
+    """TemplatePack 테스트"""
+
+    def test_serves_from_pack_and_rebuilds_stale(self, template_bytes, tmp_path, monkeypatch):
+        """저장된 팩은 파싱 없이 사용, 원본 엑셀이 바뀐 템플릿만 다시 생성"""
+        source_dir = tmp_path / 'templates'
+        source_dir.mkdir()
+        (source_dir / 'a.xlsx').write_bytes(template_bytes)
+        store = TemplateAssetStore(source_dir, {'a': {'file': 'a.xlsx'}})
+        pack_path = tmp_path / 'pack.json'
+
+        built = TemplatePack(pack_path, store)
+        assert 'a' in built.build() and 'db_cluster' in built.rebuilt
+        built.save()
+        xml, name = built.template_xml('a')
+
+        def fail(*args, **kwargs):
+            raise AssertionError('팩에 있는 템플릿을 다시 파싱함')
+
+        monkeypatch.setattr('core.template_pack.compile_template', fail)
+        loaded = TemplatePack(pack_path, TemplateAssetStore(source_dir, {'a': {'file': 'a.xlsx'}}))
+        assert loaded.template_xml('a') == (xml, name)
+        assert set(loaded.template_entry('a')) == {'source_hash', 'diagram_name', 'xml', 'xml_compressed'}
+        assert '<mxfile' in loaded.component_xml('db_cluster', compressed=True)
+        assert loaded.rebuilt == []
+
+        monkeypatch.undo()
+        saved = pack_path.read_bytes()
+        (source_dir / 'a.xlsx').write_bytes(template_bytes + b'\0')
+        assert loaded.template_xml('a')[1] == name
+        assert loaded.rebuilt == ['a']
+        assert pack_path.read_bytes() == saved
+
+    def test_parse_errors_are_not_cached(self, template_bytes, tmp_path, monkeypatch):
+        """파싱 오류가 있으면 ValueError, 팩에는 넣지 않음"""
+        source_dir = tmp_path / 'templates'
+        source_dir.mkdir()
+        (source_dir / 'a.xlsx').write_bytes(template_bytes)
+        pack = TemplatePack(tmp_path / 'pack.json', TemplateAssetStore(source_dir, {'a': {'file': 'a.xlsx'}}))
+
+        monkeypatch.setattr('core.template_pack.compile_template', lambda excel_bytes: ({}, ['BOXES 오류']))
+        for _ in range(2):
+            with pytest.raises(ValueError, match='BOXES 오류'):
+                pack.template_xml('a')
+        assert pack.rebuilt == []
+
+        monkeypatch.undo()
+        assert '<mxfile' in pack.template_xml('a')[0]
+
+
+class TestUploadSession:
+    """UploadSession 테스트"""
+
+    def test_parses_once(self, template_bytes, monkeypatch):
+        """여러 번 접근해도 엑셀은 한 번만 읽음"""
+        session = UploadSession(template_bytes, 'sample.xlsx', cache=PipelineCache())
+        calls = []
+        original = session._parser.read_excel
+        monkeypatch.setattr(session._parser, 'read_excel', lambda f: calls.append(1) or original(f))
+
+        assert session.has_sheet('BOXES')
+        assert session.validation['is_valid'] is True
+        assert session.data is session.data
+        assert session.positions is session.positions
+        assert len(calls) == 1
+
+    def test_generate_is_memoised(self, template_bytes):
+        """generate 결과를 보관하고 파이프라인 캐시에도 저장"""
+        cache = PipelineCache()
+        session = UploadSession(template_bytes, cache=cache)
+
+        xml_content, diagram_name = session.generate()
+        assert session.generate() is session.generate()
+        assert '<mxfile' in xml_content
+        assert diagram_name == session.diagram_name
+        assert compute_cache_key(template_bytes) in cache
+
+    def test_crossing_warning(self):
+        """교차가 예상되면 검증 경고에 포함"""
+        session = UploadSession(generate_template_excel('msa'), cache=PipelineCache())
+
+        assert session.validation['is_valid']
+        assert any('교차' in warning for warning in session.validation['warnings'])
+
+    def test_invalid_bytes(self):
+        """엑셀이 아닌 파일은 검증 실패"""
+        session = UploadSession(b'not an excel file', cache=PipelineCache())
+
+        assert session.validation['is_valid'] is False
+        assert not session.has_sheet('BOXES')
+
+
+class TestProfiler:
+    """단계별 계측 테스트"""
+
+    def test_nested_spans_and_memory(self):
+        """중첩 구간 깊이와 메모리 최고치가 부모 구간에 반영됨"""
+        profiler = Profiler(trace_memory=True)
+        with profiler.span('outer'):
+            with profiler.span('inner'):
+                buffer = bytearray(512 * 1024)
+                del buffer
+
+        outer, inner = profiler.spans
+        assert (outer['depth'], inner['depth']) == (0, 1)
+        assert inner['peak_kib'] >= 512
+        assert outer['peak_kib'] >= inner['peak_kib']
+
+    def test_pipeline_stages_recorded(self, template_bytes):
+        """파이프라인 실행 시 단계 구간과 셀/연결 카운터 기록"""
+        profiler = Profiler()
+        xml_content, _ = generate_xml_from_excel(template_bytes, use_cache=False, profiler=profiler)
+
+        names = [span['name'] for span in profiler.spans]
+        for stage in ('read', 'parse', 'layout', 'layout.tree', 'generate', 'generate.connections'):
+            assert stage in names
+        assert profiler.counters['drawio.cells'] == xml_content.count('<mxCell ') - 2
+        assert 0 < profiler.counters['drawio.edges'] < profiler.counters['drawio.cells']
+
+
+class TestBatchConvert:
+    """일괄 변환 CLI 테스트"""
+
+    def test_converts_and_skips_unchanged(self, template_bytes, tmp_path, capsys):
+        """두 번째 실행에서는 변경 없는 파일을 건너뜀"""
+        (tmp_path / 'sample.xlsx').write_bytes(template_bytes)
+        pattern = str(tmp_path / '*.xlsx')
+
+        assert batch_convert.main([pattern, '-j', '1']) == 0
+        output = tmp_path / 'sample.drawio'
+        assert output.exists()
+        assert '<mxfile' in output.read_text(encoding='utf-8')
+
+        capsys.readouterr()
+        assert batch_convert.main([pattern, '-j', '1']) == 0
+        assert '건너뜀 1개' in capsys.readouterr().out
+
+    def test_profile_json(self, template_bytes, tmp_path):
+        """--profile-json으로 파일별 계측 결과 저장"""
+        (tmp_path / 'sample.xlsx').write_bytes(template_bytes)
+        profile_path = tmp_path / 'profile.json'
+
+        assert batch_convert.main([str(tmp_path / '*.xlsx'), '-j', '1', '--profile-json', str(profile_path)]) == 0
+        profiles = json.loads(profile_path.read_text(encoding='utf-8'))
+        (profile,) = profiles.values()
+        assert {'read', 'generate', 'write'} <= {span['name'] for span in profile['spans']}
+        assert profile['counters']['drawio.cells'] > 0
+
+    def test_output_dir_keeps_subfolders(self, template_bytes, tmp_path, capsys):
+        """같은 이름의 파일은 출력 폴더 아래 하위 폴더로 나뉘고, 그래도 겹치면 변환하지 않음"""
+        for folder in ('a', 'b'):
+            (tmp_path / folder).mkdir()
+            (tmp_path / folder / 'x.xlsx').write_bytes(template_bytes)
+        out_dir = tmp_path / 'out'
+
+        assert batch_convert.main([str(tmp_path / '*' / 'x.xlsx'), '-j', '1', '-o', str(out_dir)]) == 0
+        assert (out_dir / 'a' / 'x.drawio').exists()
+        assert (out_dir / 'b' / 'x.drawio').exists()
+
+        (tmp_path / 'a' / 'x.XLSX').write_bytes(template_bytes)
+        capsys.readouterr()
+        assert batch_convert.main([str(tmp_path / 'a' / 'x.*'), '-j', '1', '-f']) == 1
+        assert '출력 파일이 겹칩니다' in capsys.readouterr().out
+
+    def test_invalid_workbook_fails(self, tmp_path):
+        """엑셀이 아닌 파일은 실패로 집계"""
+        (tmp_path / 'broken.xlsx').write_bytes(b'not an excel file')
+
+        assert batch_convert.main([str(tmp_path / '*.xlsx'), '-j', '1']) == 1
+
+
+class TestBenchmarks:
+    """벤치마크 도구 테스트"""
+
+    def test_synthetic_workbook_size(self):
+        """합성 워크북의 박스/컴포넌트/연결 수가 설정과 일치"""
+        spec = SyntheticSpec('tiny', layers=2, depth=2, boxes_per_row=3, rows=2, connections=5)
+        data = bench.prepare(build_workbook(spec))['data']
+
+        assert len(data['layers']) == 2
+        assert len(data['boxes']) + len(data['components']) == spec.item_count
+        assert len(data['connections']) == 5
+
+    def test_synthetic_styles_are_known(self):
+        """합성 워크북의 색상/연결 타입은 생성기 매핑에 있는 값"""
+        data = bench.prepare(build_workbook(SCENARIOS[1]))['data']
+
+        assert {item['bg_color'] for item in data['layers'] + data['boxes']} <= COLOR_MAP.keys()
+        assert {conn['type'] for conn in data['connections']} <= CONNECTION_STYLES.keys()
+
+    def test_compare_flags_regressions(self):
+        """허용치와 최소 차이를 모두 넘을 때만 성능 저하로 판단"""
+        baseline = {'s': {'layout': {'wall_ms': 100.0, 'peak_kib': 1000.0}}}
+
+        slower = {'s': {'cells': 10, 'layout': {'wall_ms': 140.0, 'peak_kib': 1000.0}}}
+        assert len(bench.compare(slower, baseline, 0.25)) == 1
+        assert bench.compare(slower, baseline, 0.25, speed_ratio=1.2) == []
+
+        tiny = {'s': {'layout': {'wall_ms': 0.2, 'peak_kib': 1.0}}}
+        assert bench.compare(tiny, {'s': {'layout': {'wall_ms': 0.1, 'peak_kib': 0.5}}}, 0.25) == []
@@ -192,7 +192,12 @@ WARNING_MESSAGES = {
     'too_many_boxes': "박스가 {count}개로 많습니다. {max}개 이하 권장",
     'too_many_connections': "연결이 {count}개로 많습니다. 가독성이 떨어질 수 있습니다.",
     'self_connection': "컴포넌트 {id}가 자기 자신과 연결되어 있습니다.",
-    'crossing_expected': "연결선 교차가 {count}개 예상됩니다. Draw.io에서 조정이 필요할 수 있습니다."
+    'crossing_expected': "연결선 교차가 {count}개 예상됩니다. Draw.io에서 조정이 필요할 수 있습니다.",
+    'orphan_parent': "부모 ID({parent_id})가 존재하지 않아 {items}을(를) 캔버스 기준으로 배치했습니다.",
+    'parent_cycle': "부모 관계가 순환합니다 ({cycle}). {item_id}을(를) 캔버스 기준으로 배치했습니다.",
+    'overlapping_siblings': "같은 부모 안에서 겹치는 항목이 {count}쌍 있습니다 (Y%/높이% 확인): {pairs}",
+    'parent_overflow': "부모 영역을 벗어나는 항목이 {count}개 있습니다 (Y%+높이%가 100 초과): {items}",
+    'ambiguous_parent': "{item_id}을(를) 감싸는 셀({candidates})이 서로 겹쳐 있어 가장 작은 {parent_id}을(를) 부모로 사용했습니다."
 }
 
 # ==================== 아이콘 매핑 ====================
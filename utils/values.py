@@ -0,0 +1,55 @@
+"""
+AutoArchitect - 값 처리 헬퍼 (pandas 비의존)
+"""
+
+from typing import Any
+
+
+def is_missing(value: Any) -> bool:
+    """
+    빈 셀 값인지 확인 (None, NaN, pandas NA/NaT)
+
+    pandas 없이 pd.isna와 같은 판단을 하기 위해 사용
+
+    Args:
+        value: 검사할 값
+
+    Returns:
+        비어있으면 True
+    """
+    if value is None:
+        return True
+    if isinstance(value, float):
+        return value != value
+    return type(value).__name__ in ('NAType', 'NaTType')
+
+
+def value_or(value: Any, default: Any) -> Any:
+    """
+    빈 값이면 기본값 반환
+
+    Args:
+        value: 원래 값
+        default: 기본값
+
+    Returns:
+        값 또는 기본값
+    """
+    return default if is_missing(value) else value
+
+
+# 예/아니오 설정값에서 '켜짐'으로 보는 값
+TRUE_VALUES = frozenset({'예', 'Y', 'YES', 'TRUE', 'O', '1'})
+
+
+def is_truthy(value: Any) -> bool:
+    """
+    CONFIG 시트의 예/아니오 값 판단
+
+    Args:
+        value: 셀 값 ('예', 'Y', 'TRUE', 1 등)
+
+    Returns:
+        켜짐이면 True (빈 값은 False)
+    """
+    return not is_missing(value) and str(value).strip().upper() in TRUE_VALUES